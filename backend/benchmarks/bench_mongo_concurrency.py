@@ -0,0 +1,94 @@
+# benchmarks/bench_mongo_concurrency.py - Concurrent request throughput, blocking vs async Mongo
+# Needs a local mongod. Seeds a throwaway database, then hits GET /candidate/{id}
+# concurrently on (a) a copy of the old handler using blocking pymongo inside
+# async def and (b) the real app, which awaits the async repository layer.
+#
+# Usage (from backend/):  python -m benchmarks.bench_mongo_concurrency --seed 50000 --requests 200
+
+import os
+import sys
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("MONGO_DB_NAME", "aieta_bench")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+
+import httpx
+from fastapi import FastAPI, HTTPException
+from pymongo import MongoClient
+
+import main
+from src.database import MONGO_URI, MONGO_DB_NAME
+
+
+def seed(n_candidates):
+    """(Re)create the benchmark candidates collection"""
+    collection = MongoClient(MONGO_URI)[MONGO_DB_NAME]['candidates']
+    if collection.estimated_document_count() == n_candidates:
+        return
+    collection.drop()
+    batch = []
+    for i in range(n_candidates):
+        batch.append({
+            "id": f"cand-{i}",
+            "personal_information": {"name": f"Candidate {i}", "email": f"c{i}@example.com"},
+            "work_experience": [{"title": "Engineer", "company": "Acme", "description": "x" * 200}],
+            "education": [{"degree": "BSc"}],
+            "skills": ["python", "mongodb"],
+        })
+        if len(batch) == 5000:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+
+
+def build_blocking_app():
+    """The pre-repository handler: sync pymongo call inside an async endpoint"""
+    app = FastAPI()
+    collection = MongoClient(MONGO_URI)[MONGO_DB_NAME]['candidates']
+
+    @app.get("/candidate/{candidate_id}")
+    async def get_candidate(candidate_id: str):
+        candidate = collection.find_one({"id": candidate_id}, {"_id": 0})
+        if not candidate:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+        return candidate
+
+    return app
+
+
+async def run_load(label, app, n_requests, n_candidates):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up connections before timing
+        await client.get("/candidate/cand-0")
+
+        async def one(i):
+            response = await client.get(f"/candidate/cand-{(i * 7919) % n_candidates}")
+            response.raise_for_status()
+
+        start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        wall = time.perf_counter() - start
+    print(f"{label:<10} {n_requests} requests in {wall:6.2f}s -> {n_requests / wall:8.1f} req/s")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--seed", type=int, default=50000, help="candidates to seed (unindexed lookups get slower as this grows)")
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    seed(args.seed)
+    print(f"{args.seed} candidates in {MONGO_DB_NAME}.candidates\n")
+    asyncio.run(run_load("blocking", build_blocking_app(), args.requests, args.seed))
+    asyncio.run(run_load("async", main.app, args.requests, args.seed))
+
+
+if __name__ == "__main__":
+    main_cli()
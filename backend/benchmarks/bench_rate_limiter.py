@@ -0,0 +1,124 @@
+# benchmarks/bench_rate_limiter.py - Groq rate limiter: throughput, 429s and queue time by priority
+# Oversubscribes a simulated provider (a token bucket with the configured RPM/TPM
+# ceilings) with live-interview coroutines, background-generation coroutines and
+# a few blocking threads, all going through src.rate_limiter. Reports achieved
+# throughput against the ceiling, how many calls the provider would have
+# rejected with 429, and per-priority queue time.
+#
+# Limits are per minute but scaled up so a run takes seconds:
+#   python -m benchmarks.bench_rate_limiter --rpm 1200 --tpm 240000 --seconds 10
+
+import time
+import random
+import asyncio
+import argparse
+import threading
+import statistics
+
+from src.rate_limiter import RateLimiter, TokenBucket, INTERACTIVE, BACKGROUND
+
+
+class SimulatedProvider:
+    """Rejects any call that exceeds the real (un-headroomed) RPM/TPM buckets"""
+
+    def __init__(self, rpm, tpm, burst_seconds):
+        self.requests = TokenBucket(rpm, burst_seconds)
+        self.tokens = TokenBucket(tpm, burst_seconds)
+        self.lock = threading.Lock()
+        self.accepted = 0
+        self.accepted_tokens = 0
+        self.rejected = 0
+
+    def call(self, tokens, deadline):
+        with self.lock:
+            now = time.monotonic()
+            if now >= deadline:
+                return False  # Outside the measured window
+            if self.requests.delay(1, now) > 0 or self.tokens.delay(tokens, now) > 0:
+                self.rejected += 1
+                return False
+            self.requests.take(1, now)
+            self.tokens.take(tokens, now)
+            self.accepted += 1
+            self.accepted_tokens += tokens
+            return True
+
+
+def percentile(values, q):
+    if not values:
+        return 0.0
+    return statistics.quantiles(values, n=100)[q - 1] if len(values) > 1 else values[0]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the Groq rate limiter against a simulated provider")
+    parser.add_argument("--rpm", type=float, default=1200)
+    parser.add_argument("--tpm", type=float, default=240000)
+    parser.add_argument("--burst-seconds", type=float, default=1.0)
+    parser.add_argument("--headroom", type=float, default=0.95)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--interactive", type=int, default=20, help="Concurrent live-interview callers")
+    parser.add_argument("--background", type=int, default=20, help="Concurrent background callers")
+    parser.add_argument("--threads", type=int, default=4, help="Blocking (thread) background callers")
+    args = parser.parse_args()
+
+    limiter = RateLimiter(rpm=args.rpm, tpm=args.tpm, burst_seconds=args.burst_seconds,
+                          headroom=args.headroom, workers=1, enabled=True)
+    provider = SimulatedProvider(args.rpm, args.tpm, args.burst_seconds)
+    waits = {INTERACTIVE: [], BACKGROUND: []}
+    deadline = time.monotonic() + args.seconds
+    stop = threading.Event()
+
+    def call_size(priority):
+        # Evaluations are small; question generation prompts and outputs are large
+        return random.randint(150, 400) if priority == INTERACTIVE else random.randint(800, 2000)
+
+    async def caller(priority):
+        while time.monotonic() < deadline:
+            tokens = call_size(priority)
+            queued_at = time.perf_counter()
+            await limiter.aacquire(tokens, priority)
+            waits[priority].append((time.perf_counter() - queued_at) * 1000)
+            provider.call(tokens, deadline)
+            await asyncio.sleep(random.uniform(0.01, 0.05))  # Simulated response latency
+
+    def thread_caller():
+        while not stop.is_set() and time.monotonic() < deadline:
+            tokens = call_size(BACKGROUND)
+            queued_at = time.perf_counter()
+            limiter.acquire(tokens, BACKGROUND)
+            waits[BACKGROUND].append((time.perf_counter() - queued_at) * 1000)
+            provider.call(tokens, deadline)
+
+    async def run():
+        threads = [threading.Thread(target=thread_caller, daemon=True) for _ in range(args.threads)]
+        for thread in threads:
+            thread.start()
+        tasks = [asyncio.create_task(caller(INTERACTIVE)) for _ in range(args.interactive)] + \
+                [asyncio.create_task(caller(BACKGROUND)) for _ in range(args.background)]
+        _, queued = await asyncio.wait(tasks, timeout=args.seconds + 1)
+        for task in queued:
+            task.cancel()  # Still waiting at the limiter when the window closed
+        stop.set()
+        await asyncio.gather(*queued, return_exceptions=True)
+        # Blocked threads are released as the buckets refill; they are daemons, so do not wait long
+        await asyncio.to_thread(lambda: [thread.join(timeout=5) for thread in threads])
+        return len(queued)
+
+    still_queued = asyncio.run(run())
+
+    # What the provider lets through in the window: the full buckets plus their refill
+    allowed_requests = args.rpm / 60 * args.seconds + provider.requests.capacity
+    allowed_tokens = args.tpm / 60 * args.seconds + provider.tokens.capacity
+    print(f"ceiling {args.rpm:.0f} RPM / {args.tpm:.0f} TPM, burst {args.burst_seconds:g}s, "
+          f"headroom {args.headroom:.0%}, {args.seconds:g}s window")
+    print(f"sent {provider.accepted} requests ({provider.accepted / allowed_requests:.0%} of allowance), "
+          f"{provider.accepted_tokens} tokens ({provider.accepted_tokens / allowed_tokens:.0%} of allowance)")
+    print(f"provider 429s: {provider.rejected}   callers still queued at the end: {still_queued}")
+    for priority, values in waits.items():
+        print(f"{priority:<12} calls={len(values):5d}  wait avg={statistics.fmean(values) if values else 0:8.1f}ms  "
+              f"p95={percentile(values, 95):8.1f}ms  max={max(values, default=0):8.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+# benchmarks/bench_report_render.py - Report rendering: str.format + concatenation vs streaming renderer
+# Renders synthetic interviews with 10, 100 and 1000 interactions (each with a few
+# follow-up feedback items) both ways, checks the HTML is byte-identical, and
+# reports total time, time to first chunk and peak allocated memory.
+#
+# Usage (from backend/):  python -m benchmarks.bench_report_render --repeat 5
+
+import time
+import argparse
+import tracemalloc
+
+from src.postprocessing import report_template
+from src.report_renderer import iter_report_html
+
+SIZES = [10, 100, 1000]
+
+
+def make_report(n_interactions, feedback_per_interaction=4):
+    interactions = [
+        {
+            "question": f"Question {i}: walk me through how you would design a rate limiter for a public API. " * 2,
+            "answer": f"Answer {i}: I would start with a token bucket per API key, stored in Redis... " * 6,
+            "score": i % 6,
+            "feedback": [f"Follow-up {j} on question {i}: consider burst traffic and clock skew." for j in range(feedback_per_interaction)],
+        }
+        for i in range(n_interactions)
+    ]
+    return {
+        "candidate_id": "bench-candidate",
+        "position": "Backend Engineer",
+        "interview_date": "January 01, 2025, 10:00 AM",
+        "interviewer_name": "AIeta",
+        "scores": {"category_averages": {"technical_depth": 3.8, "communication": 4.1, "problem_solving": 3.5}},
+        "average_score": 3.8,
+        "max_possible_score": n_interactions * 5,
+        "total_score": n_interactions * 3,
+        "scored_interactions": n_interactions,
+        "percentage_score": 76.0,
+        "interactions": interactions,
+        "improvement_areas": [{"question": f"Question {i}", "score": 1} for i in range(0, n_interactions, 10)],
+        "current_generation_date": "January 01, 2025, 10:05 AM",
+    }
+
+
+def legacy_render(report_raw_dict):
+    """The pre-streaming generate_html_report: += on f-strings, then one report_template.format"""
+    category_averages_html = ""
+    for category, avg_score in report_raw_dict.get("scores", {}).get('category_averages', {}).items():
+        if avg_score > 0:
+            category_name = category.replace('_', ' ').title()
+            category_averages_html += f"""
+                    <div class="card">
+                        <p class="font-medium text-gray-500 text-sm">{category_name} Score:</p>
+                        <p class="text-2xl font-bold text-indigo-600">{avg_score:.1f} / 5</p>
+                    </div>
+                """
+
+    interactions_html = ""
+    for interaction in report_raw_dict.get('interactions', []):
+        feedback_html = ""
+        for fb in interaction.get('feedback', []):
+            feedback_html += f"""
+                    <div class="feedback-item">
+                        <span class="feedback-icon text-blue-600">▪</span> {fb}
+                    </div>
+                """
+        interactions_html += f"""
+                <div class="interaction-card">
+                    <p class="qa-question">{interaction.get('question', 'N/A')}</p>
+                    <p class="qa-answer">{interaction.get('answer', 'No answer provided.')}</p>
+                    <div class="score-section">
+                        <span class="score-badge">Score: {interaction.get('score', 0)}/5</span>
+                    </div>
+                    <div class="feedback-section">
+                        <h5>Feedback:</h5>
+                        {feedback_html}
+                    </div>
+                </div>
+            """
+
+    improvement_areas_html = ""
+    for imp in report_raw_dict.get("improvement_areas", []):
+        improvement_areas_html += f"<li>{imp.get('question', '')} (Score: {imp.get('score', 0)})</li>"
+
+    return report_template.format(
+        **{k: report_raw_dict[k] for k in (
+            "candidate_id", "position", "interview_date", "interviewer_name", "scores", "average_score",
+            "max_possible_score", "total_score", "scored_interactions", "percentage_score", "current_generation_date"
+        )},
+        category_averages_html=category_averages_html,
+        interactions_html=interactions_html,
+        improvement_areas_html=improvement_areas_html,
+    )
+
+
+def measure(render, report, repeat):
+    """Best-of-N (total_ms, first_chunk_ms, chunks); peak KiB from one traced run"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        first = None
+        chunks = 0
+        for _chunk in render(report):
+            if first is None:
+                first = time.perf_counter()
+            chunks += 1
+        end = time.perf_counter()
+        result = ((end - start) * 1000, (first - start) * 1000, chunks)
+        best = result if best is None or result[0] < best[0] else best
+
+    tracemalloc.start()
+    for _chunk in render(report):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best + (peak / 1024,)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the report renderer")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    renderers = {
+        "format+concat": lambda report: [legacy_render(report)],
+        "streaming": iter_report_html,
+    }
+
+    print(f"{'interactions':>12} {'renderer':<14} {'total':>10} {'1st chunk':>10} {'chunks':>7} {'peak KiB':>10} {'html KiB':>9}")
+    for size in SIZES:
+        report = make_report(size)
+        expected = legacy_render(report)
+        assert "".join(iter_report_html(report)) == expected, f"streamed HTML differs at {size} interactions"
+
+        for name, render in renderers.items():
+            total_ms, first_ms, chunks, peak_kib = measure(render, report, args.repeat)
+            print(f"{size:>12} {name:<14} {total_ms:>8.2f}ms {first_ms:>8.2f}ms {chunks:>7} "
+                  f"{peak_kib:>10.0f} {len(expected.encode()) / 1024:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
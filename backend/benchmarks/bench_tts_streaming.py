@@ -0,0 +1,58 @@
+# benchmarks/bench_tts_streaming.py - Time-to-first-byte and wire size: base64 JSON vs streamed MP3
+# Runs against a live server (uvicorn main:app) so real network buffering applies.
+# Each text is requested cold (unique suffix, forces synthesis) and warm (cached).
+#
+# Usage (from backend/):  python -m benchmarks.bench_tts_streaming --base-url http://localhost:8000
+
+import time
+import uuid
+import argparse
+
+import httpx
+
+GREETING = (
+    "Hello and welcome to your interview today. We were really impressed by your work on "
+    "data pipelines at your last role, especially the way you scaled the ingestion layer. "
+    "This session will take about fifteen minutes. I will ask you a few questions, and you "
+    "can take your time to answer each one. When you are ready, we will begin."
+)
+
+
+def timed_request(client, method, url, **kwargs):
+    """Return (ttfb_ms, total_ms, bytes_on_wire)"""
+    start = time.perf_counter()
+    ttfb = None
+    size = 0
+    with client.stream(method, url, **kwargs) as response:
+        response.raise_for_status()
+        for chunk in response.iter_raw():
+            if ttfb is None:
+                ttfb = (time.perf_counter() - start) * 1000
+            size += len(chunk)
+    total = (time.perf_counter() - start) * 1000
+    return ttfb or total, total, size
+
+
+def report(label, name, result):
+    ttfb, total, size = result
+    print(f"{label:<6} {name:<18} ttfb={ttfb:8.1f}ms  total={total:8.1f}ms  bytes={size:8d}")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--text", default=GREETING)
+    args = parser.parse_args()
+
+    # Ask for identity encoding so byte counts are what actually crosses the wire
+    with httpx.Client(base_url=args.base_url, timeout=60, headers={"Accept-Encoding": "identity"}) as client:
+        # Separate unique texts so neither endpoint warms the cache for the other
+        base64_text = f"{args.text} Reference {uuid.uuid4().hex[:8]}."
+        stream_text = f"{args.text} Reference {uuid.uuid4().hex[:8]}."
+        for label in ("cold", "warm"):
+            report(label, "base64 JSON", timed_request(client, "POST", "/tts/speak-base64", json={"text": base64_text}))
+            report(label, "audio/mpeg stream", timed_request(client, "GET", "/tts/speak-stream", params={"text": stream_text}))
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -0,0 +1,128 @@
+# benchmarks/import_time_report.py - Backend Cold-Start Report
+# Imports main.py in a fresh interpreter under `python -X importtime`, prints a
+# per-module breakdown and the time until the app answers /health, and exits
+# non-zero when the import budget is blown or a lazily-loaded dependency
+# (LangChain, Groq, gTTS, GridFS) is pulled in at import time again.
+#
+#   python benchmarks/import_time_report.py
+#   python benchmarks/import_time_report.py --budget-ms 800 --runs 5 --json import_times.json
+
+import os
+import re
+import sys
+import json
+import argparse
+import subprocess
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Must only be imported on first use, never while main.py loads
+LAZY_MODULES = ["langchain_core", "langchain_groq", "groq", "gtts", "gridfs"]
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+# Runs in the child: import main, then time app startup through the first /health
+STARTUP_PROBE = """
+import time
+started_at = time.perf_counter()
+import main
+imported_at = time.perf_counter()
+from fastapi.testclient import TestClient
+main.LLM_PREWARM = False
+with TestClient(main.create_app()) as client:
+    assert client.get("/health").status_code == 200
+    ready_at = time.perf_counter()
+print("STARTUP", (imported_at - started_at) * 1000, (ready_at - started_at) * 1000)
+"""
+
+
+def run_once():
+    """One cold interpreter: returns (import records, import_ms, health_ms)"""
+    env = dict(os.environ)
+    env.setdefault("MONGO_URI", "mongodb://localhost:27017")  # Never resolved at import
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", STARTUP_PROBE],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        sys.exit(f"Startup probe failed:\n{result.stderr[-2000:]}")
+
+    records = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            records.append({
+                "module": module,
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+                "depth": len(indent) // 2,
+            })
+    startup = next(line for line in result.stdout.splitlines() if line.startswith("STARTUP"))
+    _, import_ms, health_ms = startup.split()
+    return records, float(import_ms), float(health_ms)
+
+
+def main_import_records(records):
+    """importtime prints children before parents; keep the block that ends with `main`"""
+    end = next(i for i, r in enumerate(records) if r["module"] == "main" and r["depth"] == 0)
+    start = max((i for i, r in enumerate(records[:end]) if r["depth"] == 0), default=-1) + 1
+    return records[start:end + 1]
+
+
+def summarize(records):
+    by_package = defaultdict(float)
+    for record in records:
+        by_package[record["module"].split(".")[0]] += record["self_ms"]
+    direct = [r for r in records if r["depth"] == 1]
+    return {
+        "total_ms": records[-1]["cumulative_ms"],
+        "by_package": dict(sorted(by_package.items(), key=lambda item: -item[1])),
+        "direct_imports": {r["module"]: r["cumulative_ms"] for r in sorted(direct, key=lambda r: -r["cumulative_ms"])},
+        "lazy_violations": sorted({
+            r["module"] for r in records if r["module"].split(".")[0] in LAZY_MODULES
+        }),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--budget-ms", type=float, default=float(os.getenv("IMPORT_BUDGET_MS", "1000")))
+    parser.add_argument("--runs", type=int, default=3, help="Report the fastest of N cold starts")
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--json", help="Also write the report to this file")
+    args = parser.parse_args()
+
+    runs = [run_once() for _ in range(args.runs)]
+    records, import_ms, health_ms = min(runs, key=lambda run: run[1])
+    report = summarize(main_import_records(records))
+    report.update(import_ms=round(import_ms, 1), health_ms=round(health_ms, 1), budget_ms=args.budget_ms)
+
+    print(f"\n⏱️  import main: {report['import_ms']:.0f} ms   first /health: {report['health_ms']:.0f} ms"
+          f"   (budget {args.budget_ms:.0f} ms, best of {args.runs})\n")
+    print("main.py direct imports (cumulative ms)")
+    for module, ms in list(report["direct_imports"].items())[:args.top]:
+        print(f"  {ms:8.1f}  {module}")
+    print("\nSelf time by top-level package (ms)")
+    for package, ms in list(report["by_package"].items())[:args.top]:
+        print(f"  {ms:8.1f}  {package}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+
+    failures = []
+    if report["import_ms"] > args.budget_ms:
+        failures.append(f"import took {report['import_ms']:.0f} ms, budget is {args.budget_ms:.0f} ms")
+    if report["lazy_violations"]:
+        failures.append(f"imported at startup but should be lazy: {', '.join(report['lazy_violations'])}")
+    for failure in failures:
+        print(f"\n❌ {failure}")
+    if failures:
+        sys.exit(1)
+    print("\n✅ Within import budget")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+# benchmarks/load_test_answer_submit.py - /answer/submit load test with a fake slow LLM
+# Fires N concurrent requests at the real FastAPI app: once with the old
+# blocking chain.invoke path, once through the async LLM engine and once with
+# speculative follow-up generation. Use a low --score to exercise follow-ups.
+#
+# Usage (from backend/):  python -m benchmarks.load_test_answer_submit --requests 50 --latency 0.5 --score 2
+
+import os
+import sys
+import json
+import time
+import asyncio
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# No network needed: Mongo is never touched by /answer/submit and the LLM is faked
+os.environ.setdefault("MONGO_URI", "mongodb://localhost:27017")
+os.environ.setdefault("GROQ_API_KEY", "benchmark")
+os.environ.setdefault("EVAL_CACHE_ENABLED", "false")  # Measure LLM handling, not cache hits
+
+import httpx
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+import main
+from src import helper, llm_engine as engine_module
+
+
+class FakeSlowLLM(BaseChatModel):
+    """Chat model that answers after a fixed delay (time.sleep sync, asyncio.sleep async)"""
+    latency: float = 0.5
+    content: str = json.dumps({"evaluation": {"score": 7, "feedback": ["Solid answer"]}})
+
+    @property
+    def _llm_type(self):
+        return "fake-slow"
+
+    def _generate(self, messages, stop=None, run_manager=None, **kwargs):
+        time.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.content))])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, **kwargs):
+        await asyncio.sleep(self.latency)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=self.content))])
+
+
+class BlockingEngine:
+    """Reproduces the pre-engine handler: sync helper calls inside async def"""
+
+    async def evaluate_with_follow_up(self, question, answer, allow_follow_up=True):
+        evaluation = helper.evaluate_answer(question, answer)
+        if allow_follow_up and evaluation["evaluation"]["score"] < engine_module.FOLLOW_UP_SCORE_THRESHOLD:
+            return evaluation, helper.generate_follow_up_question(question, answer)
+        return evaluation, None
+
+
+async def measure_loop_lag(stop_event, samples):
+    """Record how late a 10 ms heartbeat fires; large values mean a blocked loop"""
+    while not stop_event.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        samples.append((time.perf_counter() - start - 0.01) * 1000)
+
+
+async def run_load(label, engine, n_requests):
+    main.llm_engine = engine
+    main.session_store.clear()  # Every run starts with no follow-ups used
+    transport = httpx.ASGITransport(app=main.app)
+    latencies = []
+    lag_samples = []
+    stop_event = asyncio.Event()
+
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        async def one(i):
+            payload = {
+                "candidate_id": f"cand-{i}",
+                "question_index": 0,
+                "question": f"Question {i}: explain Python generators",
+                "answer": "They yield values lazily.",
+            }
+            start = time.perf_counter()
+            response = await client.post("/answer/submit", json=payload)
+            latencies.append((time.perf_counter() - start) * 1000)
+            response.raise_for_status()
+
+        lag_task = asyncio.create_task(measure_loop_lag(stop_event, lag_samples))
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(one(i) for i in range(n_requests)))
+        wall = time.perf_counter() - wall_start
+        stop_event.set()
+        await lag_task
+
+    latencies.sort()
+    p95 = latencies[int(len(latencies) * 0.95) - 1]
+    print(f"{label:<12} wall={wall:6.2f}s  throughput={n_requests / wall:7.1f} req/s  "
+          f"p50={latencies[len(latencies) // 2]:8.1f}ms  p95={p95:8.1f}ms  "
+          f"max_loop_lag={max(lag_samples, default=0):8.1f}ms")
+
+
+def main_cli():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake LLM latency in seconds")
+    parser.add_argument("--concurrency", type=int, default=engine_module.LLM_MAX_CONCURRENCY)
+    parser.add_argument("--score", type=int, default=7, help="score the fake LLM gives every answer")
+    args = parser.parse_args()
+
+    content = json.dumps({"evaluation": {"score": args.score, "feedback": ["Benchmark feedback"]}})
+    fake_llm = FakeSlowLLM(latency=args.latency, content=content)
+    helper.get_llm = lambda: fake_llm
+    helper.get_evaluation_chain.cache_clear()
+    helper.get_follow_up_chain.cache_clear()
+
+    print(f"{args.requests} concurrent /answer/submit requests, fake LLM latency {args.latency}s, score {args.score}\n")
+    asyncio.run(run_load("blocking", BlockingEngine(), args.requests))
+    asyncio.run(run_load("async", engine_module.LLMEngine(max_concurrency=args.concurrency), args.requests))
+    speculative = engine_module.LLMEngine(max_concurrency=args.concurrency, speculative=True)
+    asyncio.run(run_load("speculative", speculative, args.requests))
+    print(f"\nspeculation counters: {speculative.stats()['speculative_followup']}")
+
+
+if __name__ == "__main__":
+    main_cli()
@@ -4,13 +4,17 @@ module.exports = {
       name: 'ai-interviewer-backend',
       cwd: '/home/ubuntu/ec2-deployed-working-interviewer/backend',
       script: 'venv/bin/python',
-      args: '-m uvicorn main:app --host 0.0.0.0 --port 8000',
+      // serve.py starts one uvicorn worker process per CPU core (override with WEB_CONCURRENCY)
+      args: 'serve.py --host 0.0.0.0 --port 8000',
       instances: 1,
       autorestart: true,
       watch: false,
-      max_memory_restart: '512M',
+      max_memory_restart: '2G',
+      // Give workers time to finish open requests (GRACEFUL_TIMEOUT_SECONDS) on stop/reload
+      kill_timeout: 35000,
       env: {
-        NODE_ENV: 'production'
+        NODE_ENV: 'production',
+        GRACEFUL_TIMEOUT_SECONDS: '30'
       },
       log_file: '/home/ubuntu/backend.log',
       out_file: '/home/ubuntu/backend-out.log',
@@ -2,33 +2,45 @@
 # Removed: MSS monitoring, Speech Recognition, Audio Recording
 # Frontend now handles: Audio recording, Screen capture, Speech-to-text
 
-from fastapi import FastAPI, HTTPException, Body
+from fastapi import FastAPI, APIRouter, HTTPException, Body, Query, Request, Depends
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
-from datetime import datetime
-from pymongo import MongoClient
+from fastapi.responses import JSONResponse, StreamingResponse, Response
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
 import os
+import re
+import math
 import time
+import asyncio
 import tempfile
 import io
 import base64
 import json
 from dotenv import load_dotenv
-from gtts import gTTS
 import logging
 from typing import Dict, Any, List, Optional
 from bson import ObjectId
-import gridfs
 
 # Import helper functions (cleaned)
 from src.helper import (
     extract_candidate_info, 
-    generate_questions, 
-    store_interview_template,
-    get_stored_interview_template, 
-    evaluate_answer, 
-    generate_follow_up_question
+    generate_questions,
+    warm_up_llm
 )
+from src import repository, bulk_import
+from src.database import close_clients, pool_metrics
+from src.cache import template_cache
+from src.evaluation_cache import evaluation_cache
+from src.report_cache import report_cache, report_cache_key
+from src.export import iter_export, resolve_format, ExportFormatError
+from src.tts import tts_cache
+from src.tts_pipeline import tts_pipeline
+from src.pregeneration import pregeneration_jobs, JobNotFound, JobNotResumable
+from src.session_store import session_store, session_key
+from src.indexes import ensure_indexes
+from src.llm_engine import llm_engine, FOLLOW_UP_SCORE_THRESHOLD
+from src.rate_limiter import llm_rate_limiter, RateLimitTimeout
 
 # Import schemas (cleaned)
 from src.schemas import *
@@ -40,55 +52,89 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Initialize FastAPI app
-app = FastAPI(title="AEITA AI Interviewer Clean", version="4.0.0")
-
-# CORS middleware - Allow your React app to talk to this API
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=[
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "https://d2t7uo64djqs88.cloudfront.net",  # Your CloudFront URL
-        "http://3.110.184.172:8000",  # Your backend IP
-        "http://3.110.184.172",
-        "https://neo-in-matrix.duckdns.org",
-        "*"  # For future custom domain
-    ],
-    allow_credentials=True,
-    allow_methods=["GET", "POST", "PUT", "DELETE"],
-    allow_headers=["*"],
-)
-# MongoDB connection
-MONGO_URI = os.environ.get('MONGO_URI')
-client = MongoClient(MONGO_URI)
-db = client['aieta']
-candidates_collection = db['candidates']
-interviews_collection = db['interviews']
-interaction_collection = db['interaction']
+# CORS origins - Allow your React app to talk to this API
+CORS_ORIGINS = [
+    "http://localhost:3000",
+    "http://127.0.0.1:3000",
+    "https://d2t7uo64djqs88.cloudfront.net",  # Your CloudFront URL
+    "http://3.110.184.172:8000",  # Your backend IP
+    "http://3.110.184.172",
+    "https://neo-in-matrix.duckdns.org",
+    "*"  # For future custom domain
+]
+
+# All endpoints hang off this router; create_app() (bottom of file) mounts it
+router = APIRouter()
 
-# GridFS for TTS audio files only (no recording storage)
-tts_fs = gridfs.GridFS(db, collection="tts_files")
+MAX_FOLLOWUPS = 2  # Maximum 2 follow-ups per question
+# Build the LangChain chains in the background at startup instead of on the first answer
+LLM_PREWARM = os.getenv("LLM_PREWARM", "true").lower() in ("1", "true", "yes")
+
+# MongoDB access goes through the async repositories in src/repository.py
 
 # =========================
 # CANDIDATE MANAGEMENT ENDPOINTS
 # =========================
 
-@app.get("/candidates")
-async def get_candidates():
-    """Get all candidates"""
+CANDIDATE_LIST_PROJECTION = {"_id": 0, "id": 1, "personal_information.name": 1, "status": 1}
+
+@router.get("/candidates", response_model=CandidateListResponse)
+async def get_candidates(
+    cursor: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=200)
+):
+    """
+    List candidates (id, name, status only), one keyset page at a time.
+    Pass the returned next_cursor as ?cursor= to fetch the following page.
+    """
     try:
-        candidates = list(candidates_collection.find({}, {"_id": 0}))
-        return candidates
+        docs, next_cursor = await repository.candidates.page(cursor, limit, CANDIDATE_LIST_PROJECTION)
+        total_count = await repository.candidates.estimated_count()
+        return CandidateListResponse(
+            candidates=[
+                CandidateResponse(
+                    id=str(doc["id"]),
+                    name=(doc.get("personal_information") or {}).get("name") or str(doc["id"]),
+                    status=doc.get("status")
+                )
+                for doc in docs
+            ],
+            total_count=total_count,
+            page_size=limit,
+            next_cursor=str(next_cursor) if next_cursor is not None else None
+        )
     except Exception as e:
         logger.error(f"Error fetching candidates: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.get("/candidate/{candidate_id}")
+@router.post("/candidates/import", response_model=BulkOperationResponse)
+async def import_candidates(request: Request, options: ImportRequest = Depends()):
+    """
+    Bulk-create candidates from the raw request body: a JSON array
+    (?data_format=json) or NDJSON (?data_format=ndjson). The body is parsed as it
+    arrives, each record is validated against CandidateCreateRequest and written
+    in unordered bulk upserts keyed on `id`. Existing candidates are skipped
+    unless overwrite_existing; validate_only writes nothing. Per-record failures
+    are listed in `errors` without aborting the rest of the import.
+    """
+    try:
+        return await bulk_import.import_candidates(
+            request.stream(),
+            data_format=options.data_format,
+            overwrite_existing=options.overwrite_existing,
+            validate_only=options.validate_only
+        )
+    except bulk_import.ImportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Candidate import error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/candidate/{candidate_id}")
 async def get_candidate(candidate_id: str):
     """Get specific candidate"""
     try:
-        candidate = candidates_collection.find_one({"id": candidate_id}, {"_id": 0})
+        candidate = await repository.candidates.get(candidate_id, {"_id": 0})
         if not candidate:
             raise HTTPException(status_code=404, detail="Candidate not found")
         return candidate
@@ -100,22 +146,35 @@ async def get_candidate(candidate_id: str):
 # INTERVIEW SETUP ENDPOINTS
 # =========================
 
-@app.post("/interview/setup", response_model=InterviewSetupResponse)
+@router.post("/interview/setup", response_model=InterviewSetupResponse)
 async def setup_interview(request: InterviewSetupRequest):
     """Setup interview for a candidate"""
     try:
-        candidate_data = candidates_collection.find_one({"id": request.candidate_id})
-        if not candidate_data:
-            raise HTTPException(status_code=404, detail="Candidate not found")
-        
-        # Get stored interview template
-        greeting, questions = get_stored_interview_template(request.candidate_id)
+        # Get stored interview template (served from the template cache on reloads)
+        greeting, questions = await repository.templates.get_interview_template(request.candidate_id)
         
         if not greeting or not questions:
+            candidate_data = await repository.candidates.get(request.candidate_id)
+            if not candidate_data:
+                raise HTTPException(status_code=404, detail="Candidate not found")
+            
             # Generate new interview if not found
             logger.info(f"Generating new interview for candidate {request.candidate_id}")
-            response, questions, greeting = generate_questions(candidate_data)
-            store_interview_template(candidate_data, greeting, questions)
+            # Blocking LangChain call (and rate-limiter wait): keep it off the event loop
+            response, generated_questions, generated_greeting = await asyncio.to_thread(generate_questions, candidate_data)
+            if questions:
+                # Questions were stored (e.g. HR via /store-questions) without a greeting:
+                # keep them and only fill in the generated greeting
+                greeting = generated_greeting
+                if greeting:
+                    await repository.preprocessing.store_greeting(request.candidate_id, greeting, questions)
+            else:
+                greeting, questions = generated_greeting, generated_questions
+                await repository.templates.store(candidate_data, greeting, questions)
+                # Mirror into test_preprocessing
+                await repository.preprocessing.store_template(request.candidate_id, greeting, questions)
+            # Pre-synthesize the audio in the background
+            tts_pipeline.submit(request.candidate_id)
             print(f"interview Questions is: {questions} ")
             
         return InterviewSetupResponse(
@@ -128,41 +187,70 @@ async def setup_interview(request: InterviewSetupRequest):
         logger.error(f"Interview setup error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/interview/pregenerate")
+async def start_pregeneration(request: PregenerationRequest):
+    """
+    Start a background job that generates and stores templates for
+    request.candidate_ids (or every candidate without one). Returns the job
+    status; poll GET /interview/pregenerate/{job_id} for progress.
+    """
+    try:
+        return await pregeneration_jobs.start(request.candidate_ids, request.concurrency, request.synthesize_audio)
+    except Exception as e:
+        logger.error(f"Pre-generation start error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/interview/pregenerate/{job_id}")
+async def get_pregeneration_status(job_id: str):
+    """Progress of a pre-generation job"""
+    status = await pregeneration_jobs.status(job_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="Pre-generation job not found")
+    return status
+
+@router.post("/interview/pregenerate/{job_id}/resume")
+async def resume_pregeneration(job_id: str):
+    """Resume an interrupted job from its checkpoints; 409 if it finished or is still running"""
+    try:
+        return await pregeneration_jobs.resume(job_id)
+    except JobNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except JobNotResumable as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 # =========================
 # INTERVIEW INTERACTION ENDPOINTS
 # =========================
 
-@app.post("/answer/submit", response_model=AnswerEvaluationResponse)
+@router.post("/answer/submit", response_model=AnswerEvaluationResponse)
 async def submit_answer(request: AnswerSubmissionRequest):
     """Submit and evaluate an answer"""
     try:
-        evaluation = evaluate_answer(request.question, request.answer)
+        # Follow-ups already asked for this question in this candidate's session
+        question_key = session_key(request.candidate_id, request.session_id, request.question_index)
+        current_followup_count = await session_store.get(question_key, "followups")
+        
+        evaluation, follow_up_question = await llm_engine.evaluate_with_follow_up(
+            request.question,
+            request.answer,
+            allow_follow_up=current_followup_count < MAX_FOLLOWUPS
+        )
         print("answer given is :",request.answer)
         score = evaluation["evaluation"]["score"]
         
-        # Get or initialize follow-up counter for this question
-        question_key = hash(request.question)  # Simple hash for tracking
-        if not hasattr(app.state, 'followup_counts'):
-            app.state.followup_counts = {}
-        
-        current_followup_count = app.state.followup_counts.get(question_key, 0)
-        MAX_FOLLOWUPS = 2  # Maximum 2 follow-ups per question
-        
         # Determine if follow-up is needed
-        needs_followup = (score < 4) and (current_followup_count < MAX_FOLLOWUPS)
-        follow_up_question = None
+        needs_followup = follow_up_question is not None
         
         if needs_followup:
-            follow_up_question = generate_follow_up_question(request.question, request.answer)
             print("Requested Answer is :",request.answer)
-            app.state.followup_counts[question_key] = current_followup_count + 1
-            logger.info(f"✅ Generated follow-up question ({current_followup_count + 1}/{MAX_FOLLOWUPS}): {follow_up_question}")
+            current_followup_count = await session_store.incr(question_key, "followups")
+            logger.info(f"✅ Generated follow-up question ({current_followup_count}/{MAX_FOLLOWUPS}): {follow_up_question}")
             print("Follow up question is :",follow_up_question)
         else:
             # Reset counter when moving to next question
-            if question_key in app.state.followup_counts:
-                del app.state.followup_counts[question_key]
-            if score < 4:
+            if current_followup_count:
+                await session_store.delete(question_key)
+            if score < FOLLOW_UP_SCORE_THRESHOLD:
                 logger.info(f"⚠️ Max follow-ups reached. Moving to next question despite low score ({score}/10)")
         
         return AnswerEvaluationResponse(
@@ -171,6 +259,10 @@ async def submit_answer(request: AnswerSubmissionRequest):
             needs_followup=needs_followup,
             follow_up_question=follow_up_question
         )
+    except RateLimitTimeout as e:
+        # Groq capacity is used up for now; the client can resubmit the same answer
+        headers = {"Retry-After": str(math.ceil(e.retry_after))} if e.retry_after else None
+        raise HTTPException(status_code=503, detail="Answer evaluation is busy, please try again shortly", headers=headers)
     except Exception as e:
         logger.error(f"Answer evaluation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -180,7 +272,7 @@ async def submit_answer(request: AnswerSubmissionRequest):
 # INTERVIEW DATA STORAGE ENDPOINTS
 # =========================
 
-@app.post("/interview/complete-and-save")
+@router.post("/interview/complete-and-save")
 async def complete_interview_and_save(request: dict):
     """Complete interview and save all data (no audio/screenshots)"""
     try:
@@ -208,6 +300,7 @@ async def complete_interview_and_save(request: dict):
         interview_document = {
             "candidate_id": candidate_id,
             "session_id": session_id,
+            "status": "completed",
             "interactions": interactions,
             "scores": {
                 "total_score": total_score,
@@ -225,22 +318,8 @@ async def complete_interview_and_save(request: dict):
             "updated_at": datetime.utcnow()
         }
         
-        # Check if interview already exists
-        existing_interview = interaction_collection.find_one({"candidate_id": candidate_id})
-        
-        if existing_interview:
-            # Update existing interview
-            result = interaction_collection.update_one(
-                {"candidate_id": candidate_id},
-                {"$set": interview_document}
-            )
-            operation = "updated"
-            document_id = existing_interview["_id"]
-        else:
-            # Create new interview
-            result = interaction_collection.insert_one(interview_document)
-            operation = "created"
-            document_id = result.inserted_id
+        # Update the existing interview or create a new one
+        operation, document_id = await repository.interactions.save(candidate_id, interview_document)
         
         logger.info(f"✅ Interview data {operation} for candidate {candidate_id}")
         
@@ -259,61 +338,98 @@ async def complete_interview_and_save(request: dict):
         logger.error(f"Error saving interview data: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to save interview data: {str(e)}")
 
-@app.get("/candidate/{candidate_id}/score", response_model=CandidateScoreResponse)
-async def get_candidate_score(candidate_id: str):
-    """Get candidate's interview score"""
+@router.post("/interview/interaction")
+async def append_interview_interaction(request: InteractionAppendRequest):
+    """
+    Persist one scored turn as soon as it happens, in a draft for this session.
+    Running totals are kept on the server, so a browser crash loses at most the
+    current turn; the candidate's saved interview is only replaced when the
+    session is finalized, which is a constant-size call.
+    """
     try:
-        # Get from interaction collection
-        interview_data = interaction_collection.find_one({"candidate_id": candidate_id})
-        
-        if interview_data:
-            scores = interview_data.get("scores", {})
-            return CandidateScoreResponse(
-                candidate_id=candidate_id,
-                average_score=scores.get("average_score", 0),
-                total_questions=interview_data.get("metadata", {}).get("total_questions", 0),
-                total_score=scores.get("total_score", 0),
-                interview_details=interview_data
+        outcome = await repository.interactions.append(
+            request.candidate_id, request.session_id, request.interaction, request.turn_id
+        )
+        return {"success": True, "candidate_id": request.candidate_id, "operation": outcome}
+    except Exception as e:
+        logger.error(f"Error appending interaction: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to save interaction: {str(e)}")
+
+@router.post("/interview/{candidate_id}/finalize")
+async def finalize_interview(candidate_id: str, request: InterviewFinalizeRequest = Body(default=InterviewFinalizeRequest())):
+    """Save the interview built with /interview/interaction as the candidate's completed interview"""
+    try:
+        doc = await repository.interactions.finalize(candidate_id, request.session_id)
+        if not doc:
+            raise HTTPException(status_code=404, detail="No interactions saved for this interview")
+
+        scores = doc.get("scores", {})
+        logger.info(f"✅ Interview finalized for candidate {candidate_id}")
+        return {
+            "success": True,
+            "message": "Interview finalized successfully",
+            "candidate_id": candidate_id,
+            "document_id": str(doc["_id"]),
+            "operation": "finalized",
+            "total_interactions_saved": doc.get("metadata", {}).get("total_questions", 0),
+            "average_score": scores.get("average_score", 0),
+            "collection": "aieta.interaction"
+        }
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error finalizing interview: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to finalize interview: {str(e)}")
+
+@router.get("/candidate/{candidate_id}/score", response_model=CandidateScoreResponse)
+async def get_candidate_score(candidate_id: str, include_details: bool = False):
+    """
+    Get candidate's interview score from the materialized score summary.
+    The full interview document is only loaded with ?include_details=true.
+    """
+    try:
+        summary = await repository.score_summaries.get(candidate_id)
+        if summary is None:
+            # Not materialized yet (data saved before summaries existed)
+            summary = (
+                await repository.score_summaries.refresh(candidate_id)
+                or await repository.score_summaries.refresh_from_legacy(candidate_id)
             )
-        
-        # Fallback to old collection
-        interview_data = interviews_collection.find_one({"candidate_id": candidate_id})
-        
-        if not interview_data:
+        if summary is None:
             raise HTTPException(status_code=404, detail="No interview data found for candidate")
-        
-        # Calculate scores from interactions (old method)
-        total_score = 0
-        total_questions = len(interview_data["interactions"])
-        
-        for interaction in interview_data["interactions"]:
-            total_score += interaction.get("score", 0)
-        
-        average_score = total_score / total_questions if total_questions > 0 else 0
-        
+
+        interview_details = None
+        if include_details:
+            interview_details = (
+                await repository.interactions.get(candidate_id)
+                or await repository.interviews.get(candidate_id)
+            )
+
         return CandidateScoreResponse(
             candidate_id=candidate_id,
-            average_score=average_score,
-            total_questions=total_questions,
-            total_score=total_score,
-            interview_details=interview_data
+            average_score=summary.get("average_score", 0),
+            total_questions=summary.get("total_questions", 0),
+            total_score=summary.get("total_score", 0),
+            interview_details=interview_details
         )
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error getting candidate score: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.delete("/interview/{candidate_id}")
+@router.delete("/interview/{candidate_id}")
 async def delete_interview_data(candidate_id: str):
     """Delete interview data for a candidate"""
     try:
         # Delete from interaction collection
-        result = interaction_collection.delete_one({"candidate_id": candidate_id})
+        deleted_count = await repository.interactions.delete(candidate_id)
         
         return {
             "success": True,
             "candidate_id": candidate_id,
-            "deleted_count": result.deleted_count,
-            "message": "Interview data deleted successfully" if result.deleted_count > 0 else "No interview data found to delete",
+            "deleted_count": deleted_count,
+            "message": "Interview data deleted successfully" if deleted_count > 0 else "No interview data found to delete",
             "collection": "aieta.interaction"
         }
         
@@ -326,11 +442,11 @@ async def delete_interview_data(candidate_id: str):
 # =========================
 
 
-@app.post("/tts/speak-base64")
+@router.post("/tts/speak-base64")
 async def generate_tts_runtime(request: dict = Body(...)):
     """
-    Always generate TTS (Google Text-to-Speech) in real-time.
-    Returns MP3 audio as base64-encoded string.
+    Generate TTS with the configured backend (TTS_BACKEND), served from the TTS
+    cache when the same text was synthesized before. Returns audio as base64-encoded string.
     """
     try:
         text = request.get("text", "")
@@ -340,69 +456,212 @@ async def generate_tts_runtime(request: dict = Body(...)):
         if not text.strip():
             raise HTTPException(status_code=400, detail="text is required")
 
-        logger.info(f"🎙️ Generating runtime TTS for: {text[:60]}")
-
-        # Generate speech using gTTS
-        tts = gTTS(text=text, lang=language, slow=slow)
-        mp3_buffer = io.BytesIO()
-        tts.write_to_fp(mp3_buffer)
-        mp3_buffer.seek(0)
+        # Memory -> GridFS (tts_files) -> TTS backend
+        audio_bytes, source = await tts_cache.get_or_synthesize(text, language, slow)
+        logger.info(f"🎙️ TTS ({source}) for: {text[:60]}")
 
         # Convert to base64
-        audio_base64 = base64.b64encode(mp3_buffer.getvalue()).decode("utf-8")
+        audio_base64 = base64.b64encode(audio_bytes).decode("utf-8")
 
         return {
             "success": True,
             "audio_base64": audio_base64,
             "text": text,
             "language": language,
-            "format": "mp3",
-            "source": "runtime_generated"
+            "format": tts_cache.backend.format,
+            "source": source
         }
 
     except Exception as e:
         logger.error(f"TTS generation error: {e}")
         raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
 
-@app.get("/tts/speak/{candidate_id}/{question_number}")
-async def fetch_tts_file(candidate_id: str, question_number: int):
-    """Fetch pre-generated TTS audio file"""
+async def _tts_stream_response(text, language, slow):
+    """Shared body of the streaming TTS endpoints"""
+    if not text.strip():
+        raise HTTPException(status_code=400, detail="text is required")
+
+    source, audio_iter = await tts_cache.open_stream(text, language, slow)
+    logger.info(f"🎙️ Streaming TTS ({source}) for: {text[:60]}")
+    return StreamingResponse(
+        audio_iter,
+        media_type=tts_cache.backend.media_type,
+        headers={"X-TTS-Source": source, "Cache-Control": "no-transform"}
+    )
+
+@router.get("/tts/speak-stream")
+async def stream_tts_get(text: str, language: str = "en", slow: bool = False):
+    """
+    Stream TTS as raw audio (audio/mpeg for gTTS) so an <audio> element can start playing
+    before synthesis finishes. Usable directly as an <audio src> URL.
+    """
     try:
-        preprocessing_collection = db['test_preprocessing']
-        
-        doc = preprocessing_collection.find_one({"candidate_id": candidate_id})
+        return await _tts_stream_response(text, language, slow)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
+
+@router.post("/tts/speak-stream")
+async def stream_tts_post(request: dict = Body(...)):
+    """Same as GET /tts/speak-stream, taking the /tts/speak-base64 request body"""
+    try:
+        return await _tts_stream_response(
+            request.get("text", ""),
+            request.get("language", "en"),
+            request.get("slow", False)
+        )
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"TTS stream error: {e}")
+        raise HTTPException(status_code=500, detail=f"TTS failed: {str(e)}")
+
+def _etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match already names this ETag"""
+    if_none_match = request.headers.get("if-none-match")
+    return bool(if_none_match) and (
+        if_none_match.strip() == "*" or etag in [t.strip() for t in if_none_match.split(",")]
+    )
+
+def _parse_byte_range(range_header, size):
+    """
+    Parse a single 'bytes=start-end' Range header against a file of `size` bytes.
+    Returns (start, end) inclusive, or None to serve the whole file: absent,
+    malformed, multi-range and invalid (last < first) ranges are ignored as
+    RFC 9110 §14.2 requires. Raises 416 only for a valid range that starts past
+    the end of the file (or an empty suffix).
+    """
+    match = re.fullmatch(r"bytes=(\d*)-(\d*)", (range_header or "").strip())
+    if not match or not (match[1] or match[2]):
+        return None
+    if match[1]:
+        start = int(match[1])
+        if match[2] and int(match[2]) < start:
+            return None
+        end = int(match[2]) if match[2] else size - 1
+    else:  # Suffix range: last N bytes
+        start = max(size - int(match[2]), 0)
+        end = size - 1
+    if start >= size:
+        raise HTTPException(
+            status_code=416,
+            detail="Requested range not satisfiable",
+            headers={"Content-Range": f"bytes */{size}"}
+        )
+    return start, min(end, size - 1)
+
+async def _iter_gridfs_range(grid_out, start, end):
+    """Yield bytes start..end (inclusive) one GridFS chunk at a time"""
+    await grid_out.seek(start)
+    remaining = end - start + 1
+    while remaining > 0:
+        chunk = await grid_out.readchunk()
+        if not chunk:
+            break
+        chunk = chunk[:remaining]
+        remaining -= len(chunk)
+        yield chunk
+
+@router.get("/tts/speak/{candidate_id}/{question_number}")
+async def fetch_tts_file(candidate_id: str, question_number: int, request: Request):
+    """
+    Fetch pre-generated TTS audio file. Streams GridFS chunks straight through,
+    honours single byte-range requests (206) and answers conditional requests
+    with 304 via ETag / Last-Modified.
+    """
+    from gridfs.errors import NoFile
+
+    try:
+        doc = await repository.preprocessing.get(candidate_id, {
+            "audio_file_greetings": 1,
+            "questions.question_number": 1,
+            "questions.audio_file_question_number": 1
+        })
         if not doc:
             raise HTTPException(status_code=404, detail="Candidate not found")
 
         if question_number == 0:  # Greeting
             audio_id = doc.get("audio_file_greetings")
         else:
-            q = next((q for q in doc["questions"] if q["question_number"] == question_number), None)
+            q = next((q for q in doc.get("questions", []) if q.get("question_number") == question_number), None)
             if not q:
                 raise HTTPException(status_code=404, detail=f"Question {question_number} not found")
-            audio_id = q["audio_file_question_number"]
+            audio_id = q.get("audio_file_question_number")
 
         if not audio_id:
             raise HTTPException(status_code=404, detail="Audio file not found")
 
-        fs = gridfs.GridFS(db)
-        grid_out = fs.get(audio_id)
+        # GridFS files are immutable, so the file id is a strong validator and
+        # revalidating replays are answered without touching GridFS at all
+        etag = f'"{audio_id}"'
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers={"ETag": etag})
+
+        grid_out = await repository.tts_files.open_audio(audio_id)
+        size = grid_out.length
+        upload_date = grid_out.upload_date.replace(tzinfo=timezone.utc)
+        last_modified = format_datetime(upload_date, usegmt=True)
+
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since and not request.headers.get("if-none-match"):
+            try:
+                if upload_date.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since):
+                    return Response(status_code=304, headers={"ETag": etag, "Last-Modified": last_modified})
+            except (TypeError, ValueError):
+                pass
+
+        media_type = (grid_out.metadata or {}).get("content_type", "audio/mpeg")
+        extension = "wav" if media_type == "audio/wav" else "mp3"
+        headers = {
+            "Content-Disposition": f'inline; filename="tts_{candidate_id}_{question_number}.{extension}"',
+            "Accept-Ranges": "bytes",
+            "ETag": etag,
+            "Last-Modified": last_modified,
+            "Cache-Control": "no-cache"
+        }
+
+        byte_range = _parse_byte_range(request.headers.get("range"), size)
+        if_range = request.headers.get("if-range")
+        if byte_range and if_range and if_range.strip() not in (etag, last_modified):
+            byte_range = None  # Representation changed since the client cached it
+
+        if byte_range is None:
+            start, end, status_code = 0, size - 1, 200
+        else:
+            (start, end), status_code = byte_range, 206
+            headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+        headers["Content-Length"] = str(end - start + 1)
 
         return StreamingResponse(
-            io.BytesIO(grid_out.read()),
-            media_type="audio/mpeg",
-            headers={"Content-Disposition": f'inline; filename="tts_{candidate_id}_{question_number}.mp3"'}
+            _iter_gridfs_range(grid_out, start, end),
+            status_code=status_code,
+            media_type=media_type,
+            headers=headers
         )
 
+    except HTTPException:
+        raise
+    except NoFile:
+        raise HTTPException(status_code=404, detail="Audio file not found")
     except Exception as e:
         logger.error(f"TTS fetch file error: {e}")
         raise HTTPException(status_code=500, detail=f"TTS fetch file failed: {str(e)}")
 
+@router.get("/tts/pipeline/{candidate_id}")
+async def get_tts_pipeline_status(candidate_id: str):
+    """Progress of background audio pre-synthesis for a candidate"""
+    status = await tts_pipeline.status(candidate_id)
+    if status is None:
+        raise HTTPException(status_code=404, detail="No TTS pre-synthesis job for candidate")
+    return {"candidate_id": candidate_id, **status}
+
 # =========================
 # CODING ROUND ENDPOINTS (if needed)
 # =========================
 
-@app.post("/coding/submit", response_model=CodingSubmissionResponse)
+@router.post("/coding/submit", response_model=CodingSubmissionResponse)
 async def submit_code(request: CodingSubmissionRequest):
     """Submit coding solution"""
     try:
@@ -411,9 +670,6 @@ async def submit_code(request: CodingSubmissionRequest):
         
         execution_result = code_executor(request.code)
         
-        coding_db = client['ai_interviewer']
-        coding_collection = coding_db['coding_submissions']
-        
         submission_doc = {
             "candidate_id": request.candidate_id,
             "code": request.code,
@@ -421,11 +677,11 @@ async def submit_code(request: CodingSubmissionRequest):
             "submitted_at": datetime.utcnow()
         }
         
-        result = coding_collection.insert_one(submission_doc)
+        submission_id = await repository.coding_submissions.insert(submission_doc)
         
         return CodingSubmissionResponse(
             execution_result=execution_result,
-            submission_id=str(result.inserted_id)
+            submission_id=str(submission_id)
         )
     except Exception as e:
         logger.error(f"Code submission error: {e}")
@@ -435,7 +691,7 @@ async def submit_code(request: CodingSubmissionRequest):
 # PREPROCESSING ENDPOINTS
 # =========================
 
-@app.post("/store-questions")
+@router.post("/store-questions")
 async def store_questions(payload: dict):
     """Store interview questions"""
     try:
@@ -445,12 +701,12 @@ async def store_questions(payload: dict):
         if not candidate_id or not questions:
             raise HTTPException(status_code=400, detail="candidate_id and questions are required")
 
-        from src.helper import store_questions_in_mongo
-        inserted_ids = store_questions_in_mongo(candidate_id, questions)
+        document_id = await repository.preprocessing.store_questions(candidate_id, questions)
+        tts_pipeline.submit(candidate_id)
         
         return {
             "candidate_id": candidate_id,
-            "inserted_ids": [str(x) for x in inserted_ids] if inserted_ids else [],
+            "inserted_ids": [str(document_id)],
             "message": f"{len(questions)} questions stored successfully ✅",
         }
     except Exception as e:
@@ -461,24 +717,69 @@ async def store_questions(payload: dict):
 # REPORT GENERATION ENDPOINTS
 # =========================
 
-@app.get("/report/{candidate_id}")
-def get_candidate_report(candidate_id: str):
-    """Generate candidate report"""
+@router.get("/report/{candidate_id}")
+def get_candidate_report(candidate_id: str, request: Request):
+    """
+    Generate candidate report. Renders are cached per interview result version
+    and streamed on a miss; a client holding the current ETag gets 304 without
+    a render or a read.
+    """
     try:
-        from src.helper import build_candidate_report
-        filepath = build_candidate_report(candidate_id)
-        if not filepath:
+        from src.helper import get_report_version, build_candidate_report
+
+        version = get_report_version(candidate_id)
+        if not version:
+            raise HTTPException(status_code=404, detail="Candidate not found")
+
+        etag = f'"{report_cache_key(candidate_id, version)}"'
+        headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+        if _etag_matches(request, etag):
+            return Response(status_code=304, headers=headers)
+
+        report = build_candidate_report(candidate_id, version)
+        if not report:
             raise HTTPException(status_code=404, detail="Candidate not found")
-        return FileResponse(filepath, media_type="text/html", filename=os.path.basename(filepath))
+        _, body = report
+        headers["Content-Disposition"] = f'attachment; filename="interview_report_{candidate_id}.html"'
+        if isinstance(body, bytes):
+            return Response(content=body, media_type="text/html", headers=headers)
+        # Fresh render: chunks go out as they are produced
+        return StreamingResponse(body, media_type="text/html", headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Report generation error: {e}")
         raise HTTPException(status_code=500, detail=str(e))
 
+# =========================
+# BULK EXPORT ENDPOINTS
+# =========================
+
+@router.post("/export/interviews")
+async def export_interviews(request: ExportRequest):
+    """
+    Stream saved interviews for request.candidate_ids (all if empty) as NDJSON
+    (format json/ndjson) or CSV, straight off a Mongo cursor. xlsx is rejected:
+    it cannot be produced without building the whole workbook in memory.
+    """
+    try:
+        media_type, extension = resolve_format(request.format)
+    except ExportFormatError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    filename = f"interviews_export_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    logger.info(f"📤 Export started: {len(request.candidate_ids) or 'all'} candidates as {extension}")
+    return StreamingResponse(
+        iter_export(request),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
 # =========================
 # HEALTH CHECK ENDPOINTS
 # =========================
 
-@app.get("/health")
+@router.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
@@ -491,7 +792,23 @@ async def health_check():
         }
     }
 
-@app.get("/")
+@router.get("/metrics")
+async def metrics():
+    """Runtime counters for capacity planning"""
+    return {
+        "llm": llm_engine.stats(),
+        "mongo_pool": pool_metrics.snapshot(),
+        "template_cache": template_cache.stats(),
+        "evaluation_cache": evaluation_cache.stats(),
+        "tts_cache": tts_cache.stats(),
+        "tts_pipeline": tts_pipeline.stats(),
+        "session_store": session_store.stats(),
+        "report_cache": report_cache.stats(),
+        "pregeneration": pregeneration_jobs.stats(),
+        "llm_rate_limiter": llm_rate_limiter.stats()
+    }
+
+@router.get("/")
 async def root():
     """Root endpoint"""
     return {
@@ -514,7 +831,6 @@ async def root():
 # ERROR HANDLERS
 # =========================
 
-@app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     logger.error(f"Global exception: {exc}")
     return JSONResponse(
@@ -523,17 +839,64 @@ async def global_exception_handler(request, exc):
     )
 
 # =========================
-# STARTUP/SHUTDOWN EVENTS
+# APP FACTORY AND LIFESPAN
 # =========================
 
-@app.on_event("startup")
-async def startup_event():
-    logger.info("🚀 AEITA AI Interviewer Clean v4.0.0 started")
+async def _warm_up():
+    """Startup work that should not delay the first request"""
+    try:
+        results = await ensure_indexes()
+        logger.info(f"🗂️ Indexes ensured: {sum(r == 'ok' for r in results.values())}/{len(results)}")
+    except Exception as e:
+        logger.warning(f"Could not ensure indexes: {e}")
+    if LLM_PREWARM:
+        try:
+            started_at = time.perf_counter()
+            await asyncio.to_thread(warm_up_llm)
+            logger.info(f"🔥 LLM chains ready in {(time.perf_counter() - started_at) * 1000:.0f} ms")
+        except Exception as e:
+            logger.warning(f"LLM warm-up failed: {e}")
+
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Runs once per worker process. Mongo and Groq clients are created lazily on
+    first use inside the worker, so importing main opens no connections. Index
+    creation and LLM warm-up run in the background so the worker serves /health
+    immediately. In-flight requests (LLM calls included) have already been given
+    serve.py's graceful timeout to finish by the time shutdown runs here.
+    """
+    warm_up = asyncio.create_task(_warm_up())
+    logger.info(f"🚀 AEITA AI Interviewer Clean v4.0.0 started (pid {os.getpid()})")
     logger.info("✅ Frontend handles: Audio recording, Speech recognition, Screen monitoring")
 
-@app.on_event("shutdown")
-async def shutdown_event():
-    logger.info("🛑 AEITA AI Interviewer Clean v4.0.0 shutdown")
+    yield
+
+    warm_up.cancel()
+    await pregeneration_jobs.shutdown()  # Marked cancelled; resumable from their checkpoints
+    await tts_pipeline.shutdown()
+    await close_clients()
+    logger.info(f"🛑 AEITA AI Interviewer Clean v4.0.0 shutdown (pid {os.getpid()})")
+
+
+def create_app():
+    """Build the FastAPI application; `uvicorn main:create_app --factory` calls this once per worker"""
+    app = FastAPI(title="AEITA AI Interviewer Clean", version="4.0.0", lifespan=lifespan)
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["GET", "POST", "PUT", "DELETE"],
+        allow_headers=["*"],
+    )
+    app.include_router(router)
+    app.add_exception_handler(Exception, global_exception_handler)
+    return app
+
+
+# Module-level app for `uvicorn main:app` and the benchmarks
+app = create_app()
 
 # =========================
 # MAIN APPLICATION ENTRY POINT
@@ -551,6 +914,7 @@ if __name__ == "__main__":
     print(f"🗣️ Speech Recognition: Frontend (Web Speech API)")
     print(f"📸 Screen Monitoring: Frontend (Screen Capture API)")
     print(f"💻 Platform: Clean Backend")
+    print(f"⚙️ Multi-worker: python serve.py")
     print("="*80 + "\n")
     
     uvicorn.run(app, host="0.0.0.0", port=8000)
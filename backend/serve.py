@@ -0,0 +1,70 @@
+# serve.py - Multi-Worker Server Launcher
+# Runs main:create_app in one uvicorn worker process per CPU core. Each worker
+# builds its own app, Mongo pool and Groq client; the supervisor restarts dead
+# workers, and SIGHUP (pm2 reload) restarts them one by one; a stopping worker
+# gives open requests (LLM calls included) --graceful-timeout seconds to finish.
+# Workers are started with spawn, not fork, so no client state is inherited.
+#
+#   python serve.py                      # workers = WEB_CONCURRENCY or CPU count
+#   python serve.py --workers 1 --port 8001
+
+import os
+import argparse
+
+import uvicorn
+
+
+def default_workers():
+    return int(os.getenv("WEB_CONCURRENCY") or os.cpu_count() or 1)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the AEITA backend with multiple worker processes")
+    parser.add_argument("--host", default=os.getenv("HOST", "0.0.0.0"))
+    parser.add_argument("--port", type=int, default=int(os.getenv("PORT", "8000")))
+    parser.add_argument("--workers", type=int, default=default_workers())
+    parser.add_argument(
+        "--graceful-timeout", type=float,
+        default=float(os.getenv("GRACEFUL_TIMEOUT_SECONDS", "30")),
+        help="Seconds a stopping worker waits for open requests before shutting down"
+    )
+    return parser.parse_args()
+
+
+def main():
+    args = parse_args()
+
+    if args.workers > 1:
+        # Follow-up counters must be visible to whichever worker gets the next answer
+        os.environ.setdefault("SESSION_STORE_BACKEND", "mongo")
+        # /store-questions only invalidates the template cache of the worker that
+        # handled it; keep the others' copies short-lived so edits show up quickly
+        os.environ.setdefault("TEMPLATE_CACHE_TTL_SECONDS", "30")
+    # Each worker gets an equal share of the Groq RPM/TPM limits and therefore of the
+    # burst allowance too; live calls give up after GROQ_INTERACTIVE_MAX_WAIT_SECONDS
+    # (src/rate_limiter.py)
+    os.environ.setdefault("GROQ_RATE_LIMIT_WORKERS", str(args.workers))
+
+    print("\n" + "="*80)
+    print("🎯 AEITA AI INTERVIEWER CLEAN v4.0.0")
+    print("="*80)
+    print(f"🌐 FastAPI Server: http://{args.host}:{args.port}")
+    print(f"⚙️ Workers: {args.workers} (CPU cores: {os.cpu_count()})")
+    print(f"🗂️ Session store: {os.getenv('SESSION_STORE_BACKEND', 'memory')}")
+    print(f"📋 Template cache TTL: {os.getenv('TEMPLATE_CACHE_TTL_SECONDS', '3600')}s")
+    print(f"🚦 Groq limits: {os.getenv('GROQ_RPM', '30')} RPM / {os.getenv('GROQ_TPM', '6000')} TPM across {args.workers} worker(s)")
+    print("="*80 + "\n")
+
+    uvicorn.run(
+        "main:create_app",
+        factory=True,
+        host=args.host,
+        port=args.port,
+        workers=args.workers,
+        timeout_graceful_shutdown=args.graceful_timeout,
+        proxy_headers=True,
+    )
+
+
+if __name__ == "__main__":
+    main()
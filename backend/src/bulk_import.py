@@ -0,0 +1,315 @@
+# src/bulk_import.py - Streaming Bulk Candidate Import
+# Parses JSON arrays or NDJSON incrementally from any async byte stream (request
+# body or file), validates each record against CandidateCreateRequest, and writes
+# unordered bulk_write upserts keyed on `id`, IMPORT_BATCH_SIZE records at a time.
+# The next batch is parsed while the previous one is being written.
+#
+#   python -m src.bulk_import candidates.ndjson
+#   python -m src.bulk_import candidates.json --format json --overwrite
+#   python -m src.bulk_import candidates.ndjson --validate-only
+
+import os
+import sys
+import json
+import codecs
+import asyncio
+import argparse
+import logging
+
+from pydantic import ValidationError
+
+from src import repository
+from src.schemas import CandidateCreateRequest, BulkOperationResponse
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = int(os.getenv("IMPORT_BATCH_SIZE", "1000"))
+IMPORT_MAX_ERRORS = int(os.getenv("IMPORT_MAX_ERRORS", "1000"))
+IMPORT_MAX_RECORD_BYTES = int(os.getenv("IMPORT_MAX_RECORD_BYTES", str(1024 * 1024)))
+IMPORT_READ_BYTES = 64 * 1024
+IMPORT_FORMATS = ("json", "ndjson")
+# Optional CandidateCreateRequest fields; only written when a new candidate is created
+CANDIDATE_INSERT_DEFAULTS = {
+    name: field.get_default(call_default_factory=True)
+    for name, field in CandidateCreateRequest.model_fields.items()
+    if not field.is_required()
+}
+
+
+class ImportFormatError(ValueError):
+    """Unknown data_format"""
+
+# =========================
+# INCREMENTAL PARSERS
+# =========================
+
+async def _decoded(chunks):
+    """UTF-8 text from byte chunks; multi-byte characters may straddle chunks"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    async for chunk in chunks:
+        text = decoder.decode(chunk)
+        if text:
+            yield text
+    tail = decoder.decode(b"", final=True)
+    if tail:
+        yield tail
+
+
+async def iter_ndjson_records(chunks):
+    """
+    Yield (record_number, value, error) per non-blank line; error is None or a
+    message. A bad line is reported and parsing carries on with the next one.
+    """
+    buffer = ""
+    number = 0
+    async for text in _decoded(chunks):
+        buffer += text
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            if line.strip():
+                number += 1
+                yield (number, *_loads(line))
+    if buffer.strip():
+        yield (number + 1, *_loads(buffer))
+
+
+def _loads(line):
+    """(value, None) or (None, error message)"""
+    try:
+        return json.loads(line), None
+    except json.JSONDecodeError as e:
+        return None, f"invalid JSON: {e.msg} (column {e.colno})"
+
+
+def _may_continue(buffer, end, value):
+    """
+    True if a value decoded up to `end` could still be the prefix of a longer one:
+    it ends exactly at the end of the buffer, or it is a number followed by a
+    character that could extend it ("2" + "3", "-7" + ".5e3")
+    """
+    if end == len(buffer):
+        return True
+    is_number = isinstance(value, (int, float)) and not isinstance(value, bool)
+    return is_number and buffer[end] in ".eE+-0123456789"
+
+
+async def iter_json_records(chunks):
+    """
+    Yield (record_number, value, error) for each element of a top-level
+    JSON array (or a single top-level object) without loading the whole document.
+    Syntax errors cannot be resynchronised, so the first one ends the import;
+    anything but whitespace after the document is reported as an error.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    number = 0
+    state = "start"  # start -> value -> separator -> ... -> done
+    stream = _decoded(chunks)
+    exhausted = False
+
+    while state != "done":
+        # Skip whitespace; when the buffer runs dry, read more (or stop at EOF)
+        while pos < len(buffer) and buffer[pos] in " \t\r\n":
+            pos += 1
+        if pos >= len(buffer):
+            if exhausted:
+                break
+            buffer, pos = "", 0
+            try:
+                buffer = await stream.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+            continue
+
+        char = buffer[pos]
+        if state == "start":
+            if char == "[":
+                pos += 1
+                state = "value"
+                continue
+            state = "single"
+        elif state == "separator":
+            if char == ",":
+                pos += 1
+                state = "value"
+                continue
+            if char == "]":
+                pos += 1
+                state = "done"
+                continue
+            yield number + 1, None, f"invalid JSON: expected ',' or ']' at record {number + 1}"
+            return
+        elif state == "value" and char == "]" and number == 0:
+            pos += 1
+            state = "done"
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError as e:
+            if exhausted or len(buffer) - pos > IMPORT_MAX_RECORD_BYTES:
+                yield number + 1, None, f"invalid JSON: {e.msg}"
+                return
+            end = None  # Probably a record cut off at the chunk boundary
+        if end is None or (
+            not exhausted and len(buffer) - pos <= IMPORT_MAX_RECORD_BYTES and _may_continue(buffer, end, value)
+        ):
+            # Read more and retry
+            try:
+                buffer = buffer[pos:] + await stream.__anext__()
+            except StopAsyncIteration:
+                exhausted = True
+                buffer = buffer[pos:]
+            pos = 0
+            continue
+
+        number += 1
+        yield number, value, None
+        pos = end
+        state = "done" if state == "single" else "separator"
+
+    if state not in ("done", "start"):
+        yield number + 1, None, "invalid JSON: unexpected end of input"
+        return
+
+    # Only whitespace may follow the closing ']' (or the single top-level value)
+    trailing = buffer[pos:].strip()
+    while not trailing and not exhausted:
+        try:
+            trailing = (await stream.__anext__()).strip()
+        except StopAsyncIteration:
+            exhausted = True
+    if trailing:
+        yield number + 1, None, "invalid JSON: unexpected data after the end of the document"
+
+# =========================
+# VALIDATION AND WRITES
+# =========================
+
+def validate_record(record):
+    """Candidate document for one parsed record; raises ValueError with a readable reason"""
+    if not isinstance(record, dict):
+        raise ValueError(f"expected an object, got {type(record).__name__}")
+    candidate_id = record.get("id")
+    if candidate_id is None or str(candidate_id).strip() == "":
+        raise ValueError("missing 'id'")
+    try:
+        candidate = CandidateCreateRequest(**record)
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+        ))
+    # Keep any extra fields the source system sent, with the validated ones normalised.
+    # Unset optional fields are left out, so an overwrite never blanks stored lists
+    # (defaults are applied on insert, see CANDIDATE_INSERT_DEFAULTS)
+    return {**record, **candidate.model_dump(exclude_unset=True), "id": str(candidate_id).strip()}
+
+
+async def import_candidates(chunks, data_format="ndjson", overwrite_existing=False,
+                            validate_only=False, batch_size=IMPORT_BATCH_SIZE):
+    """Import candidates from an async iterator of bytes; returns a BulkOperationResponse"""
+    if data_format not in IMPORT_FORMATS:
+        raise ImportFormatError(f"Unknown data_format '{data_format}', expected one of {list(IMPORT_FORMATS)}")
+    parse = iter_ndjson_records if data_format == "ndjson" else iter_json_records
+
+    totals = {"processed": 0, "failed": 0, "created": 0, "updated": 0}
+    errors = []
+
+    def fail(number, message):
+        totals["failed"] += 1
+        if len(errors) < IMPORT_MAX_ERRORS:
+            errors.append(f"record {number}: {message}")
+
+    async def write(batch):
+        created, updated, write_errors = await repository.candidates.bulk_upsert(
+            [doc for _, doc in batch], overwrite_existing, CANDIDATE_INSERT_DEFAULTS
+        )
+        totals["created"] += created
+        totals["updated"] += updated
+        for index, message in write_errors:
+            totals["processed"] -= 1
+            fail(batch[index][0], message)
+
+    batch = []
+    pending = None  # The previous batch's write overlaps parsing of this one
+    async for number, record, error in parse(chunks):
+        if error:
+            fail(number, error)
+            continue
+        try:
+            doc = validate_record(record)
+        except ValueError as e:
+            fail(number, str(e))
+            continue
+
+        totals["processed"] += 1
+        if validate_only:
+            continue
+        batch.append((number, doc))
+        if len(batch) >= batch_size:
+            if pending:
+                await pending
+            pending = asyncio.create_task(write(batch))
+            batch = []
+
+    if pending:
+        await pending
+    if batch:
+        await write(batch)
+
+    logger.info(
+        f"📥 Candidate import{' (validate only)' if validate_only else ''}: "
+        f"{totals['processed']} ok, {totals['failed']} failed, "
+        f"{totals['created']} created, {totals['updated']} updated"
+    )
+    return BulkOperationResponse(
+        success=totals["failed"] == 0,
+        processed_count=totals["processed"],
+        failed_count=totals["failed"],
+        errors=errors,
+        created_count=totals["created"],
+        updated_count=totals["updated"],
+        errors_truncated=totals["failed"] > len(errors),
+    )
+
+# =========================
+# CLI
+# =========================
+
+async def _read_file(path, size=IMPORT_READ_BYTES):
+    with open(path, "rb") as f:
+        while chunk := await asyncio.to_thread(f.read, size):
+            yield chunk
+
+
+async def run(path, data_format, overwrite_existing, validate_only):
+    from src.database import close_clients
+    try:
+        return await import_candidates(_read_file(path), data_format, overwrite_existing, validate_only)
+    finally:
+        await close_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk import candidates from a JSON array or NDJSON file")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=IMPORT_FORMATS,
+                        help="Default: from the file extension (.json -> json, anything else -> ndjson)")
+    parser.add_argument("--overwrite", action="store_true", help="Update candidates whose id already exists")
+    parser.add_argument("--validate-only", action="store_true", help="Parse and validate without writing")
+    args = parser.parse_args()
+
+    data_format = args.format or ("json" if args.path.endswith(".json") else "ndjson")
+    result = asyncio.run(run(args.path, data_format, args.overwrite, args.validate_only))
+    for error in result.errors:
+        print(f"❌ {error}")
+    if result.errors_truncated:
+        print(f"... {result.failed_count - len(result.errors)} more failures not shown")
+    print(f"{'✅' if result.success else '⚠️'} processed {result.processed_count}, failed {result.failed_count}, "
+          f"created {result.created_count}, updated {result.updated_count}")
+    sys.exit(0 if result.success else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+# src/cache.py - In-Process Caches
+# A small thread-safe LRU cache with optional TTL, plus the shared cache
+# instances used by the helpers and repositories.
+
+import os
+import time
+import threading
+from collections import OrderedDict
+
+_MISSING = object()
+
+
+class LRUTTLCache:
+    """
+    Bounded LRU cache whose entries also expire after `ttl` seconds (None = never).
+    With `max_weight` and `weigher` (e.g. len for bytes) the total weight is bounded too.
+    """
+
+    def __init__(self, maxsize=1024, ttl=None, max_weight=None, weigher=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher or (lambda value: 1)
+        self.weight = 0
+        self._data = OrderedDict()  # key -> (expires_at, weight, value)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key, _MISSING)
+            if entry is _MISSING:
+                self.misses += 1
+                return default
+            expires_at, weight, value = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._data[key]
+                self.weight -= weight
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl else None
+        weight = self.weigher(value)
+        if self.max_weight is not None and weight > self.max_weight:
+            return  # Larger than the whole cache; do not flush everything for it
+        with self._lock:
+            previous = self._data.pop(key, None)
+            if previous:
+                self.weight -= previous[1]
+            self._data[key] = (expires_at, weight, value)
+            self.weight += weight
+            while len(self._data) > self.maxsize or (
+                self.max_weight is not None and self.weight > self.max_weight
+            ):
+                _, (_, evicted_weight, _) = self._data.popitem(last=False)
+                self.weight -= evicted_weight
+                self.evictions += 1
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if not entry:
+                return None
+            self.weight -= entry[1]
+            return entry[2]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self.weight = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            **({"weight": self.weight, "max_weight": self.max_weight} if self.max_weight is not None else {}),
+        }
+
+# =========================
+# SHARED CACHE INSTANCES
+# =========================
+
+# candidate_id -> (greeting, questions); see get_stored_interview_template.
+# Invalidation is per process, so serve.py shortens the TTL when it runs several workers
+template_cache = LRUTTLCache(
+    maxsize=int(os.getenv("TEMPLATE_CACHE_SIZE", "2048")),
+    ttl=int(os.getenv("TEMPLATE_CACHE_TTL_SECONDS", "3600")),
+)
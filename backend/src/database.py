@@ -0,0 +1,165 @@
+# src/database.py - MongoDB Client Management
+# One pooled client per process: a sync MongoClient for src/helper.py and an
+# AsyncMongoClient for the FastAPI handlers. Both are created lazily, share the
+# same pool settings, report into the same pool metrics and are closed on shutdown.
+
+import os
+import threading
+from dotenv import load_dotenv
+from pymongo import MongoClient, AsyncMongoClient, monitoring
+
+load_dotenv()
+
+MONGO_URI = os.getenv("MONGO_URI")
+MONGO_DB_NAME = os.getenv("MONGO_DB_NAME", "aieta")
+
+# Connection pool settings (per client, per server)
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+MONGO_MIN_POOL_SIZE = int(os.getenv("MONGO_MIN_POOL_SIZE", "0"))
+MONGO_MAX_IDLE_TIME_MS = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+MONGO_CONNECT_TIMEOUT_MS = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "10000"))
+MONGO_SERVER_SELECTION_TIMEOUT_MS = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "10000"))
+MONGO_WAIT_QUEUE_TIMEOUT_MS = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "5000"))
+
+# =========================
+# POOL METRICS
+# =========================
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """Counts connection checkouts and records how long callers waited for one"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checkins = 0
+            self.connections_created = 0
+            self.connections_closed = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+
+    def _record_wait(self, duration):
+        wait_ms = (duration or 0.0) * 1000
+        self.total_wait_ms += wait_ms
+        self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+
+    def connection_checked_out(self, event):
+        with self._lock:
+            self.checkouts += 1
+            self._record_wait(event.duration)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+            self._record_wait(event.duration)
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checkins += 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self):
+        with self._lock:
+            attempts = self.checkouts + self.checkout_failures
+            return {
+                "max_pool_size": MONGO_MAX_POOL_SIZE,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "in_use": self.checkouts - self.checkins,
+                "open_connections": self.connections_created - self.connections_closed,
+                "avg_wait_ms": round(self.total_wait_ms / attempts, 3) if attempts else 0.0,
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+pool_metrics = PoolMetrics()
+
+# =========================
+# CLIENTS
+# =========================
+
+_client = None
+_async_client = None
+_client_lock = threading.Lock()
+
+
+def client_options():
+    """Keyword arguments shared by the sync and async clients"""
+    return {
+        "maxPoolSize": MONGO_MAX_POOL_SIZE,
+        "minPoolSize": MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "waitQueueTimeoutMS": MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "event_listeners": [pool_metrics],
+    }
+
+
+def get_client():
+    """Return the process-wide MongoClient, creating it on first use"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = MongoClient(MONGO_URI, **client_options())
+    return _client
+
+
+def get_db(name=MONGO_DB_NAME):
+    """Return a sync database handle (defaults to the main 'aieta' database)"""
+    return get_client()[name]
+
+
+def get_async_client():
+    """Return the process-wide AsyncMongoClient, creating it on first use"""
+    global _async_client
+    if _async_client is None:
+        _async_client = AsyncMongoClient(MONGO_URI, **client_options())
+    return _async_client
+
+
+def get_async_db(name=MONGO_DB_NAME):
+    """Return an async database handle (defaults to the main 'aieta' database)"""
+    return get_async_client()[name]
+
+
+async def close_clients():
+    """Close both clients; called from the app shutdown hook"""
+    global _client, _async_client
+    if _async_client is not None:
+        await _async_client.close()
+        _async_client = None
+    with _client_lock:
+        if _client is not None:
+            _client.close()
+            _client = None
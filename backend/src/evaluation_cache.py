@@ -0,0 +1,124 @@
+# src/evaluation_cache.py - Content-Addressed Cache for Answer Evaluations
+# Identical (question, answer) pairs scored with the same prompt and model get
+# the stored {"evaluation": {...}} back without another Groq call.
+# Tier 1: in-process LRU. Tier 2: aieta.evaluation_cache with a TTL index
+# (declared in src/indexes.py).
+
+import os
+import copy
+import json
+import hashlib
+import logging
+from datetime import datetime
+
+from src.cache import LRUTTLCache
+from src.database import get_db, get_async_db
+
+logger = logging.getLogger(__name__)
+
+EVAL_CACHE_ENABLED = os.getenv("EVAL_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+EVAL_CACHE_SIZE = int(os.getenv("EVAL_CACHE_SIZE", "4096"))
+EVAL_CACHE_TTL_SECONDS = int(os.getenv("EVAL_CACHE_TTL_SECONDS", str(30 * 24 * 3600)))
+EVAL_CACHE_COLLECTION = "evaluation_cache"
+
+
+def normalize_text(text):
+    """Case- and whitespace-insensitive form used for cache keys"""
+    return " ".join(str(text or "").split()).lower()
+
+
+def evaluation_cache_key(question, answer, prompt, model_name):
+    """sha256 over the normalized inputs plus the exact prompt text and model name"""
+    payload = json.dumps(
+        [normalize_text(question), normalize_text(answer), prompt, model_name],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class EvaluationCache:
+    """Memory LRU in front of a Mongo TTL collection; sync and async accessors"""
+
+    def __init__(self, maxsize=EVAL_CACHE_SIZE, ttl=EVAL_CACHE_TTL_SECONDS, enabled=EVAL_CACHE_ENABLED):
+        self.enabled = enabled
+        self.ttl = ttl
+        self.memory = LRUTTLCache(maxsize=maxsize, ttl=ttl)
+        self.mongo_hits = 0
+        self.stores = 0
+        self.errors = 0
+
+    def _document(self, result):
+        return {"$set": {"result": result, "created_at": datetime.utcnow()}}
+
+    def _from_mongo(self, key, doc):
+        if not doc:
+            return None
+        self.mongo_hits += 1
+        self.memory.set(key, doc["result"])
+        return copy.deepcopy(doc["result"])
+
+    # ----- sync (src/helper.py) -----
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        result = self.memory.get(key)
+        if result is not None:
+            return copy.deepcopy(result)
+        try:
+            doc = get_db()[EVAL_CACHE_COLLECTION].find_one({"_id": key}, {"result": 1})
+            return self._from_mongo(key, doc)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Evaluation cache lookup failed: {e}")
+            return None
+
+    def put(self, key, result):
+        if not self.enabled:
+            return
+        self.memory.set(key, copy.deepcopy(result))
+        self.stores += 1
+        try:
+            get_db()[EVAL_CACHE_COLLECTION].update_one({"_id": key}, self._document(result), upsert=True)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Evaluation cache store failed: {e}")
+
+    # ----- async (src/llm_engine.py) -----
+
+    async def aget(self, key):
+        if not self.enabled:
+            return None
+        result = self.memory.get(key)
+        if result is not None:
+            return copy.deepcopy(result)
+        try:
+            doc = await get_async_db()[EVAL_CACHE_COLLECTION].find_one({"_id": key}, {"result": 1})
+            return self._from_mongo(key, doc)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Evaluation cache lookup failed: {e}")
+            return None
+
+    async def aput(self, key, result):
+        if not self.enabled:
+            return
+        self.memory.set(key, copy.deepcopy(result))
+        self.stores += 1
+        try:
+            await get_async_db()[EVAL_CACHE_COLLECTION].update_one({"_id": key}, self._document(result), upsert=True)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"Evaluation cache store failed: {e}")
+
+    def stats(self):
+        return {
+            "enabled": self.enabled,
+            "memory": self.memory.stats(),
+            "mongo_hits": self.mongo_hits,
+            "stores": self.stores,
+            "errors": self.errors,
+        }
+
+
+evaluation_cache = EvaluationCache()
@@ -0,0 +1,151 @@
+# src/export.py - Streaming Bulk Export of Interview Results
+# Turns an ExportRequest into NDJSON (one interview per line) or CSV (one row per
+# interaction) read straight off a cursor over aieta.interaction. The projection
+# follows the include_* flags and output is flushed in ~EXPORT_CHUNK_BYTES pieces,
+# so memory stays flat however many candidates are exported.
+#
+# Interactions come in two shapes: the interview screen's flat turns (questionIndex,
+# isFollowUp) and complete-and-save / useInterview turns (question_index, with the
+# follow-up nested under follow_up_1). Both are projected and exported.
+
+import io
+import os
+import csv
+import json
+from datetime import datetime
+
+from src import repository
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "500"))
+EXPORT_CHUNK_BYTES = int(os.getenv("EXPORT_CHUNK_BYTES", str(64 * 1024)))
+
+# format -> (media type, file extension)
+EXPORT_FORMATS = {
+    "json": ("application/x-ndjson", "ndjson"),
+    "ndjson": ("application/x-ndjson", "ndjson"),
+    "csv": ("text/csv; charset=utf-8", "csv"),
+}
+
+
+class ExportFormatError(ValueError):
+    """Requested format cannot be streamed"""
+
+
+def resolve_format(data_format):
+    """(media type, extension) for a streamable format; raises ExportFormatError otherwise"""
+    fmt = (data_format or "json").lower()
+    if fmt == "xlsx":
+        raise ExportFormatError("xlsx cannot be streamed; request csv (opens in Excel) or json")
+    if fmt not in EXPORT_FORMATS:
+        raise ExportFormatError(f"Unknown export format '{data_format}', expected one of {sorted(EXPORT_FORMATS)}")
+    return EXPORT_FORMATS[fmt]
+
+
+def export_projection(include_scores=True, include_feedback=True):
+    """Only the fields the export will write ever leave Mongo"""
+    projection = {
+        "_id": 0,
+        "candidate_id": 1,
+        "session_id": 1,
+        "status": 1,
+        "metadata.interview_completed_at": 1,
+        "interactions.questionIndex": 1,
+        "interactions.question_index": 1,
+        "interactions.question": 1,
+        "interactions.answer": 1,
+        "interactions.isFollowUp": 1,
+        "interactions.follow_up_1.question": 1,
+        "interactions.follow_up_1.answer": 1,
+    }
+    if include_scores:
+        projection.update({"scores": 1, "interactions.score": 1, "interactions.follow_up_1.score": 1})
+    if include_feedback:
+        projection.update({"interactions.feedback": 1, "interactions.follow_up_1.feedback": 1})
+    return projection
+
+
+def _json_default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _completed_at(doc):
+    completed_at = (doc.get("metadata") or {}).get("interview_completed_at")
+    return completed_at.isoformat() if isinstance(completed_at, datetime) else (completed_at or "")
+
+
+def csv_header(include_scores=True, include_feedback=True):
+    header = ["candidate_id", "session_id", "status", "interview_completed_at"]
+    if include_scores:
+        header += ["total_score", "average_score", "scored_interactions"]
+    header += ["question_index", "follow_up", "question", "answer"]
+    if include_scores:
+        header.append("score")
+    if include_feedback:
+        header.append("feedback")
+    return header
+
+
+def flat_turns(interaction):
+    """
+    (question_index, is_follow_up, turn) for each Q&A in one stored interaction:
+    the turn itself, then its nested follow_up_1 if it has one
+    """
+    question_index = interaction.get("questionIndex", interaction.get("question_index", ""))
+    follow_up = interaction.get("follow_up_1")
+    yield question_index, interaction.get("isFollowUp", False if follow_up else ""), interaction
+    if isinstance(follow_up, dict):
+        yield question_index, True, follow_up
+
+
+def csv_rows(doc, include_scores=True, include_feedback=True):
+    """One row per question or follow-up; a candidate without interactions still gets one row"""
+    prefix = [doc.get("candidate_id", ""), doc.get("session_id", ""), doc.get("status", ""), _completed_at(doc)]
+    if include_scores:
+        scores = doc.get("scores") or {}
+        prefix += [scores.get("total_score", ""), scores.get("average_score", ""), scores.get("scored_interactions", "")]
+
+    for interaction in doc.get("interactions") or [{}]:
+        for question_index, is_follow_up, turn in flat_turns(interaction):
+            row = prefix + [question_index, is_follow_up, turn.get("question", ""), turn.get("answer", "")]
+            if include_scores:
+                row.append(turn.get("score", ""))
+            if include_feedback:
+                feedback = turn.get("feedback", "")
+                row.append(" | ".join(map(str, feedback)) if isinstance(feedback, list) else feedback)
+            yield row
+
+
+async def iter_export(export_request, chunk_size=EXPORT_CHUNK_BYTES, batch_size=EXPORT_BATCH_SIZE):
+    """
+    Yield the export as text chunks. An empty candidate_ids list exports every
+    candidate with a saved interview.
+    """
+    fmt = (export_request.format or "json").lower()
+    include_scores = export_request.include_scores
+    include_feedback = export_request.include_feedback
+    docs = repository.interactions.iter_for_export(
+        export_request.candidate_ids,
+        export_projection(include_scores, include_feedback),
+        batch_size=batch_size
+    )
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    if fmt == "csv":
+        writer.writerow(csv_header(include_scores, include_feedback))
+
+    async for doc in docs:
+        if fmt == "csv":
+            writer.writerows(csv_rows(doc, include_scores, include_feedback))
+        else:
+            buffer.write(json.dumps(doc, default=_json_default, ensure_ascii=False))
+            buffer.write("\n")
+        if buffer.tell() >= chunk_size:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+
+    if buffer.tell():
+        yield buffer.getvalue()
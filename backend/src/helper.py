@@ -5,37 +5,56 @@
 import os
 from dotenv import load_dotenv
 #import streamlit as st
-from pymongo import MongoClient
-from langchain_core.prompts import PromptTemplate
-from langchain_groq import ChatGroq
-from groq import Groq
-from pymongo import MongoClient
-from langchain_core.output_parsers import JsonOutputParser
+# langchain_core / langchain_groq are imported on first use (see get_llm) to keep
+# worker cold start fast; together they account for most of main.py's import time
 import time
 import random
+import hashlib
+import copy
+from functools import lru_cache
 # from euriai import EuriaiLLM
 from src.prompt import *
-import gridfs
+from src.database import get_db
+from src.cache import template_cache
+from src.evaluation_cache import evaluation_cache, evaluation_cache_key
+from src.rate_limiter import llm_rate_limiter, rate_limited
+from src.repository import (
+    questions_upsert,
+    template_document,
+    preprocessing_template,
+    stored_template,
+    PREPROCESSING_TEMPLATE_PROJECTION,
+    TEMPLATE_PROJECTION,
+)
 from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument
 
 load_dotenv()
 
 # Read API keys from .env
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-MONGO_URI = os.getenv("MONGO_URI")
+LLM_MODEL_NAME = os.getenv("GROQ_MODEL", "llama-3.1-8b-instant")
 api_key = os.getenv('EURON_API_KEY')
 
 # Initialize LLM models
 # llm = EuriaiLLM(api_key=api_key, model="gpt-4.1-nano")
-llm = ChatGroq(model= 'llama-3.1-8b-instant',api_key=GROQ_API_KEY)
-
-# MongoDB connection
-client = MongoClient(MONGO_URI)
-db = client["aieta"]
-fs = gridfs.GridFS(db)
-postprocessing_collection = db["interviews_results"]
-preprocessing_collection = db['test_preprocessing']
+@lru_cache(maxsize=None)
+def get_llm():
+    """
+    Build the ChatGroq client on first use, so it is created inside each worker
+    process. Every call through it waits on the shared RPM/TPM limiter first.
+    """
+    from langchain_groq import ChatGroq
+    llm = ChatGroq(model=LLM_MODEL_NAME, api_key=GROQ_API_KEY)
+    return rate_limited(llm) if llm_rate_limiter.enabled else llm
+
+def warm_up_llm():
+    """Import LangChain and build the chains ahead of the first request (run off the event loop)"""
+    get_evaluation_chain()
+    get_follow_up_chain()
+
+# MongoDB access uses the shared pooled client from src/database.py (get_db)
 
 # =========================
 # 1. CANDIDATE INFORMATION EXTRACTION
@@ -44,7 +63,7 @@ preprocessing_collection = db['test_preprocessing']
 def extract_candidate_info(candidate_data):
     """Extract and format candidate information for question generation"""
     try:
-        personal_info = candidate_data.get('personal_information', {})
+        personal_info = candidate_data.get('personal_information') or {}
         work_experience = candidate_data.get('work_experience', [])
         education = candidate_data.get('education', [])
         
@@ -69,9 +88,12 @@ def extract_candidate_info(candidate_data):
 def generate_questions(candidate_data):
     """Generate interview questions and greeting for a candidate"""
     try:
+        from langchain_core.prompts import PromptTemplate
+        from langchain_core.output_parsers import JsonOutputParser
+
         prompt_template = genearte_questions_prompt
         prompt_obj = PromptTemplate(template=prompt_template, input_variables=['candidate_data'])
-        response = (prompt_obj | llm | JsonOutputParser()).invoke({'candidate_data': candidate_data})
+        response = (prompt_obj | get_llm() | JsonOutputParser()).invoke({'candidate_data': candidate_data})
         
         interview_data = response.get('interview', {})
         greeting_script = interview_data.get('greeting_script', '')
@@ -83,21 +105,10 @@ def generate_questions(candidate_data):
         return None, [], ""
 
 def store_interview_template(candidate_data, greeting, questions):
-    """Store interview template in MongoDB"""
+    """Sync twin of repository.templates.store: same document, same cache update"""
     try:
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client['aieta']
-        template_collection = db['interview_templates']
-        
-        template_doc = {
-            "candidate_id": candidate_data['id'],
-            'candidate_email': candidate_data['personal_information']['email'],
-            "greeting_script": greeting,
-            "questions": questions,
-            "created_at": datetime.utcnow()
-        }
-        
-        result = template_collection.insert_one(template_doc)
+        result = get_db()['interview_templates'].insert_one(template_document(candidate_data, greeting, questions))
+        template_cache.set(str(candidate_data['id']), (greeting, list(questions)))
         print("✅ Stored interview template with ID:", result.inserted_id)
         return result.inserted_id
     except Exception as e:
@@ -109,26 +120,23 @@ def store_interview_template(candidate_data, greeting, questions):
 # =========================
 
 def get_stored_interview_template(candidate_id):
-    """Get interview template from test_preprocessing collection"""
+    """Sync twin of repository.templates.get_interview_template: test_preprocessing, then interview_templates"""
     try:
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client['aieta']
-        preprocessing_collection = db['test_preprocessing']
-        
-        doc = preprocessing_collection.find_one({"candidate_id": str(candidate_id)})
+        cached = template_cache.get(str(candidate_id))
+        if cached:
+            return cached
+
+        db = get_db()
+        doc = db['test_preprocessing'].find_one({"candidate_id": str(candidate_id)}, PREPROCESSING_TEMPLATE_PROJECTION)
         if doc:
-            greeting = doc.get("greetings_text", "")
-            questions = [q.get("text", "") for q in doc.get("questions", [])]
-            return greeting, questions
+            template = preprocessing_template(doc)
         else:
-            # Fallback to interview_templates collection
-            template_collection = db['interview_templates']
-            template_doc = template_collection.find_one({"candidate_id": str(candidate_id)})
-            if template_doc:
-                greeting = template_doc.get("greeting_script", "")
-                questions = template_doc.get("questions", [])
-                return greeting, questions
-            return None, None
+            doc = db['interview_templates'].find_one({"candidate_id": str(candidate_id)}, TEMPLATE_PROJECTION)
+            if not doc:
+                return None, None
+            template = stored_template(doc)
+        template_cache.set(str(candidate_id), template)
+        return template
     except Exception as e:
         print(f"Error getting stored interview template: {e}")
         return None, None
@@ -137,100 +145,140 @@ def get_stored_interview_template(candidate_id):
 # 4. ANSWER EVALUATION
 # =========================
 
+EVALUATION_FALLBACK = {"evaluation": {"score": 0, "feedback": ["Error in evaluation"]}}
+FOLLOW_UP_FALLBACK = "Can you provide more details about your experience with this?"
+
+@lru_cache(maxsize=None)
+def get_evaluation_chain(prompt=evaluation_prompt):
+    """Build (once per prompt) the prompt | llm | JSON chain used to score answers"""
+    from langchain_core.prompts import PromptTemplate
+    from langchain_core.output_parsers import JsonOutputParser
+
+    prompt_obj = PromptTemplate(template=prompt, input_variables=['question', 'answer'])
+    return prompt_obj | get_llm() | JsonOutputParser()
+
+@lru_cache(maxsize=None)
+def get_follow_up_chain(prompt=followup_questions_prompt):
+    """Build (once per prompt) the prompt | llm chain used for follow-up questions"""
+    from langchain_core.prompts import PromptTemplate
+
+    prompt_obj = PromptTemplate(template=prompt, input_variables=['question', 'answer'])
+    return prompt_obj | get_llm()
+
+def follow_up_text(response):
+    """Normalize a follow-up chain response to plain text"""
+    # Handle different response types
+    if hasattr(response, 'content'):
+        return str(response.content)  # LangChain AIMessage
+    elif isinstance(response, str):
+        return response  # Already a string
+    else:
+        return str(response)  # Convert to string
+
+def is_valid_evaluation(response):
+    """True if a parsed evaluation has the {"evaluation": {"score", "feedback"}} shape callers index into"""
+    evaluation = response.get("evaluation") if isinstance(response, dict) else None
+    if not isinstance(evaluation, dict):
+        return False
+    score, feedback = evaluation.get("score"), evaluation.get("feedback")
+    return (
+        isinstance(score, (int, float)) and not isinstance(score, bool) and float(score).is_integer()
+        and isinstance(feedback, list) and all(isinstance(item, str) for item in feedback)
+    )
+
+def check_evaluation(response):
+    """Return the evaluation, or raise ValueError so a malformed one is never cached"""
+    if not is_valid_evaluation(response):
+        raise ValueError(f"Malformed evaluation from LLM: {str(response)[:200]}")
+    return response
+
 def evaluate_answer(question, answer, prompt=evaluation_prompt):
     """Evaluate a candidate's answer and provide score and feedback"""
     try:
-        prompt_template = prompt
-        prompt_obj = PromptTemplate(template=prompt_template, input_variables=['question', 'answer'])
-        response = (prompt_obj | llm | JsonOutputParser()).invoke({'question': question, 'answer': answer})
+        cache_key = evaluation_cache_key(question, answer, prompt, LLM_MODEL_NAME)
+        cached = evaluation_cache.get(cache_key)
+        if is_valid_evaluation(cached):
+            return cached
+        
+        response = check_evaluation(get_evaluation_chain(prompt).invoke({'question': question, 'answer': answer}))
+        evaluation_cache.put(cache_key, response)
         return response
     except Exception as e:
         print(f"Error evaluating answer: {e}")
-        return {"evaluation": {"score": 0, "feedback": ["Error in evaluation"]}}
+        return copy.deepcopy(EVALUATION_FALLBACK)
 
 def generate_follow_up_question(question, answer, prompt=followup_questions_prompt):
     """Generate follow-up question based on original question and answer"""
     try:
-        prompt_template = prompt
-        prompt_obj = PromptTemplate(template=prompt_template, input_variables=['question', 'answer'])
-        response = (prompt_obj | llm).invoke({'question': question, 'answer': answer})
-        
-        # Handle different response types
-        if hasattr(response, 'content'):
-            return str(response.content)  # LangChain AIMessage
-        elif isinstance(response, str):
-            return response  # Already a string
-        else:
-            return str(response)  # Convert to string
-            
+        response = get_follow_up_chain(prompt).invoke({'question': question, 'answer': answer})
+        return follow_up_text(response)
     except Exception as e:
         print(f"Error generating follow-up question: {e}")
-        return "Can you provide more details about your experience with this?"
+        return FOLLOW_UP_FALLBACK
 
 # =========================
 # 5. SCORE CALCULATION
 # =========================
 
 def get_candidate_average_score(candidate_id):
-    """Calculate candidate's average score from interview data"""
+    """
+    Candidate's (average, max possible at 10 per answer, total) from the materialized
+    score summary. Data saved before summaries existed has none yet, so fall back
+    to the same sources /candidate/{id}/score materializes from.
+    """
     try:
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client['aieta']
-        collection = db['interviews']
-        
-        interview = collection.find_one({'candidate_id': candidate_id})
-        if not interview:
+        db = get_db()
+        summary = db['score_summaries'].find_one(
+            {'candidate_id': candidate_id},
+            {'total_score': 1, 'scored_interactions': 1}
+        )
+        if summary is None:
+            interaction = db['interaction'].find_one({'candidate_id': candidate_id}, {'scores': 1})
+            if interaction is None:
+                return _legacy_average_score(db, candidate_id)
+            summary = interaction.get('scores') or {}
+        if not summary.get('scored_interactions'):
             return None
         
-        scores = [
-            interaction['score'] 
-            for interaction in interview.get('interactions', []) 
-            if 'score' in interaction
-        ]
-        
-        if scores:
-            total_scores = sum(scores)
-            length_scores = len(scores)
-            avg_score = total_scores / length_scores
-            return avg_score, length_scores * 10, total_scores
-        else:
-            return None
+        total_scores = summary['total_score']
+        length_scores = summary['scored_interactions']
+        return total_scores / length_scores, length_scores * 10, total_scores
     except Exception as e:
         print(f"Error calculating average score: {e}")
         return None
 
+def _legacy_average_score(db, candidate_id):
+    """Score from an aieta.interviews document saved before score summaries existed"""
+    interview = db['interviews'].find_one({'candidate_id': candidate_id}, {'interactions.score': 1})
+    if not interview:
+        return None
+    
+    scores = [
+        interaction['score']
+        for interaction in interview.get('interactions', [])
+        if 'score' in interaction
+    ]
+    if not scores:
+        return None
+    return sum(scores) / len(scores), len(scores) * 10, sum(scores)
+
 # =========================
 # 6. PREPROCESSING FUNCTIONS
 # =========================
 
 def store_questions_in_mongo(candidate_id: str, questions: list):
-    """Store questions in MongoDB preprocessing collection"""
+    """Sync twin of repository.preprocessing.store_questions; returns [document _id] or []"""
     try:
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client['aieta']
-        preprocessing_collection = db['test_preprocessing']
-        
-        # Check if document already exists
-        existing_doc = preprocessing_collection.find_one({"candidate_id": candidate_id})
-        
-        if existing_doc:
-            # Update existing document
-            result = preprocessing_collection.update_one(
-                {"candidate_id": candidate_id},
-                {"$set": {"questions": questions, "updated_at": datetime.utcnow()}}
-            )
-            print(f"✅ Updated questions for candidate {candidate_id}")
-            return [existing_doc["_id"]]
-        else:
-            # Create new document
-            doc = {
-                "candidate_id": candidate_id,
-                "questions": questions,
-                "created_at": datetime.utcnow()
-            }
-            result = preprocessing_collection.insert_one(doc)
-            print(f"✅ Created questions for candidate {candidate_id}")
-            return [result.inserted_id]
+        doc = get_db()['test_preprocessing'].find_one_and_update(
+            {"candidate_id": candidate_id},
+            questions_upsert(questions),
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        template_cache.pop(str(candidate_id))
+        print(f"✅ Stored questions for candidate {candidate_id}")
+        return [doc["_id"]]
     except Exception as e:
         print(f"Error storing questions: {e}")
         return []
@@ -239,10 +287,59 @@ def store_questions_in_mongo(candidate_id: str, questions: list):
 # 7. REPORT GENERATION
 # =========================
 
+_server_hash_supported = True  # Cleared if the server rejects $toHashedIndexKey
+
+def get_report_version(candidate_id):
+    """
+    Cheap version stamp of the candidate's interviews_results document, or None
+    if there is none. Uses updated_at when the writer set it; otherwise a hash
+    of the whole document computed by the server ($toHashedIndexKey), so only
+    the stamp crosses the wire. Servers without that operator fall back to
+    reading and hashing the document here.
+    """
+    global _server_hash_supported
+    try:
+        from pymongo.errors import OperationFailure
+
+        collection = get_db()["interviews_results"]
+        if _server_hash_supported:
+            try:
+                docs = list(collection.aggregate([
+                    {"$match": {"candidate_id": candidate_id}},
+                    {"$limit": 1},
+                    {"$project": {"updated_at": 1, "content_hash": {"$cond": [
+                        {"$ifNull": ["$updated_at", False]}, None, {"$toHashedIndexKey": "$$ROOT"}
+                    ]}}}
+                ]))
+            except OperationFailure as e:
+                print(f"Server-side report hashing unavailable, hashing documents locally: {e}")
+                _server_hash_supported = False
+            else:
+                if not docs:
+                    return None
+                doc = docs[0]
+                if doc.get("updated_at"):
+                    return f"{doc['_id']}:{doc['updated_at']}"
+                return f"{doc['_id']}:h{doc['content_hash']}"
+
+        doc = collection.find_one({"candidate_id": candidate_id}, {"updated_at": 1})
+        if not doc:
+            return None
+        if doc.get("updated_at"):
+            return f"{doc['_id']}:{doc['updated_at']}"
+
+        from bson import json_util
+        full_doc = collection.find_one({"_id": doc["_id"]})
+        digest = hashlib.sha256(json_util.dumps(full_doc, sort_keys=True).encode("utf-8")).hexdigest()
+        return f"{doc['_id']}:{digest}"
+    except Exception as e:
+        print(f"Error reading report version: {e}")
+        return None
+
 def extract_info_for_generating_report(candidate_id):
     """Extract interview data for report generation"""
     try:
-        report_data = postprocessing_collection.find_one({"candidate_id": candidate_id})
+        report_data = get_db()["interviews_results"].find_one({"candidate_id": candidate_id})
         
         if not report_data:
             print(f"No report data found for candidate {candidate_id}")
@@ -300,108 +397,41 @@ def extract_info_for_generating_report(candidate_id):
         return None
 
 def generate_html_report(report_raw_dict):
-    """Generate HTML report from report data"""
+    """Generate HTML report from report data (whole document; see iter_report_html to stream)"""
     try:
-        # Import report template
-        from src.postprocessing import report_template
-        
-        # Build category averages HTML
-        category_averages_html = ""
-        category_averages = report_raw_dict.get("scores", {}).get('category_averages', {})
-        for category, avg_score in category_averages.items():
-            if avg_score > 0:
-                category_name = category.replace('_', ' ').title()
-                category_averages_html += f"""
-                    <div class="card">
-                        <p class="font-medium text-gray-500 text-sm">{category_name} Score:</p>
-                        <p class="text-2xl font-bold text-indigo-600">{avg_score:.1f} / 5</p>
-                    </div>
-                """
-
-        # Build interactions HTML
-        interactions_html = ""
-        for interaction in report_raw_dict.get('interactions', []):
-            question = interaction.get('question', 'N/A')
-            answer = interaction.get('answer', 'No answer provided.')
-            score = interaction.get('score', 0)
-            feedback_items = interaction.get('feedback', [])
-
-            feedback_html = ""
-            for fb in feedback_items:
-                feedback_html += f"""
-                    <div class="feedback-item">
-                        <span class="feedback-icon text-blue-600">▪</span> {fb}
-                    </div>
-                """
-
-            interactions_html += f"""
-                <div class="interaction-card">
-                    <p class="qa-question">{question}</p>
-                    <p class="qa-answer">{answer}</p>
-                    <div class="score-section">
-                        <span class="score-badge">Score: {score}/5</span>
-                    </div>
-                    <div class="feedback-section">
-                        <h5>Feedback:</h5>
-                        {feedback_html}
-                    </div>
-                </div>
-            """
-
-        # Build improvement areas HTML
-        improvement_areas_html = ""
-        for imp in report_raw_dict.get("improvement_areas", []):
-            txt = imp.get("question", "")
-            score = imp.get("score", 0)
-            improvement_areas_html += f"<li>{txt} (Score: {score})</li>"
-
-        # Fill template
-        html_report = report_template.format(
-            candidate_id=report_raw_dict["candidate_id"],
-            position=report_raw_dict["position"],
-            interview_date=report_raw_dict["interview_date"],
-            interviewer_name=report_raw_dict["interviewer_name"],
-            scores=report_raw_dict["scores"],
-            average_score=report_raw_dict["average_score"],
-            max_possible_score=report_raw_dict["max_possible_score"],
-            total_score=report_raw_dict["total_score"],
-            scored_interactions=report_raw_dict["scored_interactions"],
-            percentage_score=report_raw_dict["percentage_score"],
-            category_averages_html=category_averages_html,
-            interactions_html=interactions_html,
-            improvement_areas_html=improvement_areas_html,
-            current_generation_date=report_raw_dict["current_generation_date"]
-        )
-        return html_report
+        from src.report_renderer import iter_report_html
+        return "".join(iter_report_html(report_raw_dict))
     except Exception as e:
         print(f"Error generating HTML report: {e}")
         return None
 
-def build_candidate_report(candidate_id):
-    """Build complete candidate report"""
+def build_candidate_report(candidate_id, version=None):
+    """
+    Build complete candidate report. Returns (cache_key, body) or None, where
+    body is the cached HTML bytes or, on a miss, a generator of rendered chunks
+    that is stored in the report cache once it has been fully consumed.
+    Renders are cached by (candidate_id, document version, template hash).
+    """
     try:
+        from src.report_cache import report_cache
+        from src.report_renderer import iter_report_html
+
+        version = version or get_report_version(candidate_id)
+        if not version:
+            return None
+
+        key = report_cache.key(candidate_id, version)
+        html = report_cache.get(key)
+        if html is not None:
+            return key, html
+
         # Extract report data
         report_data = extract_info_for_generating_report(candidate_id)
         if not report_data:
             return None
-        
-        # Generate HTML report
-        html_report = generate_html_report(report_data)
-        if not html_report:
-            return None
-        
-        # Save report to file
-        reports_dir = "reports"
-        os.makedirs(reports_dir, exist_ok=True)
-        
-        report_filename = f"interview_report_{candidate_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.html"
-        report_filepath = os.path.join(reports_dir, report_filename)
-        
-        with open(report_filepath, 'w', encoding='utf-8') as f:
-            f.write(html_report)
-        
-        print(f"✅ Report generated: {report_filepath}")
-        return report_filepath
+
+        # Stream the render; nothing touches disk until the last chunk is out
+        return key, report_cache.tee(key, iter_report_html(report_data))
     except Exception as e:
         print(f"Error building candidate report: {e}")
         return None
@@ -448,8 +478,7 @@ def format_score_percentage(score, max_score=5):
 def get_interview_statistics():
     """Get overall interview statistics"""
     try:
-        mongo_client = MongoClient(MONGO_URI)
-        db = mongo_client['aieta']
+        db = get_db()
         interaction_collection = db['interaction']
         
         total_interviews = interaction_collection.count_documents({})
@@ -0,0 +1,138 @@
+# src/indexes.py - Index Declarations and Query-Plan Checks
+# Every index the backend relies on is declared here and created idempotently at
+# startup. `python -m src.indexes --check` explains each hot query shape and
+# exits non-zero if any of them would scan a whole collection.
+#
+#   python -m src.indexes            # create missing indexes, then check
+#   python -m src.indexes --check    # explain only; fails on COLLSCAN
+
+import sys
+import asyncio
+import argparse
+import logging
+
+from pymongo.errors import OperationFailure
+
+from src.database import get_async_db, close_clients
+from src.evaluation_cache import EVAL_CACHE_COLLECTION, EVAL_CACHE_TTL_SECONDS
+from src.session_store import SESSION_STORE_COLLECTION, SESSION_TTL_SECONDS
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# DECLARED INDEXES
+# =========================
+
+# (collection, keys, options). Unique wherever the code reads or upserts exactly
+# one document per candidate; TTL indexes expire cache/session entries.
+INDEXES = [
+    ("candidates", [("id", 1)], {"name": "id_1", "unique": True}),
+    ("interaction", [("candidate_id", 1)], {"name": "candidate_id_1", "unique": True}),
+    ("interaction_drafts", [("candidate_id", 1), ("session_id", 1)], {"name": "candidate_id_1_session_id_1", "unique": True}),
+    ("test_preprocessing", [("candidate_id", 1)], {"name": "candidate_id_1", "unique": True}),
+    ("interview_templates", [("candidate_id", 1)], {"name": "candidate_id_1"}),
+    ("interviews_results", [("candidate_id", 1)], {"name": "candidate_id_1"}),
+    ("interviews", [("candidate_id", 1)], {"name": "candidate_id_1"}),
+    # Also required by the $merge (on: candidate_id) that maintains the summaries
+    ("score_summaries", [("candidate_id", 1)], {"name": "candidate_id_1", "unique": True}),
+    ("tts_files.files", [("filename", 1), ("uploadDate", 1)], {"name": "filename_1_uploadDate_1"}),
+    # Expiry sweep over runtime-generated TTS audio (TTSCache.sweep_runtime)
+    ("tts_files.files", [("metadata.runtime", 1), ("uploadDate", 1)], {"name": "metadata.runtime_1_uploadDate_1"}),
+    ("pregeneration_items", [("job_id", 1)], {"name": "job_id_1"}),
+    (EVAL_CACHE_COLLECTION, [("created_at", 1)], {"name": "created_at_ttl", "expireAfterSeconds": EVAL_CACHE_TTL_SECONDS}),
+    (SESSION_STORE_COLLECTION, [("updated_at", 1)], {"name": "updated_at_ttl", "expireAfterSeconds": SESSION_TTL_SECONDS}),
+]
+
+# (label, collection, filter, sort) - the lookups on every request path
+HOT_QUERIES = [
+    ("candidate by id", "candidates", {"id": "__probe__"}, None),
+    ("candidate keyset page", "candidates", {"id": {"$gt": "__probe__"}}, [("id", 1)]),
+    ("interaction by candidate", "interaction", {"candidate_id": "__probe__"}, None),
+    ("interaction draft by session", "interaction_drafts", {"candidate_id": "__probe__", "session_id": "__probe__"}, None),
+    ("interview export", "interaction", {"candidate_id": {"$in": ["__probe__"]}}, [("candidate_id", 1)]),
+    ("preprocessing by candidate", "test_preprocessing", {"candidate_id": "__probe__"}, None),
+    ("template by candidate", "interview_templates", {"candidate_id": "__probe__"}, None),
+    ("report by candidate", "interviews_results", {"candidate_id": "__probe__"}, None),
+    ("legacy interview by candidate", "interviews", {"candidate_id": "__probe__"}, None),
+    ("score summary by candidate", "score_summaries", {"candidate_id": "__probe__"}, None),
+    ("pregeneration checkpoints by job", "pregeneration_items", {"job_id": "__probe__"}, None),
+    ("tts file by name", "tts_files.files", {"filename": "__probe__"}, [("uploadDate", -1)]),
+]
+
+
+async def ensure_indexes(db=None):
+    """
+    Create every declared index. Safe to run on each startup: existing indexes
+    are no-ops. A failure (e.g. duplicates blocking a unique index) is logged
+    and reported, never raised, so one bad collection cannot stop the app.
+    Returns {"collection.index_name": "ok" | error message}.
+    """
+    db = db if db is not None else get_async_db()
+    results = {}
+    for collection, keys, options in INDEXES:
+        label = f"{collection}.{options['name']}"
+        try:
+            await db[collection].create_index(keys, **options)
+            results[label] = "ok"
+        except OperationFailure as e:
+            results[label] = e.details.get("errmsg", str(e)) if e.details else str(e)
+            logger.error(f"Could not create index {label}: {results[label]}")
+    return results
+
+# =========================
+# QUERY-PLAN CHECKS
+# =========================
+
+def plan_stages(plan):
+    """All stage names in an explain plan tree (classic and SBE layouts)"""
+    stages = []
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for value in plan.values():
+            stages.extend(plan_stages(value))
+    elif isinstance(plan, list):
+        for item in plan:
+            stages.extend(plan_stages(item))
+    return stages
+
+
+async def explain_hot_queries(db=None):
+    """Explain each hot query; returns [(label, winning plan stages)]"""
+    db = db if db is not None else get_async_db()
+    results = []
+    for label, collection, query, sort in HOT_QUERIES:
+        cursor = db[collection].find(query).limit(1)
+        if sort:
+            cursor = cursor.sort(sort)
+        explain = await cursor.explain()
+        results.append((label, plan_stages(explain.get("queryPlanner", {}).get("winningPlan", {}))))
+    return results
+
+
+async def run(check_only=False):
+    failed = False
+    try:
+        if not check_only:
+            for label, status in (await ensure_indexes()).items():
+                print(f"{'✅' if status == 'ok' else '❌'} index {label}: {status}")
+                failed |= status != "ok"
+
+        for label, stages in await explain_hot_queries():
+            scan = "COLLSCAN" in stages
+            failed |= scan
+            print(f"{'❌' if scan else '✅'} {label}: {' <- '.join(stages) or 'EOF'}")
+    finally:
+        await close_clients()
+    return 1 if failed else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ensure MongoDB indexes and verify hot query plans")
+    parser.add_argument("--check", action="store_true", help="Only explain the hot queries; do not create indexes")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(check_only=args.check)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,212 @@
+# src/llm_engine.py - Async LLM Evaluation Engine
+# Awaits the LangChain chains through ainvoke so a slow Groq call never blocks
+# the uvicorn event loop; a semaphore bounds how many calls are in flight.
+# Underneath, get_llm() makes every call wait its turn at the Groq RPM/TPM
+# limiter (src/rate_limiter.py) in the interactive priority class.
+
+import os
+import asyncio
+import copy
+import time
+import logging
+
+from src.helper import (
+    get_evaluation_chain,
+    get_follow_up_chain,
+    follow_up_text,
+    is_valid_evaluation,
+    check_evaluation,
+    EVALUATION_FALLBACK,
+    FOLLOW_UP_FALLBACK,
+    LLM_MODEL_NAME,
+)
+from src.evaluation_cache import evaluation_cache, evaluation_cache_key
+from src.rate_limiter import llm_rate_limiter, RateLimitTimeout, INTERACTIVE
+from src.prompt import evaluation_prompt, followup_questions_prompt
+
+logger = logging.getLogger(__name__)
+
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "32"))
+# Opt-in: start follow-up generation alongside evaluation instead of after it
+LLM_SPECULATIVE_FOLLOWUP = os.getenv("LLM_SPECULATIVE_FOLLOWUP", "false").lower() in ("1", "true", "yes")
+FOLLOW_UP_SCORE_THRESHOLD = 4  # Answers scoring below this get a follow-up
+
+
+class LLMEngine:
+    """Bounded-concurrency async front end for the evaluation chains"""
+
+    def __init__(self, max_concurrency=LLM_MAX_CONCURRENCY, speculative=LLM_SPECULATIVE_FOLLOWUP,
+                 limiter=llm_rate_limiter):
+        self.max_concurrency = max_concurrency
+        self.speculative = speculative
+        self.limiter = limiter  # Consulted before speculating; calls themselves wait on it in get_llm()
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._in_flight = 0
+        self._active = 0  # Queued + in flight
+        self._pending_evaluations = {}  # cache key -> Future, coalesces identical concurrent requests
+        self._stats = {
+            "calls": 0,
+            "errors": 0,
+            "rate_limited": 0,  # Gave up waiting for the Groq rate limiter
+            "total_wait_ms": 0.0,
+            "total_call_ms": 0.0,
+            "max_wait_ms": 0.0,
+        }
+        self._speculation = {
+            "started": 0,
+            "hits": 0,       # Speculative follow-up was needed and used
+            "wasted": 0,     # Finished before the score said it was not needed
+            "cancelled": 0,  # Cancelled while still running
+            "skipped": 0,    # Not started: live calls were already queued at the rate limiter
+        }
+
+    async def _ainvoke(self, chain, inputs):
+        """Run chain.ainvoke under the concurrency limit and record timings"""
+        queued_at = time.perf_counter()
+        self._active += 1
+        try:
+            async with self._semaphore:
+                started_at = time.perf_counter()
+                wait_ms = (started_at - queued_at) * 1000
+                self._in_flight += 1
+                try:
+                    return await chain.ainvoke(inputs)
+                finally:
+                    self._in_flight -= 1
+                    self._stats["calls"] += 1
+                    self._stats["total_wait_ms"] += wait_ms
+                    self._stats["max_wait_ms"] = max(self._stats["max_wait_ms"], wait_ms)
+                    self._stats["total_call_ms"] += (time.perf_counter() - started_at) * 1000
+        finally:
+            self._active -= 1
+
+    async def evaluate_answer(self, question, answer, prompt=evaluation_prompt):
+        """
+        Async equivalent of helper.evaluate_answer. Results are looked up in and
+        stored to the evaluation cache; identical requests already in flight
+        share one LLM call. Error fallbacks and malformed LLM output are never
+        cached (a malformed entry already in the cache is treated as a miss).
+        Raises RateLimitTimeout (to this caller and any coalesced ones) when the
+        rate limiter could not grant the call in time, rather than scoring the
+        answer with the fallback.
+        """
+        cache_key = evaluation_cache_key(question, answer, prompt, LLM_MODEL_NAME)
+        cached = await self._cached_evaluation(cache_key)
+        if cached is not None:
+            return cached
+        return await self._evaluate(cache_key, question, answer, prompt)
+
+    async def _cached_evaluation(self, cache_key):
+        cached = await evaluation_cache.aget(cache_key)
+        return cached if is_valid_evaluation(cached) else None
+
+    async def _evaluate(self, cache_key, question, answer, prompt):
+        """Cache miss: one LLM call per key at a time, cached if it succeeds"""
+        pending = self._pending_evaluations.get(cache_key)
+        if pending is not None:
+            return copy.deepcopy(await asyncio.shield(pending))
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending_evaluations[cache_key] = future
+        response = copy.deepcopy(EVALUATION_FALLBACK)
+        timed_out = None
+        try:
+            response = check_evaluation(
+                await self._ainvoke(get_evaluation_chain(prompt), {'question': question, 'answer': answer})
+            )
+            await evaluation_cache.aput(cache_key, response)
+        except RateLimitTimeout as e:
+            self._stats["rate_limited"] += 1
+            logger.warning(f"⏳ Evaluation not started: {e}")
+            timed_out = e
+            raise
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Error evaluating answer: {e}")
+        finally:
+            # Waiters get the fallback if this call failed or was cancelled
+            del self._pending_evaluations[cache_key]
+            if timed_out is not None:
+                future.set_exception(timed_out)
+                future.exception()  # Retrieved here, so an unawaited future is not logged
+            else:
+                future.set_result(response)
+        return response
+
+    async def generate_follow_up_question(self, question, answer, prompt=followup_questions_prompt):
+        """Async equivalent of helper.generate_follow_up_question"""
+        try:
+            response = await self._ainvoke(get_follow_up_chain(prompt), {'question': question, 'answer': answer})
+            return follow_up_text(response)
+        except RateLimitTimeout as e:
+            self._stats["rate_limited"] += 1
+            logger.warning(f"⏳ Follow-up not generated, using the generic one: {e}")
+            return FOLLOW_UP_FALLBACK
+        except Exception as e:
+            self._stats["errors"] += 1
+            logger.error(f"Error generating follow-up question: {e}")
+            return FOLLOW_UP_FALLBACK
+
+    async def evaluate_with_follow_up(self, question, answer, allow_follow_up=True):
+        """
+        Evaluate an answer and, if it scores below FOLLOW_UP_SCORE_THRESHOLD,
+        produce a follow-up question. Returns (evaluation, follow_up_question or None).
+
+        In speculative mode, when the evaluation is not cached and no live call
+        is queued at the rate limiter, the follow-up is generated concurrently
+        with the evaluation and discarded (cancelled if still running) when the
+        score turns out to be good enough.
+        """
+        cache_key = evaluation_cache_key(question, answer, evaluation_prompt, LLM_MODEL_NAME)
+        evaluation = await self._cached_evaluation(cache_key)
+        if evaluation is None:
+            speculate = self.speculative and allow_follow_up
+            if speculate and self.limiter.queued(INTERACTIVE):
+                self._speculation["skipped"] += 1  # Its tokens would only delay those calls
+                speculate = False
+            if speculate:
+                return await self._evaluate_speculatively(cache_key, question, answer)
+            evaluation = await self._evaluate(cache_key, question, answer, evaluation_prompt)
+
+        if allow_follow_up and evaluation["evaluation"]["score"] < FOLLOW_UP_SCORE_THRESHOLD:
+            return evaluation, await self.generate_follow_up_question(question, answer)
+        return evaluation, None
+
+    async def _evaluate_speculatively(self, cache_key, question, answer):
+        self._speculation["started"] += 1
+        follow_up_task = asyncio.create_task(self.generate_follow_up_question(question, answer))
+        try:
+            evaluation = await self._evaluate(cache_key, question, answer, evaluation_prompt)
+        except BaseException:
+            follow_up_task.cancel()
+            raise
+
+        if evaluation["evaluation"]["score"] < FOLLOW_UP_SCORE_THRESHOLD:
+            self._speculation["hits"] += 1
+            return evaluation, await follow_up_task
+
+        if follow_up_task.done():
+            self._speculation["wasted"] += 1
+        else:
+            self._speculation["cancelled"] += 1
+            follow_up_task.cancel()
+        return evaluation, None
+
+    def stats(self):
+        """Snapshot of call counts and queue/call latency"""
+        calls = self._stats["calls"]
+        return {
+            "max_concurrency": self.max_concurrency,
+            "in_flight": self._in_flight,
+            "queued": self._active - self._in_flight,
+            "calls": calls,
+            "errors": self._stats["errors"],
+            "rate_limited": self._stats["rate_limited"],
+            "avg_wait_ms": round(self._stats["total_wait_ms"] / calls, 2) if calls else 0.0,
+            "max_wait_ms": round(self._stats["max_wait_ms"], 2),
+            "avg_call_ms": round(self._stats["total_call_ms"] / calls, 2) if calls else 0.0,
+            "speculative_followup": {"enabled": self.speculative, **self._speculation},
+        }
+
+
+llm_engine = LLMEngine()
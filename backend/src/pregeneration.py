@@ -0,0 +1,314 @@
+# src/pregeneration.py - Batch Interview Template Pre-Generation
+# Generates greeting + questions ahead of time for a list of candidates (or every
+# candidate without a template) with at most PREGEN_CONCURRENCY Groq generations
+# in flight, so nobody waits on generation when they open their interview link.
+# Progress lives in aieta.pregeneration_jobs and every finished candidate is
+# checkpointed in aieta.pregeneration_items, so a crashed job resumes where it stopped.
+#
+#   python -m src.pregeneration                      # all candidates without a template
+#   python -m src.pregeneration --ids c1 c2 --concurrency 8
+#   python -m src.pregeneration --resume <job_id>
+
+import os
+import sys
+import uuid
+import socket
+import asyncio
+import argparse
+import logging
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+from src import repository
+from src.database import get_async_db
+from src.tts_pipeline import tts_pipeline
+from src.rate_limiter import llm_priority, BACKGROUND
+
+logger = logging.getLogger(__name__)
+
+PREGEN_CONCURRENCY = int(os.getenv("PREGEN_CONCURRENCY", "4"))
+PREGEN_MAX_CONCURRENCY = int(os.getenv("PREGEN_MAX_CONCURRENCY", "32"))
+PREGEN_RETRIES = int(os.getenv("PREGEN_RETRIES", "3"))
+PREGEN_RETRY_DELAY_SECONDS = float(os.getenv("PREGEN_RETRY_DELAY_SECONDS", "2.0"))
+# A running job whose heartbeat is older than this is presumed dead and may be resumed
+PREGEN_LEASE_SECONDS = int(os.getenv("PREGEN_LEASE_SECONDS", "300"))
+PREGEN_JOBS_COLLECTION = "pregeneration_jobs"
+PREGEN_ITEMS_COLLECTION = "pregeneration_items"
+PREGEN_SCAN_BATCH = 1000
+PREGEN_ERROR_HISTORY = 100  # Most recent failures kept on the job document
+
+
+class JobNotFound(LookupError):
+    pass
+
+
+class JobNotResumable(RuntimeError):
+    """Completed, or still running under a live lease"""
+
+
+class PregenerationJobs:
+    """Starts, resumes and reports on pre-generation jobs; one asyncio task per job in this process"""
+
+    def __init__(self, concurrency=PREGEN_CONCURRENCY, retries=PREGEN_RETRIES,
+                 retry_delay=PREGEN_RETRY_DELAY_SECONDS):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+        self._tasks = {}  # job_id -> asyncio.Task
+
+    @property
+    def jobs(self):
+        return get_async_db()[PREGEN_JOBS_COLLECTION]
+
+    @property
+    def items(self):
+        return get_async_db()[PREGEN_ITEMS_COLLECTION]
+
+    # ----- public API -----
+
+    async def start(self, candidate_ids=None, concurrency=None, synthesize_audio=True):
+        """
+        Create a job for candidate_ids, or for every candidate without a template
+        when candidate_ids is empty, and start it. Returns the job status.
+        """
+        now = datetime.utcnow()
+        job = {
+            "_id": uuid.uuid4().hex,
+            "mode": "ids" if candidate_ids else "missing",
+            "candidate_ids": [str(c) for c in candidate_ids] if candidate_ids else None,
+            "concurrency": max(1, min(concurrency or self.concurrency, PREGEN_MAX_CONCURRENCY)),
+            "synthesize_audio": synthesize_audio,
+            "state": "running",
+            "owner": self.owner,
+            "total": 0, "done": 0, "skipped": 0, "failed": 0,
+            "errors": [],
+            "created_at": now,
+            "heartbeat_at": now,
+        }
+        await self.jobs.insert_one(job)
+        self._spawn(job)
+        logger.info(f"🧩 Pre-generation job {job['_id']} started ({job['mode']}, concurrency {job['concurrency']})")
+        return self._public(job)
+
+    async def resume(self, job_id):
+        """Claim an interrupted job and continue it; finished candidates are not redone"""
+        now = datetime.utcnow()
+        job = await self.jobs.find_one_and_update(
+            {
+                "_id": job_id,
+                "$or": [
+                    {"state": {"$in": ["failed", "cancelled"]}},
+                    {"state": "running", "heartbeat_at": {"$lt": now - timedelta(seconds=PREGEN_LEASE_SECONDS)}},
+                ],
+            },
+            {"$set": {"state": "running", "owner": self.owner, "heartbeat_at": now, "resumed_at": now}},
+            return_document=ReturnDocument.AFTER
+        )
+        if job is None:
+            existing = await self.jobs.find_one({"_id": job_id}, {"state": 1, "owner": 1})
+            if existing is None:
+                raise JobNotFound(f"No pre-generation job {job_id}")
+            raise JobNotResumable(f"Job {job_id} is {existing['state']} (owner {existing.get('owner')})")
+        self._spawn(job)
+        logger.info(f"🧩 Pre-generation job {job_id} resumed")
+        return self._public(job)
+
+    async def status(self, job_id):
+        job = await self.jobs.find_one({"_id": job_id}, {"candidate_ids": 0})
+        if job is None:
+            return None
+        status = self._public(job)
+        status["active_here"] = job_id in self._tasks
+        return status
+
+    async def wait(self, job_id):
+        task = self._tasks.get(job_id)
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+
+    async def shutdown(self):
+        """Stop local jobs; they are marked cancelled and can be resumed"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        return {"concurrency": self.concurrency, "active_jobs": len(self._tasks)}
+
+    # ----- job execution -----
+
+    def _public(self, job):
+        keys = ("mode", "concurrency", "synthesize_audio", "state", "owner", "total", "done", "skipped",
+                "failed", "errors", "created_at", "heartbeat_at", "resumed_at", "finished_at")
+        status = {"job_id": job["_id"], **{k: job[k] for k in keys if k in job}}
+        finished = status.get("done", 0) + status.get("skipped", 0) + status.get("failed", 0)
+        status["progress"] = round(finished / status["total"], 4) if status.get("total") else 0.0
+        return status
+
+    def _spawn(self, job):
+        task = asyncio.create_task(self._run(job))
+        self._tasks[job["_id"]] = task
+        task.add_done_callback(lambda finished: self._tasks.pop(job["_id"], None))
+
+    async def _target_ids(self, job):
+        """Candidate ids the job covers, in a stable order"""
+        if job["mode"] == "ids":
+            return list(dict.fromkeys(job["candidate_ids"]))
+
+        missing, after = [], None
+        while True:
+            docs, after = await repository.candidates.page(after, PREGEN_SCAN_BATCH, {"_id": 0, "id": 1})
+            ids = [str(doc["id"]) for doc in docs]
+            have = await repository.templates.candidate_ids_with_templates(ids)
+            missing.extend(candidate_id for candidate_id in ids if candidate_id not in have)
+            if after is None:
+                return missing
+
+    async def _checkpoint(self, job_id, candidate_id, state, error=None):
+        """Record one finished candidate and bump the job's counters and heartbeat"""
+        now = datetime.utcnow()
+        await self.items.update_one(
+            {"_id": f"{job_id}:{candidate_id}"},
+            {"$set": {"job_id": job_id, "candidate_id": candidate_id, "state": state,
+                      "error": error, "finished_at": now}},
+            upsert=True
+        )
+        update = {"$inc": {state: 1}, "$set": {"heartbeat_at": now}}
+        if error:
+            update["$push"] = {"errors": {"$each": [f"{candidate_id}: {error}"], "$slice": -PREGEN_ERROR_HISTORY}}
+        await self.jobs.update_one({"_id": job_id}, update)
+
+    async def _run(self, job):
+        job_id = job["_id"]
+        state, error = "failed", None
+        try:
+            targets = await self._target_ids(job)
+            # Resume: done/skipped candidates are final; failed ones get another try
+            finished = {"done": 0, "skipped": 0}
+            finished_ids = set()
+            async for item in self.items.find({"job_id": job_id}, {"candidate_id": 1, "state": 1}):
+                if item["state"] in finished:
+                    finished[item["state"]] += 1
+                    finished_ids.add(item["candidate_id"])
+            remaining = [c for c in targets if c not in finished_ids]
+            await self.jobs.update_one({"_id": job_id}, {"$set": {
+                **finished, "failed": 0, "total": sum(finished.values()) + len(remaining),
+                "heartbeat_at": datetime.utcnow()
+            }})
+
+            queue = asyncio.Queue()
+            for candidate_id in remaining:
+                queue.put_nowait(candidate_id)
+            workers = [
+                asyncio.create_task(self._worker(job, queue))
+                for _ in range(min(job["concurrency"], len(remaining)) or 1)
+            ]
+            try:
+                await asyncio.gather(*workers)
+            finally:
+                for worker in workers:
+                    worker.cancel()
+            state = "completed"
+        except asyncio.CancelledError:
+            state = "cancelled"  # Shutdown / Ctrl-C: resumable right away (a hard crash waits out the lease)
+            raise
+        except Exception as e:
+            error = str(e)
+            logger.error(f"Pre-generation job {job_id} failed: {e}")
+        finally:
+            update = {"state": state, "finished_at": datetime.utcnow()}
+            if error:
+                update["error"] = error
+            try:
+                await self.jobs.update_one({"_id": job_id}, {"$set": update})
+            except Exception as e:
+                logger.warning(f"Could not save pre-generation job {job_id} state: {e}")
+            logger.info(f"🧩 Pre-generation job {job_id} {state}")
+
+    async def _worker(self, job, queue):
+        while not queue.empty():
+            candidate_id = queue.get_nowait()
+            try:
+                state, error = await self._pregenerate(candidate_id, job["synthesize_audio"])
+            except Exception as e:
+                state, error = "failed", str(e)
+            if error:
+                logger.error(f"Pre-generation failed for {candidate_id}: {error}")
+            await self._checkpoint(job["_id"], candidate_id, state, error)
+
+    async def _pregenerate(self, candidate_id, synthesize_audio):
+        """Generate and store one candidate's template, as /interview/setup would. Returns (state, error)"""
+        from src.helper import generate_questions
+
+        if await repository.templates.candidate_ids_with_templates([candidate_id]):
+            return "skipped", None
+        candidate_data = await repository.candidates.get(candidate_id)
+        if not candidate_data:
+            return "failed", "Candidate not found"
+
+        for attempt in range(1, self.retries + 1):
+            # generate_questions is a blocking LangChain call; keep it off the event loop,
+            # and let live interview calls overtake it at the rate limiter
+            with llm_priority(BACKGROUND):
+                _, questions, greeting = await asyncio.to_thread(generate_questions, candidate_data)
+            if questions and greeting:
+                break
+            if attempt == self.retries:
+                return "failed", f"No questions generated after {self.retries} attempts"
+            await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+        await repository.templates.store(candidate_data, greeting, questions)
+        await repository.preprocessing.store_template(candidate_id, greeting, questions)
+        if synthesize_audio:
+            tts_pipeline.submit(candidate_id)
+        return "done", None
+
+
+pregeneration_jobs = PregenerationJobs()
+
+# =========================
+# CLI
+# =========================
+
+async def run(candidate_ids=None, concurrency=None, resume=None, synthesize_audio=True):
+    from src.database import close_clients
+    try:
+        if resume:
+            status = await pregeneration_jobs.resume(resume)
+        else:
+            status = await pregeneration_jobs.start(candidate_ids, concurrency, synthesize_audio)
+        job_id = status["job_id"]
+        print(f"🧩 Job {job_id} ({status['mode']}); resume with: python -m src.pregeneration --resume {job_id}")
+
+        waiter = asyncio.create_task(pregeneration_jobs.wait(job_id))
+        while not waiter.done():
+            await asyncio.wait({waiter}, timeout=5)
+            status = await pregeneration_jobs.status(job_id)
+            print(f"   {status['state']}: {status['done']} done, {status['skipped']} skipped, "
+                  f"{status['failed']} failed of {status['total']} ({status['progress']:.0%})")
+        if synthesize_audio:
+            print("🎙️ Waiting for audio pre-synthesis...")
+            await tts_pipeline.join()
+
+        for error in status.get("errors", []):
+            print(f"❌ {error}")
+        return 0 if status["state"] == "completed" and not status["failed"] else 1
+    finally:
+        await close_clients()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pre-generate interview templates for many candidates")
+    parser.add_argument("--ids", nargs="+", help="Candidate ids (default: every candidate without a template)")
+    parser.add_argument("--concurrency", type=int, default=PREGEN_CONCURRENCY)
+    parser.add_argument("--resume", metavar="JOB_ID", help="Continue an interrupted job")
+    parser.add_argument("--no-audio", action="store_true", help="Skip TTS pre-synthesis of the new templates")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.ids, args.concurrency, args.resume, not args.no_audio)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,384 @@
+# src/rate_limiter.py - Priority Token-Bucket Rate Limiter for Groq
+# Every LLM call acquires one request from a requests/min bucket and its estimated
+# tokens from a tokens/min bucket before it is sent. Waiters are served strictly by
+# priority class (live interview calls before background generation), FIFO within
+# a class. Estimates are reconciled with the usage Groq reports, and a 429 pauses
+# the buckets. Works from the event loop (aacquire) and from threads (acquire).
+# Interactive callers give up after GROQ_INTERACTIVE_MAX_WAIT_SECONDS with
+# RateLimitTimeout rather than queue behind a long backlog.
+
+import os
+import time
+import heapq
+import asyncio
+import logging
+import itertools
+import threading
+import contextvars
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+GROQ_RATE_LIMIT_ENABLED = os.getenv("GROQ_RATE_LIMIT_ENABLED", "true").lower() in ("1", "true", "yes")
+GROQ_RPM = float(os.getenv("GROQ_RPM", "30"))
+GROQ_TPM = float(os.getenv("GROQ_TPM", "6000"))
+# Buckets hold this many seconds of allowance, so short bursts go out immediately
+GROQ_BURST_SECONDS = float(os.getenv("GROQ_BURST_SECONDS", "5"))
+# Fraction of the provider limit actually used, to absorb clock skew and estimate error
+GROQ_RATE_HEADROOM = float(os.getenv("GROQ_RATE_HEADROOM", "0.95"))
+# serve.py sets this to the worker count; each process takes an equal share of the
+# limits, and so also of the burst: with 4 workers the default 6000 TPM leaves each
+# bucket ~119 tokens, so a single ~900-token evaluation already has to wait for refill
+GROQ_RATE_LIMIT_WORKERS = max(1, int(os.getenv("GROQ_RATE_LIMIT_WORKERS", "1")))
+# Completion tokens assumed per call until Groq reports the real usage
+LLM_EXPECTED_COMPLETION_TOKENS = int(os.getenv("LLM_EXPECTED_COMPLETION_TOKENS", "400"))
+
+# Longest a live call queues for the limiter before RateLimitTimeout (0 = no limit)
+GROQ_INTERACTIVE_MAX_WAIT_SECONDS = float(os.getenv("GROQ_INTERACTIVE_MAX_WAIT_SECONDS", "20"))
+
+INTERACTIVE = "interactive"  # A candidate is waiting: evaluations, follow-ups, on-demand setup
+BACKGROUND = "background"    # Batch pre-generation
+PRIORITIES = {INTERACTIVE: 0, BACKGROUND: 1}
+# Default max_wait per class; background work waits as long as it takes
+MAX_WAIT_SECONDS = {INTERACTIVE: GROQ_INTERACTIVE_MAX_WAIT_SECONDS or None, BACKGROUND: None}
+
+_llm_priority = contextvars.ContextVar("llm_priority", default=INTERACTIVE)
+
+
+@contextmanager
+def llm_priority(priority):
+    """Run the enclosed LLM calls (including asyncio.to_thread ones) in a priority class"""
+    if priority not in PRIORITIES:
+        raise ValueError(f"Unknown LLM priority '{priority}', expected one of {list(PRIORITIES)}")
+    token = _llm_priority.set(priority)
+    try:
+        yield
+    finally:
+        _llm_priority.reset(token)
+
+
+def current_priority():
+    return _llm_priority.get()
+
+
+class RateLimitTimeout(Exception):
+    """The limiter could not grant a call within its max_wait"""
+
+    def __init__(self, priority, max_wait, retry_after=None):
+        self.priority = priority
+        self.max_wait = max_wait
+        self.retry_after = retry_after  # Seconds until the call could go, when known
+        super().__init__(f"Groq rate limiter could not grant an LLM call ({priority}) within {max_wait:g}s")
+
+
+def _loop_running():
+    try:
+        asyncio.get_running_loop()
+        return True
+    except RuntimeError:
+        return False
+
+
+class TokenBucket:
+    """Continuously refilled allowance; may go negative when actual usage exceeds the estimate"""
+
+    def __init__(self, per_minute, burst_seconds):
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * burst_seconds)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now):
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def delay(self, amount, now):
+        """Seconds until `amount` (capped at capacity, so huge requests still go) is available"""
+        self._refill(now)
+        missing = min(amount, self.capacity) - self.tokens
+        return missing / self.rate if missing > 0 else 0.0
+
+    def take(self, amount, now):
+        self._refill(now)
+        self.tokens -= amount
+
+    def pause(self, seconds, now):
+        """Empty the bucket so nothing is sent for `seconds`"""
+        self._refill(now)
+        self.tokens = min(self.tokens, -self.rate * seconds)
+
+
+class _Waiter:
+    __slots__ = ("priority", "tokens", "wake", "max_wait", "queued_at")
+
+    def __init__(self, priority, tokens, wake, max_wait):
+        self.priority = priority
+        self.tokens = tokens
+        self.wake = wake
+        self.max_wait = max_wait
+        self.queued_at = time.perf_counter()
+
+
+class RateLimiter:
+    """Requests/min + tokens/min buckets behind one priority queue"""
+
+    def __init__(self, rpm=GROQ_RPM, tpm=GROQ_TPM, burst_seconds=GROQ_BURST_SECONDS,
+                 headroom=GROQ_RATE_HEADROOM, workers=GROQ_RATE_LIMIT_WORKERS, enabled=GROQ_RATE_LIMIT_ENABLED):
+        self.enabled = enabled
+        self.rpm = rpm * headroom / workers
+        self.tpm = tpm * headroom / workers
+        self.burst_seconds = burst_seconds
+        self.reset()
+
+    def reset(self):
+        """Fresh buckets, queue and counters"""
+        self._lock = threading.Lock()
+        self.requests = TokenBucket(self.rpm, self.burst_seconds)
+        self.tokens = TokenBucket(self.tpm, self.burst_seconds)
+        self._queue = []  # heap of (priority rank, seq, waiter)
+        self._seq = itertools.count()
+        self._stats = {
+            priority: {"granted": 0, "total_wait_ms": 0.0, "max_wait_ms": 0.0}
+            for priority in PRIORITIES
+        }
+        self.estimated_tokens = 0
+        self.actual_tokens = 0
+        self.throttled = 0  # 429s from Groq despite the limiter
+        self.timed_out = 0  # Callers that gave up after max_wait
+
+    # ----- queue -----
+
+    def _register(self, priority, tokens, wake, max_wait):
+        """Queue a waiter; returns it and its monotonic deadline (None: no limit)"""
+        priority = priority or current_priority()
+        max_wait = MAX_WAIT_SECONDS[priority] if max_wait is None else max_wait
+        waiter = _Waiter(priority, tokens, wake, max_wait)
+        with self._lock:
+            heapq.heappush(self._queue, (PRIORITIES[priority], next(self._seq), waiter))
+        return waiter, (time.monotonic() + max_wait if max_wait else None)
+
+    def queued(self, priority=None):
+        """Waiters currently queued, in one priority class or in all of them"""
+        with self._lock:
+            return sum(1 for _, _, waiter in self._queue if priority is None or waiter.priority == priority)
+
+    def _wake_head(self):
+        if self._queue:
+            self._queue[0][2].wake()
+
+    def _try_acquire(self, waiter):
+        """(granted, seconds to sleep or None to wait for a wake-up)"""
+        with self._lock:
+            if self._queue[0][2] is not waiter:
+                return False, None
+            now = time.monotonic()
+            delay = max(self.requests.delay(1, now), self.tokens.delay(waiter.tokens, now))
+            if delay > 0:
+                return False, delay
+            self.requests.take(1, now)
+            self.tokens.take(waiter.tokens, now)
+            self.estimated_tokens += waiter.tokens
+            heapq.heappop(self._queue)
+            self._record(waiter)
+            self._wake_head()
+            return True, 0.0
+
+    def _remove(self, waiter):
+        """Drop a cancelled waiter; if it was at the head, the next one takes over"""
+        with self._lock:
+            for index, entry in enumerate(self._queue):
+                if entry[2] is waiter:
+                    was_head = index == 0
+                    self._queue.pop(index)
+                    heapq.heapify(self._queue)
+                    if was_head:
+                        self._wake_head()
+                    return
+
+    def _wait_time(self, waiter, delay, deadline):
+        """
+        How long to sleep before trying again (None: until woken), or raise
+        RateLimitTimeout once the deadline has passed or, at the head of the
+        queue, the known delay would run past it.
+        """
+        if deadline is None:
+            return delay
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (delay is not None and delay > remaining):
+            with self._lock:
+                self.timed_out += 1
+            raise RateLimitTimeout(waiter.priority, waiter.max_wait, delay)
+        return remaining if delay is None else delay
+
+    def _record(self, waiter):
+        wait_ms = (time.perf_counter() - waiter.queued_at) * 1000
+        stats = self._stats[waiter.priority]
+        stats["granted"] += 1
+        stats["total_wait_ms"] += wait_ms
+        stats["max_wait_ms"] = max(stats["max_wait_ms"], wait_ms)
+
+    # ----- acquire -----
+
+    def acquire(self, tokens, priority=None, max_wait=None):
+        """
+        Block the calling thread until the call may be sent, or raise
+        RateLimitTimeout after max_wait seconds (default: MAX_WAIT_SECONDS for
+        the priority; 0 waits indefinitely). Refuses to run on an event loop
+        thread: parked there, it would freeze the loop that has to wake any
+        aacquire waiter ahead of it, and the whole worker would hang.
+        """
+        if _loop_running():
+            raise RuntimeError(
+                "RateLimiter.acquire() called on an event loop thread; await aacquire()/ainvoke() "
+                "or run the blocking LLM call with asyncio.to_thread()"
+            )
+        if not self.enabled:
+            return
+        event = threading.Event()
+        waiter, deadline = self._register(priority, tokens, event.set, max_wait)
+        try:
+            while True:
+                granted, delay = self._try_acquire(waiter)
+                if granted:
+                    return
+                event.wait(self._wait_time(waiter, delay, deadline))
+                event.clear()
+        except BaseException:
+            self._remove(waiter)
+            raise
+
+    async def aacquire(self, tokens, priority=None, max_wait=None):
+        """Wait (without blocking the event loop) until the call may be sent; max_wait as in acquire()"""
+        if not self.enabled:
+            return
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        waiter, deadline = self._register(priority, tokens, lambda: loop.call_soon_threadsafe(event.set), max_wait)
+        try:
+            while True:
+                granted, delay = self._try_acquire(waiter)
+                if granted:
+                    return
+                timeout = self._wait_time(waiter, delay, deadline)
+                try:
+                    await asyncio.wait_for(event.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        except BaseException:
+            self._remove(waiter)
+            raise
+
+    # ----- feedback from the provider -----
+
+    def settle(self, estimated, actual):
+        """Correct the token bucket once Groq reports what the call really used"""
+        if not self.enabled or actual is None:
+            return
+        with self._lock:
+            self.actual_tokens += actual
+            self.tokens.take(actual - estimated, time.monotonic())
+            if actual < estimated:
+                self._wake_head()  # Refund may let the head go now
+
+    def on_rate_limited(self, retry_after=None):
+        """Groq answered 429: stop sending for retry_after seconds (default: one request interval)"""
+        if not self.enabled:
+            return
+        with self._lock:
+            self.throttled += 1
+            now = time.monotonic()
+            seconds = retry_after if retry_after is not None else 60.0 / self.rpm
+            self.requests.pause(seconds, now)
+            self.tokens.pause(seconds, now)
+        logger.warning(f"Groq rate limit hit; pausing LLM calls for {seconds:.1f}s")
+
+    def stats(self):
+        with self._lock:
+            waiting = {priority: 0 for priority in PRIORITIES}
+            for _, _, waiter in self._queue:
+                waiting[waiter.priority] += 1
+            now = time.monotonic()
+            self.requests._refill(now)
+            self.tokens._refill(now)
+            return {
+                "enabled": self.enabled,
+                "rpm": round(self.rpm, 2),
+                "tpm": round(self.tpm, 2),
+                "requests_available": round(self.requests.tokens, 2),
+                "tokens_available": round(self.tokens.tokens, 1),
+                "estimated_tokens": self.estimated_tokens,
+                "actual_tokens": self.actual_tokens,
+                "throttled": self.throttled,
+                "timed_out": self.timed_out,
+                "queues": {
+                    priority: {
+                        "waiting": waiting[priority],
+                        "granted": stats["granted"],
+                        "avg_wait_ms": round(stats["total_wait_ms"] / stats["granted"], 2) if stats["granted"] else 0.0,
+                        "max_wait_ms": round(stats["max_wait_ms"], 2),
+                    }
+                    for priority, stats in self._stats.items()
+                },
+            }
+
+
+llm_rate_limiter = RateLimiter()
+
+# =========================
+# CHAT MODEL WRAPPER
+# =========================
+
+def estimate_tokens(prompt):
+    """Rough prompt size (~4 characters per token) plus the expected completion"""
+    text = prompt.to_string() if hasattr(prompt, "to_string") else str(prompt)
+    return len(text) // 4 + LLM_EXPECTED_COMPLETION_TOKENS
+
+
+def usage_tokens(message):
+    """Total tokens Groq reports for a response, or None"""
+    usage = getattr(message, "usage_metadata", None)
+    if usage and usage.get("total_tokens") is not None:
+        return usage["total_tokens"]
+    token_usage = (getattr(message, "response_metadata", None) or {}).get("token_usage") or {}
+    return token_usage.get("total_tokens")
+
+
+def _retry_after(error):
+    """Seconds from a 429's Retry-After header, if there is one"""
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def rate_limited(llm, limiter=llm_rate_limiter):
+    """Wrap a chat model so every invoke/ainvoke waits for the limiter first"""
+    from langchain_core.runnables import RunnableLambda
+
+    def invoke(prompt, config=None):
+        estimated = estimate_tokens(prompt)
+        limiter.acquire(estimated)
+        try:
+            message = llm.invoke(prompt, config)
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                limiter.on_rate_limited(_retry_after(e))
+            raise
+        limiter.settle(estimated, usage_tokens(message))
+        return message
+
+    async def ainvoke(prompt, config=None):
+        estimated = estimate_tokens(prompt)
+        await limiter.aacquire(estimated)
+        try:
+            message = await llm.ainvoke(prompt, config)
+        except Exception as e:
+            if getattr(e, "status_code", None) == 429:
+                limiter.on_rate_limited(_retry_after(e))
+            raise
+        limiter.settle(estimated, usage_tokens(message))
+        return message
+
+    return RunnableLambda(invoke, afunc=ainvoke, name="RateLimitedChatModel")
@@ -0,0 +1,165 @@
+# src/report_cache.py - Versioned Report Render Cache
+# Rendered /report HTML keyed by (candidate_id, interviews_results version, template
+# hash). A changed result or template yields a new key, so entries never go stale;
+# old renders simply age out. Tier 1: in-process LRU bounded by bytes. Tier 2:
+# REPORT_CACHE_DIR on disk, shared by workers, LRU by mtime with a byte cap.
+
+import os
+import json
+import hashlib
+import logging
+import threading
+from functools import lru_cache
+
+from src.cache import LRUTTLCache
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_DIR = os.getenv("REPORT_CACHE_DIR", os.path.join("reports", "cache"))
+REPORT_CACHE_SIZE = int(os.getenv("REPORT_CACHE_SIZE", "256"))
+REPORT_CACHE_MEMORY_BYTES = int(os.getenv("REPORT_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024)))
+REPORT_CACHE_DISK_BYTES = int(os.getenv("REPORT_CACHE_DISK_BYTES", str(256 * 1024 * 1024)))
+
+# Bump whenever src/report_renderer.py changes the markup it builds around the template
+REPORT_RENDERER_VERSION = "1"
+
+
+@lru_cache(maxsize=1)
+def report_template_hash():
+    """sha256 of the report template plus the renderer version"""
+    from src.postprocessing import report_template
+    payload = f"{REPORT_RENDERER_VERSION}\n{report_template}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def report_cache_key(candidate_id, version):
+    """Content address of one render; also served as the report's ETag"""
+    payload = json.dumps([candidate_id, version, report_template_hash()], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ReportCache:
+    """Memory LRU in front of a size-capped disk LRU of rendered report HTML (bytes)"""
+
+    def __init__(self, directory=REPORT_CACHE_DIR, maxsize=REPORT_CACHE_SIZE,
+                 max_memory_bytes=REPORT_CACHE_MEMORY_BYTES, max_disk_bytes=REPORT_CACHE_DISK_BYTES):
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.memory = LRUTTLCache(maxsize=maxsize, max_weight=max_memory_bytes, weigher=len)
+        self._disk_lock = threading.Lock()
+        self._disk_bytes = None  # Scanned on first write
+        self.disk_hits = 0
+        self.renders = 0
+        self.disk_evictions = 0
+        self.errors = 0
+
+    def key(self, candidate_id, version):
+        return report_cache_key(candidate_id, version)
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.html")
+
+    def get(self, key):
+        html = self.memory.get(key)
+        if html is not None:
+            return html
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                html = f.read()
+            os.utime(path)  # mtime is the disk tier's recency
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.errors += 1
+            logger.error(f"Report cache read failed for {key}: {e}")
+            return None
+        self.disk_hits += 1
+        self.memory.set(key, html)
+        return html
+
+    def put(self, key, html):
+        self.renders += 1
+        self.memory.set(key, html)
+        if len(html) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(html)
+            existed = os.path.exists(path)
+            os.replace(tmp_path, path)  # Atomic, so concurrent readers never see half a file
+        except OSError as e:
+            self.errors += 1
+            logger.error(f"Report cache write failed for {key}: {e}")
+            return
+        with self._disk_lock:
+            if self._disk_bytes is None:
+                self._disk_bytes = sum(size for _, _, size in self._disk_entries())
+            elif not existed:
+                self._disk_bytes += len(html)
+            if self._disk_bytes > self.max_disk_bytes:
+                self._evict_disk()
+
+    def tee(self, key, chunks):
+        """
+        Pass rendered str chunks through as UTF-8 bytes and store the whole render
+        once the last one is out. An abandoned or failed stream stores nothing.
+        """
+        parts = []
+        try:
+            for chunk in chunks:
+                data = chunk.encode("utf-8")
+                parts.append(data)
+                yield data
+        except Exception as e:
+            self.errors += 1
+            logger.error(f"Report render failed for {key}: {e}")
+            raise
+        self.put(key, b"".join(parts))
+
+    def _disk_entries(self):
+        """(mtime, path, size) for every cached render on disk"""
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if entry.name.endswith(".html"):
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, entry.path, stat.st_size))
+        except OSError:
+            pass
+        return entries
+
+    def _evict_disk(self):
+        """Delete least recently used renders until the directory is back under 90% of its cap"""
+        entries = sorted(self._disk_entries())
+        total = sum(size for _, _, size in entries)
+        target = self.max_disk_bytes * 0.9
+        for _, path, size in entries:
+            if total <= target:
+                break
+            try:
+                os.remove(path)
+                total -= size
+                self.disk_evictions += 1
+            except OSError:
+                pass
+        # Rescanned total also absorbs writes and evictions made by other workers
+        self._disk_bytes = total
+
+    def stats(self):
+        return {
+            "memory": self.memory.stats(),
+            "disk_hits": self.disk_hits,
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes,
+            "disk_evictions": self.disk_evictions,
+            "renders": self.renders,
+            "errors": self.errors,
+        }
+
+
+report_cache = ReportCache()
@@ -0,0 +1,120 @@
+# src/report_renderer.py - Precompiled, Streaming Report Renderer
+# report_template is parsed once into (literal, field, format_spec, conversion)
+# segments; rendering walks them and yields the HTML in ~REPORT_CHUNK_BYTES
+# chunks. Repeated sections (categories, interactions, improvement areas) are
+# generated card by card, so no step ever rebuilds a growing string.
+
+import os
+import string
+from functools import lru_cache
+
+REPORT_CHUNK_BYTES = int(os.getenv("REPORT_CHUNK_BYTES", str(16 * 1024)))
+
+_formatter = string.Formatter()
+
+
+@lru_cache(maxsize=8)
+def compile_template(template):
+    """Parse a str.format template once; '{{' / '}}' come back already unescaped"""
+    return tuple(_formatter.parse(template))
+
+
+def render_template(template, context):
+    """
+    Yield the pieces of `template` filled from `context`, like str.format.
+    A callable value is a section: it is called and its pieces are yielded as-is.
+    """
+    for literal, field, format_spec, conversion in compile_template(template):
+        if literal:
+            yield literal
+        if field is None:
+            continue
+        value, _ = _formatter.get_field(field, (), context)
+        if callable(value):
+            yield from value()
+            continue
+        if conversion:
+            value = _formatter.convert_field(value, conversion)
+        yield format(value, format_spec or "")
+
+# =========================
+# REPORT SECTIONS
+# =========================
+
+def _category_averages(report_raw_dict):
+    category_averages = report_raw_dict.get("scores", {}).get('category_averages', {})
+    for category, avg_score in category_averages.items():
+        if avg_score > 0:
+            category_name = category.replace('_', ' ').title()
+            yield f"""
+                    <div class="card">
+                        <p class="font-medium text-gray-500 text-sm">{category_name} Score:</p>
+                        <p class="text-2xl font-bold text-indigo-600">{avg_score:.1f} / 5</p>
+                    </div>
+                """
+
+
+def _interactions(report_raw_dict):
+    for interaction in report_raw_dict.get('interactions', []):
+        question = interaction.get('question', 'N/A')
+        answer = interaction.get('answer', 'No answer provided.')
+        score = interaction.get('score', 0)
+        feedback_html = "".join(
+            f"""
+                    <div class="feedback-item">
+                        <span class="feedback-icon text-blue-600">▪</span> {fb}
+                    </div>
+                """
+            for fb in interaction.get('feedback', [])
+        )
+        yield f"""
+                <div class="interaction-card">
+                    <p class="qa-question">{question}</p>
+                    <p class="qa-answer">{answer}</p>
+                    <div class="score-section">
+                        <span class="score-badge">Score: {score}/5</span>
+                    </div>
+                    <div class="feedback-section">
+                        <h5>Feedback:</h5>
+                        {feedback_html}
+                    </div>
+                </div>
+            """
+
+
+def _improvement_areas(report_raw_dict):
+    for imp in report_raw_dict.get("improvement_areas", []):
+        yield f"<li>{imp.get('question', '')} (Score: {imp.get('score', 0)})</li>"
+
+
+def iter_report_html(report_raw_dict, chunk_size=REPORT_CHUNK_BYTES):
+    """Yield the filled report template in chunks of roughly chunk_size characters"""
+    from src.postprocessing import report_template
+
+    context = {
+        "candidate_id": report_raw_dict["candidate_id"],
+        "position": report_raw_dict["position"],
+        "interview_date": report_raw_dict["interview_date"],
+        "interviewer_name": report_raw_dict["interviewer_name"],
+        "scores": report_raw_dict["scores"],
+        "average_score": report_raw_dict["average_score"],
+        "max_possible_score": report_raw_dict["max_possible_score"],
+        "total_score": report_raw_dict["total_score"],
+        "scored_interactions": report_raw_dict["scored_interactions"],
+        "percentage_score": report_raw_dict["percentage_score"],
+        "category_averages_html": lambda: _category_averages(report_raw_dict),
+        "interactions_html": lambda: _interactions(report_raw_dict),
+        "improvement_areas_html": lambda: _improvement_areas(report_raw_dict),
+        "current_generation_date": report_raw_dict["current_generation_date"],
+    }
+
+    # Coalesce the many small pieces so the response is not one send per card
+    buffer, size = [], 0
+    for piece in render_template(report_template, context):
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
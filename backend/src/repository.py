@@ -0,0 +1,681 @@
+# src/repository.py - Async Data Access Layer
+# Every MongoDB / GridFS call made by the FastAPI handlers goes through here so
+# that handlers await the driver instead of blocking the event loop.
+
+import logging
+from datetime import datetime
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError, BulkWriteError, OperationFailure
+
+from src.database import get_async_db
+from src.cache import template_cache
+
+logger = logging.getLogger(__name__)
+
+# =========================
+# CANDIDATES
+# =========================
+
+class CandidateRepository:
+    """aieta.candidates"""
+
+    @property
+    def collection(self):
+        return get_async_db()['candidates']
+
+    async def list(self, projection=None):
+        projection = projection or {"_id": 0}
+        return await self.collection.find({}, projection).to_list(None)
+
+    async def page(self, after=None, limit=50, projection=None):
+        """
+        Keyset page ordered by `id`: the next `limit` candidates with id > after.
+        Returns (docs, next_cursor); next_cursor is None on the last page.
+        Walks the unique `id` index (src/indexes.py), so the cost does not grow with
+        how deep the page is.
+        """
+        query = {"id": {"$gt": after}} if after else {}
+        projection = projection or {"_id": 0}
+        docs = await self.collection.find(query, projection).sort("id", 1).limit(limit + 1).to_list(None)
+        if len(docs) > limit:
+            return docs[:limit], docs[limit - 1]["id"]
+        return docs, None
+
+    async def estimated_count(self):
+        """Collection metadata count: O(1), approximate after unclean shutdowns"""
+        return await self.collection.estimated_document_count()
+
+    async def get(self, candidate_id, projection=None):
+        return await self.collection.find_one({"id": candidate_id}, projection)
+
+    async def bulk_upsert(self, docs, overwrite_existing=False, insert_defaults=None):
+        """
+        One unordered bulk_write of upserts keyed on `id`. With overwrite_existing
+        the given fields replace stored ones; otherwise existing candidates are
+        left untouched ($setOnInsert). insert_defaults fill fields a doc lacks,
+        on insert only. Returns (created, updated, errors) where errors is
+        [(index in docs, message)].
+        """
+        operations = []
+        for doc in docs:
+            defaults = {k: v for k, v in (insert_defaults or {}).items() if k not in doc}
+            if overwrite_existing:
+                update = {"$set": doc, **({"$setOnInsert": defaults} if defaults else {})}
+            else:
+                update = {"$setOnInsert": {**defaults, **doc}}
+            operations.append(UpdateOne({"id": doc["id"]}, update, upsert=True))
+        try:
+            result = await self.collection.bulk_write(operations, ordered=False)
+            details, errors = result.bulk_api_result, []
+        except BulkWriteError as e:
+            details = e.details
+            errors = [(err["index"], err.get("errmsg", "write failed")) for err in details.get("writeErrors", [])]
+        created = details.get("nUpserted", 0)
+        updated = details.get("nModified", 0)
+        return created, updated, errors
+
+# =========================
+# INTERVIEWS (legacy) AND INTERACTION
+# =========================
+
+class InterviewRepository:
+    """aieta.interviews - legacy interview documents"""
+
+    @property
+    def collection(self):
+        return get_async_db()['interviews']
+
+    async def get(self, candidate_id):
+        return await self.collection.find_one({"candidate_id": candidate_id})
+
+
+# Recomputes the derived score fields from the running totals, server-side
+SCORE_TOTALS_STAGE = {"$set": {
+    "scores.average_score": {"$round": [{"$cond": [
+        {"$gt": ["$scores.scored_interactions", 0]},
+        {"$divide": ["$scores.total_score", "$scores.scored_interactions"]},
+        0
+    ]}, 2]},
+    "scores.max_possible_score": {"$multiply": ["$scores.scored_interactions", 5]},
+}}
+
+
+class InteractionRepository:
+    """
+    aieta.interaction - one saved interview document per candidate.
+    Turns of an interview in progress are collected in aieta.interaction_drafts,
+    one draft per (candidate_id, session_id), and only replace the candidate's
+    saved interview when that session is finalized.
+    """
+
+    @property
+    def collection(self):
+        return get_async_db()['interaction']
+
+    @property
+    def drafts(self):
+        return get_async_db()['interaction_drafts']
+
+    async def get(self, candidate_id):
+        return await self.collection.find_one({"candidate_id": candidate_id})
+
+    async def save(self, candidate_id, interview_document):
+        """Replace the candidate's interview fields, inserting if missing. Returns (operation, _id)"""
+        existing = await self.collection.find_one({"candidate_id": candidate_id}, {"_id": 1})
+        if existing:
+            await self.collection.update_one(
+                {"candidate_id": candidate_id},
+                {"$set": interview_document}
+            )
+            operation, document_id = "updated", existing["_id"]
+        else:
+            result = await self.collection.insert_one(interview_document)
+            operation, document_id = "created", result.inserted_id
+        # The full transcript supersedes whatever this session saved turn by turn
+        await self.drafts.delete_many({"candidate_id": candidate_id, "session_id": interview_document.get("session_id")})
+        await score_summaries.refresh(candidate_id)
+        return operation, document_id
+
+    async def append(self, candidate_id, session_id, interaction, turn_id=None):
+        """
+        Add one scored turn to the session's draft: $push the interaction and $inc
+        the running totals (the average is derived at finalize), creating the draft
+        on the first turn. One round trip per turn; the candidate's saved interview
+        and score summary are not touched until finalize. Returns "appended" or
+        "duplicate" (turn_id already stored).
+        """
+        now = datetime.utcnow()
+        interaction = {**interaction, "turn_id": turn_id} if turn_id else dict(interaction)
+        score = interaction.get("score")
+        scored = isinstance(score, (int, float)) and not isinstance(score, bool)
+        query = {"candidate_id": candidate_id, "session_id": session_id}
+        new_turn = {**query, "interactions.turn_id": {"$ne": turn_id}} if turn_id else query
+        push = {
+            "$push": {"interactions": interaction},
+            "$inc": {
+                "scores.total_score": score if scored else 0,
+                "scores.scored_interactions": int(scored),
+                "metadata.total_questions": 1
+            },
+            "$set": {"updated_at": now}
+        }
+        # $setOnInsert only, so it can never overwrite a draft that already exists
+        first_turn = {"$setOnInsert": {
+            "status": "in_progress",
+            "interactions": [interaction],
+            "scores": {"total_score": score if scored else 0, "scored_interactions": int(scored)},
+            "metadata": {"total_questions": 1, "platform": "web", "version": "4.0.0"},
+            "created_at": now,
+            "updated_at": now
+        }}
+
+        for _ in range(2):
+            if (await self.drafts.update_one(new_turn, push)).matched_count:
+                return "appended"
+            try:
+                result = await self.drafts.update_one(query, first_turn, upsert=True)
+            except DuplicateKeyError:
+                continue  # A concurrent first turn created the draft; push onto it
+            if result.upserted_id is not None:
+                return "appended"
+            # The draft exists: either it already holds turn_id or it was created in between
+        return "duplicate"
+
+    async def finalize(self, candidate_id, session_id=None):
+        """
+        Promote the session's draft (the latest one without session_id) to the
+        candidate's saved interview, marked completed. The transcript is copied
+        server-side ($merge), so this costs the same for any interview length.
+        Returns the saved document without its transcript, or None.
+        """
+        query = {"candidate_id": candidate_id}
+        if session_id:
+            query["session_id"] = session_id
+        now = datetime.utcnow()
+        completed = {"$set": {
+            "status": "completed",
+            "metadata.interview_completed_at": now,
+            "updated_at": now
+        }}
+
+        draft = await self.drafts.find_one(query, {"_id": 1}, sort=[("updated_at", -1)])
+        if draft is None:
+            # Nothing pending: a repeated finalize, or turns saved before drafts existed
+            doc = await self.collection.find_one_and_update(
+                query,
+                [SCORE_TOTALS_STAGE, completed],
+                projection={"interactions": 0},
+                return_document=ReturnDocument.AFTER
+            )
+            if doc:
+                await score_summaries.refresh(candidate_id)
+            return doc
+
+        existing = await self.collection.find_one({"candidate_id": candidate_id}, {"_id": 1})
+        document_id = existing["_id"] if existing else ObjectId()
+        cursor = await self.drafts.aggregate([
+            {"$match": {"_id": draft["_id"]}},
+            {"$set": {"_id": document_id}},
+            SCORE_TOTALS_STAGE,
+            completed,
+            {"$merge": {"into": "interaction", "on": "_id", "whenMatched": "replace", "whenNotMatched": "insert"}}
+        ])
+        await cursor.to_list(None)
+        await self.drafts.delete_one({"_id": draft["_id"]})
+        await score_summaries.refresh(candidate_id)
+        return await self.collection.find_one({"_id": document_id}, {"interactions": 0})
+
+    async def delete(self, candidate_id):
+        result = await self.collection.delete_one({"candidate_id": candidate_id})
+        await self.drafts.delete_many({"candidate_id": candidate_id})
+        await score_summaries.delete(candidate_id)
+        return result.deleted_count
+
+    async def iter_for_export(self, candidate_ids=None, projection=None, batch_size=500):
+        """
+        Yield interview documents in candidate_id order straight off the cursor,
+        batch_size at a time, for all candidates or only those in candidate_ids.
+        """
+        query = {"candidate_id": {"$in": list(candidate_ids)}} if candidate_ids else {}
+        cursor = self.collection.find(query, projection).sort("candidate_id", 1).batch_size(batch_size)
+        try:
+            async for doc in cursor:
+                yield doc
+        finally:
+            await cursor.close()  # Client went away mid-export: release the server-side cursor
+
+# =========================
+# SCORE SUMMARIES
+# =========================
+
+# Shared tail of the $merge pipelines below; "merge" keeps the existing _id
+MERGE_INTO_SUMMARIES = {"$merge": {
+    "into": "score_summaries", "on": "candidate_id",
+    "whenMatched": "merge", "whenNotMatched": "insert"
+}}
+
+
+class ScoreSummaryRepository:
+    """
+    aieta.score_summaries - one small document per candidate with the score
+    totals, rebuilt server-side ($merge) whenever the candidate's interaction
+    document changes, so score reads never load the transcript.
+    """
+
+    @property
+    def collection(self):
+        return get_async_db()['score_summaries']
+
+    async def get(self, candidate_id):
+        return await self.collection.find_one({"candidate_id": candidate_id}, {"_id": 0})
+
+    async def _merge_from(self, collection_name, project):
+        cursor = await get_async_db()[collection_name].aggregate([
+            *project, MERGE_INTO_SUMMARIES
+        ])
+        await cursor.to_list(None)
+
+    async def refresh(self, candidate_id):
+        """
+        Rebuild the summary from aieta.interaction; returns it, or None if there is
+        nothing to summarize. If the $merge fails (e.g. the unique candidate_id index
+        it needs is missing) the summary is computed and returned without storing it.
+        """
+        try:
+            await self._merge_from('interaction', [
+                {"$match": {"candidate_id": candidate_id}},
+                {"$limit": 1},
+                {"$project": {
+                    "_id": 0,
+                    "candidate_id": 1,
+                    "session_id": {"$ifNull": ["$session_id", None]},
+                    "status": {"$ifNull": ["$status", "completed"]},
+                    "average_score": {"$ifNull": ["$scores.average_score", 0]},
+                    "total_score": {"$ifNull": ["$scores.total_score", 0]},
+                    "scored_interactions": {"$ifNull": ["$scores.scored_interactions", 0]},
+                    "max_possible_score": {"$ifNull": ["$scores.max_possible_score", 0]},
+                    "total_questions": {"$ifNull": ["$metadata.total_questions", 0]},
+                    "source": "interaction",
+                    "updated_at": "$$NOW"
+                }}
+            ])
+        except OperationFailure as e:
+            logger.warning(f"Could not refresh score summary for {candidate_id}: {e}")
+            return await self._compute_from_interaction(candidate_id)
+        return await self.get(candidate_id)
+
+    async def refresh_from_legacy(self, candidate_id):
+        """
+        Materialize a summary for a candidate that only has a legacy aieta.interviews
+        document; like refresh(), computed without storing it if the $merge fails.
+        """
+        interactions = {"$ifNull": ["$interactions", []]}
+        try:
+            await self._merge_from('interviews', [
+                {"$match": {"candidate_id": candidate_id}},
+                {"$limit": 1},
+                {"$project": {
+                    "_id": 0,
+                    "candidate_id": 1,
+                    "total_questions": {"$size": interactions},
+                    "total_score": {"$sum": "$interactions.score"},
+                    "scored_interactions": {"$size": {"$filter": {
+                        "input": interactions, "cond": {"$isNumber": "$$this.score"}
+                    }}}
+                }},
+                {"$set": {
+                    "session_id": None,
+                    "status": "completed",
+                    # Legacy documents averaged over all questions, scored or not
+                    "average_score": {"$cond": [
+                        {"$gt": ["$total_questions", 0]},
+                        {"$divide": ["$total_score", "$total_questions"]},
+                        0
+                    ]},
+                    "max_possible_score": {"$multiply": ["$scored_interactions", 5]},
+                    "source": "interviews",
+                    "updated_at": "$$NOW"
+                }}
+            ])
+        except OperationFailure as e:
+            logger.warning(f"Could not build legacy score summary for {candidate_id}: {e}")
+            return await self._compute_from_legacy(candidate_id)
+        return await self.get(candidate_id)
+
+    async def _compute_from_interaction(self, candidate_id):
+        """The summary refresh() would store, read straight from aieta.interaction"""
+        doc = await interactions.collection.find_one(
+            {"candidate_id": candidate_id},
+            {"_id": 0, "session_id": 1, "status": 1, "scores": 1, "metadata.total_questions": 1}
+        )
+        if doc is None:
+            return None
+        scores = doc.get("scores") or {}
+        return {
+            "candidate_id": candidate_id,
+            "session_id": doc.get("session_id"),
+            "status": doc.get("status") or "completed",
+            "average_score": scores.get("average_score") or 0,
+            "total_score": scores.get("total_score") or 0,
+            "scored_interactions": scores.get("scored_interactions") or 0,
+            "max_possible_score": scores.get("max_possible_score") or 0,
+            "total_questions": (doc.get("metadata") or {}).get("total_questions") or 0,
+            "source": "interaction",
+        }
+
+    async def _compute_from_legacy(self, candidate_id):
+        """The summary refresh_from_legacy() would store, read straight from aieta.interviews"""
+        doc = await interviews.collection.find_one({"candidate_id": candidate_id}, {"_id": 0, "interactions.score": 1})
+        if doc is None:
+            return None
+        turns = doc.get("interactions") or []
+        scores = [
+            turn["score"] for turn in turns
+            if isinstance(turn.get("score"), (int, float)) and not isinstance(turn.get("score"), bool)
+        ]
+        total_score = sum(scores)
+        return {
+            "candidate_id": candidate_id,
+            "session_id": None,
+            "status": "completed",
+            # Legacy documents averaged over all questions, scored or not
+            "average_score": total_score / len(turns) if turns else 0,
+            "total_score": total_score,
+            "scored_interactions": len(scores),
+            "max_possible_score": len(scores) * 5,
+            "total_questions": len(turns),
+            "source": "interviews",
+        }
+
+    async def delete(self, candidate_id):
+        await self.collection.delete_one({"candidate_id": candidate_id})
+
+# =========================
+# PREPROCESSING AND TEMPLATES
+# =========================
+
+def normalize_questions(questions):
+    """
+    test_preprocessing stores questions as {"question_number", "text", ...} dicts
+    (the shape the template and TTS readers expect); plain strings are converted.
+    """
+    normalized = []
+    for index, question in enumerate(questions, start=1):
+        if isinstance(question, str):
+            question = {"question_number": index, "text": question}
+        else:
+            question = {"question_number": index, **question}
+        normalized.append(question)
+    return normalized
+
+
+# Shared with the synchronous helpers in src/helper.py so both store and read
+# templates in exactly one shape
+PREPROCESSING_TEMPLATE_PROJECTION = {"greetings_text": 1, "questions.text": 1}
+TEMPLATE_PROJECTION = {"greeting_script": 1, "questions": 1}
+
+
+def template_document(candidate_data, greeting, questions):
+    """The aieta.interview_templates document for a generated greeting and questions"""
+    return {
+        "candidate_id": candidate_data['id'],
+        'candidate_email': (candidate_data.get('personal_information') or {}).get('email'),
+        "greeting_script": greeting,
+        "questions": questions,
+        "created_at": datetime.utcnow()
+    }
+
+
+def questions_upsert(questions):
+    """Update that stores (replaces) a candidate's questions, creating the document if needed"""
+    now = datetime.utcnow()
+    return {
+        "$set": {"questions": normalize_questions(questions), "updated_at": now},
+        "$setOnInsert": {"created_at": now}
+    }
+
+
+def preprocessing_template(doc):
+    """(greeting, question texts) from a test_preprocessing document"""
+    return doc.get("greetings_text", ""), [q.get("text", "") for q in doc.get("questions", [])]
+
+
+def stored_template(doc):
+    """(greeting, questions) from an interview_templates document"""
+    return doc.get("greeting_script", ""), doc.get("questions", [])
+
+
+class PreprocessingRepository:
+    """aieta.test_preprocessing - pre-stored questions (and TTS audio ids)"""
+
+    @property
+    def collection(self):
+        return get_async_db()['test_preprocessing']
+
+    async def get(self, candidate_id, projection=None):
+        return await self.collection.find_one({"candidate_id": str(candidate_id)}, projection)
+
+    async def store_questions(self, candidate_id, questions):
+        """
+        Create or update the candidate's questions in one upsert, so concurrent
+        stores for the same candidate cannot collide on the unique candidate_id
+        index. Returns the document _id.
+        """
+        doc = await self.collection.find_one_and_update(
+            {"candidate_id": candidate_id},
+            questions_upsert(questions),
+            projection={"_id": 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        template_cache.pop(str(candidate_id))
+        return doc["_id"]
+
+    async def store_template(self, candidate_id, greeting, questions):
+        """Upsert a generated greeting and questions so the TTS pipeline can attach audio ids"""
+        questions = normalize_questions(questions)
+        await self.collection.update_one(
+            {"candidate_id": str(candidate_id)},
+            {
+                "$set": {"greetings_text": greeting, "questions": questions, "updated_at": datetime.utcnow()},
+                "$setOnInsert": {"created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+        template_cache.set(str(candidate_id), (greeting, [q.get("text", "") for q in questions]))
+
+    async def store_greeting(self, candidate_id, greeting, questions):
+        """
+        Fill in a generated greeting next to questions that were stored without
+        one (/store-questions). Stored questions are never replaced; `questions`
+        is only written if the document does not exist yet.
+        """
+        await self.collection.update_one(
+            {"candidate_id": str(candidate_id)},
+            {
+                "$set": {"greetings_text": greeting, "updated_at": datetime.utcnow()},
+                "$setOnInsert": {"questions": normalize_questions(questions), "created_at": datetime.utcnow()}
+            },
+            upsert=True
+        )
+        template_cache.set(str(candidate_id), (greeting, list(questions)))
+
+    async def set_audio_ids(self, candidate_id, greeting_audio_id=None, question_audio=None):
+        """
+        Attach synthesized audio ids. `question_audio` maps question_number ->
+        (text, audio_id); an id is only written if the question still has that text.
+        """
+        update = {}
+        array_filters = []
+        if greeting_audio_id is not None:
+            update["audio_file_greetings"] = greeting_audio_id
+        for index, (question_number, (text, audio_id)) in enumerate((question_audio or {}).items()):
+            update[f"questions.$[q{index}].audio_file_question_number"] = audio_id
+            array_filters.append({f"q{index}.question_number": question_number, f"q{index}.text": text})
+        if not update:
+            return 0
+        result = await self.collection.update_one(
+            {"candidate_id": str(candidate_id)},
+            {"$set": update},
+            array_filters=array_filters or None
+        )
+        return result.modified_count
+
+    async def set_tts_status(self, candidate_id, status):
+        await self.collection.update_one({"candidate_id": str(candidate_id)}, {"$set": {"tts_status": status}})
+
+
+class TemplateRepository:
+    """aieta.interview_templates - LLM generated greeting and questions"""
+
+    @property
+    def collection(self):
+        return get_async_db()['interview_templates']
+
+    async def get_interview_template(self, candidate_id):
+        """
+        Async version of helper.get_stored_interview_template: test_preprocessing
+        first, then interview_templates. Returns (greeting, questions) or (None, None).
+        Found templates are served from template_cache until a store invalidates them.
+        """
+        cached = template_cache.get(str(candidate_id))
+        if cached:
+            return cached
+
+        doc = await preprocessing.get(candidate_id, PREPROCESSING_TEMPLATE_PROJECTION)
+        if doc:
+            template = preprocessing_template(doc)
+            template_cache.set(str(candidate_id), template)
+            return template
+
+        template_doc = await self.collection.find_one({"candidate_id": str(candidate_id)}, TEMPLATE_PROJECTION)
+        if template_doc:
+            template = stored_template(template_doc)
+            template_cache.set(str(candidate_id), template)
+            return template
+        return None, None
+
+    async def store(self, candidate_data, greeting, questions):
+        result = await self.collection.insert_one(template_document(candidate_data, greeting, questions))
+        template_cache.set(str(candidate_data['id']), (greeting, list(questions)))
+        return result.inserted_id
+
+    async def candidate_ids_with_templates(self, candidate_ids):
+        """The subset of candidate_ids that already have a greeting and questions stored"""
+        candidate_ids = [str(candidate_id) for candidate_id in candidate_ids]
+        found = set()
+        async for doc in preprocessing.collection.find(
+            {"candidate_id": {"$in": candidate_ids}, "questions.0": {"$exists": True}}, {"_id": 0, "candidate_id": 1}
+        ):
+            found.add(doc["candidate_id"])
+        async for doc in self.collection.find(
+            {"candidate_id": {"$in": [c for c in candidate_ids if c not in found]}}, {"_id": 0, "candidate_id": 1}
+        ):
+            found.add(str(doc["candidate_id"]))
+        return found
+
+# =========================
+# TTS AUDIO FILES (GridFS)
+# =========================
+
+class TTSFileRepository:
+    """GridFS buckets holding TTS audio (gridfs is imported on first use)"""
+
+    def bucket(self, bucket_name="fs"):
+        from gridfs import AsyncGridFSBucket
+        return AsyncGridFSBucket(get_async_db(), bucket_name=bucket_name)
+
+    async def open(self, audio_id, bucket_name="fs"):
+        """Open a GridFS download stream for the given file id"""
+        return await self.bucket(bucket_name).open_download_stream(audio_id)
+
+    async def open_audio(self, audio_id):
+        """
+        Open a pre-generated audio file by id. Legacy files live in the default
+        'fs' bucket; pipeline-generated ones in 'tts_files'. Raises NoFile if neither has it.
+        """
+        from gridfs.errors import NoFile
+        if isinstance(audio_id, str) and ObjectId.is_valid(audio_id):
+            audio_id = ObjectId(audio_id)
+        try:
+            return await self.open(audio_id, "fs")
+        except NoFile:
+            return await self.open(audio_id, "tts_files")
+
+    async def read(self, audio_id, bucket_name="fs"):
+        grid_out = await self.open(audio_id, bucket_name)
+        return await grid_out.read()
+
+    async def find_by_name(self, filename, bucket_name="tts_files"):
+        """Return (file_id, bytes) of the latest file stored under `filename`, or None"""
+        from gridfs.errors import NoFile
+        try:
+            grid_out = await self.bucket(bucket_name).open_download_stream_by_name(filename)
+        except NoFile:
+            return None
+        return grid_out._id, await grid_out.read()
+
+    async def find_id_by_name(self, filename, bucket_name="tts_files"):
+        """Return the id of the latest file stored under `filename`, or None"""
+        cursor = self.bucket(bucket_name).find({"filename": filename}).sort("uploadDate", -1).limit(1)
+        async for grid_out in cursor:
+            return grid_out._id
+        return None
+
+    async def upload(self, filename, data, metadata=None, bucket_name="tts_files"):
+        """Store `data` under `filename`; returns the new file id"""
+        return await self.bucket(bucket_name).upload_from_stream(filename, data, metadata=metadata)
+
+    async def keep(self, file_id, bucket_name="tts_files"):
+        """Clear the runtime flag so delete_runtime_before never removes this file"""
+        await get_async_db()[f"{bucket_name}.files"].update_one(
+            {"_id": file_id, "metadata.runtime": True},
+            {"$set": {"metadata.runtime": False}}
+        )
+
+    async def delete_runtime_before(self, cutoff, bucket_name="tts_files", limit=1000):
+        """
+        Delete up to `limit` runtime-generated files uploaded before `cutoff`, chunks
+        included (a TTL index would only drop the files documents). Returns the count.
+        """
+        from gridfs.errors import NoFile
+        bucket = self.bucket(bucket_name)
+        file_ids = [
+            doc["_id"] async for doc in get_async_db()[f"{bucket_name}.files"].find(
+                {"metadata.runtime": True, "uploadDate": {"$lt": cutoff}}, {"_id": 1}
+            ).limit(limit)
+        ]
+        deleted = 0
+        for file_id in file_ids:
+            try:
+                await bucket.delete(file_id)
+                deleted += 1
+            except NoFile:
+                pass  # Swept by another worker
+        return deleted
+
+# =========================
+# CODING SUBMISSIONS
+# =========================
+
+class CodingSubmissionRepository:
+    """ai_interviewer.coding_submissions"""
+
+    @property
+    def collection(self):
+        return get_async_db('ai_interviewer')['coding_submissions']
+
+    async def insert(self, submission_doc):
+        result = await self.collection.insert_one(submission_doc)
+        return result.inserted_id
+
+
+candidates = CandidateRepository()
+interviews = InterviewRepository()
+interactions = InteractionRepository()
+score_summaries = ScoreSummaryRepository()
+preprocessing = PreprocessingRepository()
+templates = TemplateRepository()
+tts_files = TTSFileRepository()
+coding_submissions = CodingSubmissionRepository()
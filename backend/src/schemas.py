@@ -12,6 +12,7 @@ from typing import List, Optional, Dict, Any
 class CandidateResponse(BaseModel):
     id: str
     name: str
+    status: Optional[str] = None
 
 class InterviewSetupRequest(BaseModel):
     candidate_id: str
@@ -27,6 +28,7 @@ class AnswerSubmissionRequest(BaseModel):
     question_index: int
     question: str
     answer: str
+    session_id: Optional[str] = None  # Scopes follow-up counts; defaults to one session per candidate
 
 class AnswerEvaluationResponse(BaseModel):
     score: int
@@ -46,6 +48,15 @@ class InterviewDataRequest(BaseModel):
     candidate_id: str
     interactions: List[Dict[str, Any]]
 
+class InteractionAppendRequest(BaseModel):
+    candidate_id: str
+    interaction: Dict[str, Any]  # One scored turn: question, answer, score, feedback, ...
+    session_id: Optional[str] = None
+    turn_id: Optional[str] = None  # Client-generated; a retried turn with the same id is stored once
+
+class InterviewFinalizeRequest(BaseModel):
+    session_id: Optional[str] = None
+
 class CandidateScoreResponse(BaseModel):
     candidate_id: str
     average_score: float
@@ -136,6 +147,9 @@ class BulkOperationResponse(BaseModel):
     processed_count: int
     failed_count: int
     errors: List[str] = []
+    created_count: int = 0
+    updated_count: int = 0
+    errors_truncated: bool = False  # More failures than fit in `errors`
 
 # =========================
 # CANDIDATE MANAGEMENT MODELS
@@ -155,9 +169,10 @@ class CandidateUpdateRequest(BaseModel):
 
 class CandidateListResponse(BaseModel):
     candidates: List[CandidateResponse]
-    total_count: int
+    total_count: int  # Approximate (estimated_document_count)
     page: int = 1
     page_size: int = 50
+    next_cursor: Optional[str] = None  # Pass as ?cursor= for the next page; None on the last page
 
 # =========================
 # INTERVIEW SESSION MODELS
@@ -239,6 +254,11 @@ class ImportRequest(BaseModel):
     overwrite_existing: bool = False
     validate_only: bool = False
 
+class PregenerationRequest(BaseModel):
+    candidate_ids: List[str] = []  # Empty: every candidate without a template
+    concurrency: Optional[int] = None  # Defaults to PREGEN_CONCURRENCY
+    synthesize_audio: bool = True
+
 # =========================
 # NOTIFICATION MODELS
 # =========================
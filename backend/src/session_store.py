@@ -0,0 +1,119 @@
+# src/session_store.py - Per-Question Interview Session State
+# Small counters (follow-ups asked so far) keyed by (candidate_id, session_id,
+# question_index). The memory backend suits a single worker; the Mongo backend
+# shares state across uvicorn workers and expires it with a TTL index.
+
+import os
+import time
+from datetime import datetime
+
+from pymongo import ReturnDocument
+
+from src.cache import LRUTTLCache
+from src.database import get_async_db
+
+SESSION_STORE_BACKEND = os.getenv("SESSION_STORE_BACKEND", "memory")
+SESSION_TTL_SECONDS = int(os.getenv("SESSION_TTL_SECONDS", str(4 * 3600)))
+SESSION_STORE_MAX_ENTRIES = int(os.getenv("SESSION_STORE_MAX_ENTRIES", "10000"))
+SESSION_STORE_COLLECTION = "session_state"
+DEFAULT_SESSION_ID = "default"
+
+
+def session_key(candidate_id, session_id, question_index):
+    return f"{candidate_id}:{session_id or DEFAULT_SESSION_ID}:{question_index}"
+
+
+class MemorySessionStore:
+    """In-process store: bounded LRU whose entries expire SESSION_TTL_SECONDS after the last write"""
+    backend = "memory"
+
+    def __init__(self, max_entries=SESSION_STORE_MAX_ENTRIES, ttl=SESSION_TTL_SECONDS):
+        self.state = LRUTTLCache(maxsize=max_entries, ttl=ttl)
+
+    async def get(self, key, field, default=0):
+        return (self.state.get(key) or {}).get(field, default)
+
+    async def incr(self, key, field, amount=1):
+        """Increment a counter and return the new value"""
+        entry = dict(self.state.get(key) or {})
+        entry[field] = entry.get(field, 0) + amount
+        self.state.set(key, entry)
+        return entry[field]
+
+    async def delete(self, key):
+        self.state.pop(key)
+
+    def clear(self):
+        self.state.clear()
+
+    def stats(self):
+        return {"backend": self.backend, **self.state.stats()}
+
+
+class MongoSessionStore:
+    """aieta.session_state - shared by all workers; Mongo's TTL monitor evicts idle sessions (src/indexes.py)"""
+    backend = "mongo"
+
+    def __init__(self, ttl=SESSION_TTL_SECONDS):
+        self.ttl = ttl
+        self.operations = 0
+        self.total_ms = 0.0
+
+    @property
+    def collection(self):
+        return get_async_db()[SESSION_STORE_COLLECTION]
+
+    def _record(self, started_at):
+        self.operations += 1
+        self.total_ms += (time.perf_counter() - started_at) * 1000
+
+    async def get(self, key, field, default=0):
+        started_at = time.perf_counter()
+        doc = await self.collection.find_one({"_id": key}, {field: 1})
+        self._record(started_at)
+        return (doc or {}).get(field, default)
+
+    async def incr(self, key, field, amount=1):
+        """Atomic $inc, so concurrent workers never lose an increment"""
+        started_at = time.perf_counter()
+        doc = await self.collection.find_one_and_update(
+            {"_id": key},
+            {"$inc": {field: amount}, "$set": {"updated_at": datetime.utcnow()}},
+            projection={field: 1},
+            upsert=True,
+            return_document=ReturnDocument.AFTER
+        )
+        self._record(started_at)
+        return doc[field]
+
+    async def delete(self, key):
+        started_at = time.perf_counter()
+        await self.collection.delete_one({"_id": key})
+        self._record(started_at)
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {
+            "backend": self.backend,
+            "ttl_seconds": self.ttl,
+            "operations": self.operations,
+            "avg_ms": round(self.total_ms / self.operations, 2) if self.operations else 0.0,
+        }
+
+
+SESSION_STORES = {
+    "memory": MemorySessionStore,
+    "mongo": MongoSessionStore,
+}
+
+
+def create_session_store(name=SESSION_STORE_BACKEND):
+    try:
+        return SESSION_STORES[name]()
+    except KeyError:
+        raise ValueError(f"Unknown SESSION_STORE_BACKEND '{name}', expected one of {sorted(SESSION_STORES)}")
+
+
+session_store = create_session_store()
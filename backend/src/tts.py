@@ -0,0 +1,431 @@
+# src/tts.py - Text-to-Speech Synthesis and Caching
+# Synthesis goes through a pluggable backend (gTTS over the network, or a local
+# espeak-ng engine) chosen by TTS_BACKEND. Results are content-addressed by
+# (backend, text, language, slow) and kept in the tts_files GridFS bucket, with a
+# byte-bounded in-memory hot tier in front, so the greeting and question strings
+# every candidate hears are only ever synthesized once. Audio synthesized on
+# demand (follow-ups, arbitrary /tts text) is flagged runtime and swept after
+# TTS_RUNTIME_TTL_SECONDS; files the pre-synthesis pipeline owns are kept.
+
+import os
+import io
+import abc
+import re
+import json
+import time
+import shutil
+import asyncio
+import hashlib
+import logging
+import threading
+import subprocess
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+from starlette.concurrency import iterate_in_threadpool
+
+from src.cache import LRUTTLCache
+from src import repository
+
+logger = logging.getLogger(__name__)
+
+TTS_BACKEND = os.getenv("TTS_BACKEND", "gtts")
+TTS_CACHE_MAX_ENTRIES = int(os.getenv("TTS_CACHE_MAX_ENTRIES", "512"))
+TTS_CACHE_MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+TTS_BUCKET = "tts_files"
+TTS_STREAM_CHUNK_SIZE = 32 * 1024
+TTS_SEGMENT_MAX_CHARS = int(os.getenv("TTS_SEGMENT_MAX_CHARS", "200"))
+TTS_SYNTH_WORKERS = int(os.getenv("TTS_SYNTH_WORKERS", "8"))
+TTS_RUNTIME_TTL_SECONDS = int(os.getenv("TTS_RUNTIME_TTL_SECONDS", str(7 * 24 * 3600)))
+TTS_RUNTIME_SWEEP_SECONDS = int(os.getenv("TTS_RUNTIME_SWEEP_SECONDS", "3600"))
+
+# =========================
+# SYNTHESIS BACKENDS
+# =========================
+
+class TTSBackend(abc.ABC):
+    """Base class: subclasses implement _synthesize(text, language, slow) -> bytes"""
+    name = "base"
+    media_type = "audio/mpeg"
+    format = "mp3"
+    concatenable = True  # Segments can be joined byte-wise (true for MP3 frames)
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    @property
+    def cache_namespace(self):
+        """Part of the cache key: audio from different engines/voices must not be mixed"""
+        return self.name
+
+    def _record(self, started_at, failed=False):
+        elapsed_ms = (time.perf_counter() - started_at) * 1000
+        with self._lock:
+            self.calls += 1
+            self.errors += int(failed)
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def synthesize(self, text, language="en", slow=False):
+        """Return the complete audio for `text` (blocking; run off the event loop)"""
+        started_at = time.perf_counter()
+        try:
+            audio = self._synthesize(text, language, slow)
+        except Exception:
+            self._record(started_at, failed=True)
+            raise
+        self._record(started_at)
+        return audio
+
+    def iter_segments(self, text, language="en", slow=False):
+        """Yield audio as it becomes available; the default yields it all at once"""
+        yield self.synthesize(text, language, slow)
+
+    @abc.abstractmethod
+    def _synthesize(self, text, language, slow):
+        """Return the complete audio for `text`; called by synthesize() with timing"""
+
+    def stats(self):
+        with self._lock:
+            return {
+                "backend": self.name,
+                "format": self.format,
+                "calls": self.calls,
+                "errors": self.errors,
+                "avg_ms": round(self.total_ms / self.calls, 2) if self.calls else 0.0,
+                "max_ms": round(self.max_ms, 2),
+            }
+
+
+class GTTSBackend(TTSBackend):
+    """Google Translate TTS over HTTPS (needs outbound network)"""
+    name = "gtts"
+
+    def _synthesize(self, text, language, slow):
+        from gtts import gTTS
+        tts = gTTS(text=text, lang=language, slow=slow)
+        mp3_buffer = io.BytesIO()
+        tts.write_to_fp(mp3_buffer)
+        return mp3_buffer.getvalue()
+
+
+class EspeakBackend(TTSBackend):
+    """
+    Local CPU-only synthesis with espeak-ng (or espeak): no network, predictable
+    latency. Produces WAV; set TTS_ESPEAK_VOICE / TTS_ESPEAK_SPEED to tune.
+    """
+    name = "espeak"
+    media_type = "audio/wav"
+    format = "wav"
+    concatenable = False  # Every WAV output carries its own header
+
+    def __init__(self, binary=None, voice=None, speed=None):
+        super().__init__()
+        self.binary = binary or os.getenv("TTS_ESPEAK_BINARY") or shutil.which("espeak-ng") or shutil.which("espeak")
+        if not self.binary:
+            raise RuntimeError("TTS_BACKEND=espeak but neither espeak-ng nor espeak is installed")
+        self.voice = voice or os.getenv("TTS_ESPEAK_VOICE")
+        self.speed = int(speed or os.getenv("TTS_ESPEAK_SPEED", "165"))
+
+    @property
+    def cache_namespace(self):
+        return f"{self.name}:{self.voice or 'lang'}:{self.speed}"
+
+    def _synthesize(self, text, language, slow):
+        speed = int(self.speed * 0.7) if slow else self.speed
+        # Text goes in on stdin so it can never be parsed as an option
+        result = subprocess.run(
+            [self.binary, "--stdout", "-v", self.voice or language, "-s", str(speed)],
+            input=text.encode("utf-8"),
+            capture_output=True,
+            timeout=30,
+            check=True
+        )
+        return result.stdout
+
+
+TTS_BACKENDS = {
+    "gtts": GTTSBackend,
+    "espeak": EspeakBackend,
+}
+
+
+def create_tts_backend(name=TTS_BACKEND):
+    """Instantiate the configured TTS backend"""
+    try:
+        return TTS_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown TTS_BACKEND '{name}', expected one of {sorted(TTS_BACKENDS)}")
+
+
+def tts_cache_key(text, language="en", slow=False, namespace="gtts"):
+    """sha256 of the exact synthesis inputs; used as the GridFS filename"""
+    if namespace == "gtts":
+        # Keep pre-existing gTTS cache entries valid
+        payload = json.dumps([text, language, bool(slow)], ensure_ascii=False)
+    else:
+        payload = json.dumps([namespace, text, language, bool(slow)], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def split_segments(text, max_chars=TTS_SEGMENT_MAX_CHARS):
+    """
+    Split text at sentence boundaries into segments of at most ~max_chars,
+    packing short sentences together so each segment is worth a request.
+    """
+    sentences = [s for s in re.split(r"(?<=[.!?;:])\s+|\n+", text.strip()) if s.strip()]
+    segments, current = [], ""
+    for sentence in sentences:
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            segments.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+    if current:
+        segments.append(current)
+    return segments or [text]
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_tts_executor():
+    """Bounded thread pool shared by all TTS synthesis, created on first use"""
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=TTS_SYNTH_WORKERS, thread_name_prefix="tts")
+    return _executor
+
+
+async def iter_chunks(data, chunk_size=TTS_STREAM_CHUNK_SIZE):
+    """Async iterator over in-memory audio in fixed-size chunks"""
+    for start in range(0, len(data), chunk_size):
+        yield data[start:start + chunk_size]
+
+# =========================
+# CACHE
+# =========================
+
+class TTSCache:
+    """Memory hot tier -> tts_files GridFS bucket -> configured TTS backend"""
+
+    def __init__(self, max_entries=TTS_CACHE_MAX_ENTRIES, max_bytes=TTS_CACHE_MAX_BYTES, backend=None):
+        self._backend = backend
+        self.memory = LRUTTLCache(maxsize=max_entries, max_weight=max_bytes, weigher=len)
+        self._pending = {}  # key -> Future, so concurrent misses synthesize once
+        self.gridfs_hits = 0
+        self.synthesized = 0
+        self.segments = 0
+        self.errors = 0
+        self.swept = 0
+        self._last_sweep = None  # monotonic time of the last runtime sweep
+        self._sweep_task = None
+
+    @property
+    def backend(self):
+        """The synthesis backend, created on first use"""
+        if self._backend is None:
+            self._backend = create_tts_backend()
+        return self._backend
+
+    def _key(self, text, language, slow):
+        return tts_cache_key(text, language, slow, self.backend.cache_namespace)
+
+    def _metadata(self, text, language, slow, runtime=True):
+        return {
+            "text": text, "language": language, "slow": bool(slow),
+            "backend": self.backend.name, "content_type": self.backend.media_type,
+            "runtime": runtime
+        }
+
+    def _segment_futures(self, text, language, slow):
+        """Submit every sentence segment to the TTS pool; futures come back in text order"""
+        loop = asyncio.get_running_loop()
+        segments = split_segments(text) if self.backend.concatenable else [text]
+        self.segments += len(segments)
+        return [
+            loop.run_in_executor(get_tts_executor(), self.backend.synthesize, segment, language, slow)
+            for segment in segments
+        ]
+
+    async def synthesize(self, text, language="en", slow=False):
+        """
+        Synthesize off the event loop. Long texts are split at sentence boundaries
+        and the segments fetched in parallel, so a long greeting takes about as
+        long as its slowest sentence; the MP3 frames are joined in order.
+        """
+        futures = self._segment_futures(text, language, slow)
+        try:
+            return b"".join(await asyncio.gather(*futures))
+        except BaseException:
+            for future in futures:
+                future.cancel()
+            raise
+
+    async def get_or_synthesize(self, text, language="en", slow=False):
+        """Return (audio_bytes, source) where source says which tier answered"""
+        key = self._key(text, language, slow)
+
+        pending = self._pending.get(key)
+        if pending is not None:
+            return await asyncio.shield(pending), "memory_cache"
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[key] = future
+        try:
+            audio, source = await self._load_or_synthesize(key, text, language, slow)
+            future.set_result(audio)
+            return audio, source
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            future.exception()  # Mark retrieved; waiters still see it
+            raise
+        finally:
+            del self._pending[key]
+
+    async def lookup(self, key):
+        """Return (audio_bytes, source) from memory or GridFS, or None on a miss"""
+        audio = self.memory.get(key)
+        if audio is not None:
+            return audio, "memory_cache"
+        try:
+            found = await repository.tts_files.find_by_name(key, TTS_BUCKET)
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"TTS cache lookup failed: {e}")
+            return None
+        if found is None:
+            return None
+        self.gridfs_hits += 1
+        self.memory.set(key, found[1])
+        return found[1], "gridfs_cache"
+
+    async def store(self, key, text, language, slow, audio):
+        """Write freshly synthesized audio to both tiers (GridFS copy expires as runtime audio)"""
+        self.memory.set(key, audio)
+        try:
+            await repository.tts_files.upload(
+                key, audio,
+                metadata=self._metadata(text, language, slow),
+                bucket_name=TTS_BUCKET
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"TTS cache store failed: {e}")
+        self._maybe_sweep()
+
+    def _maybe_sweep(self):
+        """Start a background runtime sweep at most every TTS_RUNTIME_SWEEP_SECONDS"""
+        now = time.monotonic()
+        if self._last_sweep is not None and now - self._last_sweep < TTS_RUNTIME_SWEEP_SECONDS:
+            return
+        if self._sweep_task is not None and not self._sweep_task.done():
+            return
+        self._last_sweep = now
+        self._sweep_task = asyncio.create_task(self.sweep_runtime())
+
+    async def sweep_runtime(self, ttl=TTS_RUNTIME_TTL_SECONDS):
+        """Delete runtime-generated audio older than `ttl` from GridFS; returns the count"""
+        try:
+            deleted = await repository.tts_files.delete_runtime_before(
+                datetime.utcnow() - timedelta(seconds=ttl), TTS_BUCKET
+            )
+        except Exception as e:
+            self.errors += 1
+            logger.warning(f"TTS runtime sweep failed: {e}")
+            return 0
+        self.swept += deleted
+        if deleted:
+            logger.info(f"🧹 Swept {deleted} expired runtime TTS file(s)")
+        return deleted
+
+    async def _load_or_synthesize(self, key, text, language, slow):
+        found = await self.lookup(key)
+        if found is not None:
+            return found
+
+        audio = await self.synthesize(text, language, slow)
+        self.synthesized += 1
+        await self.store(key, text, language, slow, audio)
+        return audio, "runtime_generated"
+
+    async def ensure_stored(self, text, language="en", slow=False):
+        """
+        Make sure the audio exists in the tts_files bucket and return its file id.
+        Synthesis runs on the TTS pool; used by the background pre-synthesis pipeline.
+        The file is pipeline-owned: never swept, even if it started as runtime audio.
+        """
+        key = self._key(text, language, slow)
+        file_id = await repository.tts_files.find_id_by_name(key, TTS_BUCKET)
+        if file_id is not None:
+            self.gridfs_hits += 1
+            await repository.tts_files.keep(file_id, TTS_BUCKET)
+            return file_id
+
+        audio = await self.synthesize(text, language, slow)
+        self.synthesized += 1
+        self.memory.set(key, audio)
+        return await repository.tts_files.upload(
+            key, audio,
+            metadata=self._metadata(text, language, slow, runtime=False),
+            bucket_name=TTS_BUCKET
+        )
+
+    async def open_stream(self, text, language="en", slow=False):
+        """
+        Return (source, async iterator of audio bytes). Cached audio is replayed in
+        chunks; otherwise all sentence segments are synthesized in parallel and
+        yielded in order as each becomes ready, and the joined result is cached
+        once the stream completes.
+        """
+        key = self._key(text, language, slow)
+        found = await self.lookup(key)
+        if found is not None:
+            audio, source = found
+            return source, iter_chunks(audio)
+        return "runtime_generated", self._synthesize_stream(key, text, language, slow)
+
+    async def _synthesize_stream(self, key, text, language, slow):
+        segments = []
+        if self.backend.concatenable:
+            futures = self._segment_futures(text, language, slow)
+            try:
+                for future in futures:
+                    segment = await future
+                    segments.append(segment)
+                    yield segment
+            finally:
+                for future in futures:
+                    future.cancel()  # Client went away: drop segments not yet started
+        else:
+            async for segment in iterate_in_threadpool(self.backend.iter_segments(text, language, slow)):
+                segments.append(segment)
+                yield segment
+        self.synthesized += 1
+        await self.store(key, text, language, slow, b"".join(segments))
+
+    def stats(self):
+        return {
+            "memory": self.memory.stats(),
+            "gridfs_hits": self.gridfs_hits,
+            "synthesized": self.synthesized,
+            "segments": self.segments,
+            "synth_workers": TTS_SYNTH_WORKERS,
+            "runtime_ttl_seconds": TTS_RUNTIME_TTL_SECONDS,
+            "swept": self.swept,
+            "errors": self.errors,
+            "backend": self.backend.stats(),
+        }
+
+
+tts_cache = TTSCache()
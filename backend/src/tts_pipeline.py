@@ -0,0 +1,153 @@
+# src/tts_pipeline.py - Background TTS Pre-Synthesis
+# As soon as a candidate's greeting and questions are stored, synthesize all of
+# them into the tts_files bucket and patch the audio ids into test_preprocessing,
+# so /tts/speak/{candidate_id}/{question_number} is ready before the interview.
+
+import os
+import asyncio
+import logging
+from datetime import datetime
+
+from src import repository
+from src.tts import tts_cache
+
+logger = logging.getLogger(__name__)
+
+TTS_PIPELINE_CONCURRENCY = int(os.getenv("TTS_PIPELINE_CONCURRENCY", "4"))
+TTS_PIPELINE_RETRIES = int(os.getenv("TTS_PIPELINE_RETRIES", "3"))
+TTS_PIPELINE_RETRY_DELAY_SECONDS = float(os.getenv("TTS_PIPELINE_RETRY_DELAY_SECONDS", "1.0"))
+TTS_PIPELINE_STATUS_HISTORY = 1000  # Finished job statuses kept in memory
+
+
+class TTSPipeline:
+    """One background job per candidate; a shared semaphore bounds concurrent syntheses"""
+
+    def __init__(self, concurrency=TTS_PIPELINE_CONCURRENCY, retries=TTS_PIPELINE_RETRIES,
+                 retry_delay=TTS_PIPELINE_RETRY_DELAY_SECONDS):
+        self.concurrency = concurrency
+        self.retries = retries
+        self.retry_delay = retry_delay
+        self._semaphore = asyncio.Semaphore(concurrency)
+        self._tasks = {}   # candidate_id -> asyncio.Task
+        self._status = {}  # candidate_id -> progress dict
+
+    def submit(self, candidate_id):
+        """Schedule (or restart, if the questions changed mid-run) pre-synthesis for a candidate"""
+        candidate_id = str(candidate_id)
+        running = self._tasks.get(candidate_id)
+        if running and not running.done():
+            running.cancel()
+
+        self._status.pop(candidate_id, None)
+        self._status[candidate_id] = {
+            "state": "pending", "total": 0, "done": 0, "failed": 0,
+            "submitted_at": datetime.utcnow().isoformat()
+        }
+        excess = len(self._status) - TTS_PIPELINE_STATUS_HISTORY
+        if excess > 0:
+            # Oldest finished statuses go first; jobs still queued or running are skipped, not waited on
+            finished = [c for c in self._status if c not in self._tasks and c != candidate_id]
+            for stale in finished[:excess]:
+                del self._status[stale]
+        task = asyncio.create_task(self._run(candidate_id))
+        self._tasks[candidate_id] = task
+        task.add_done_callback(lambda finished: self._forget(candidate_id, finished))
+        return self._status[candidate_id]
+
+    def _forget(self, candidate_id, task):
+        if self._tasks.get(candidate_id) is task:
+            del self._tasks[candidate_id]
+
+    async def status(self, candidate_id):
+        """Live progress if a job ran in this process, else the last status saved on the document"""
+        candidate_id = str(candidate_id)
+        if candidate_id in self._status:
+            return self._status[candidate_id]
+        doc = await repository.preprocessing.get(candidate_id, {"tts_status": 1})
+        return (doc or {}).get("tts_status")
+
+    async def _synthesize(self, text):
+        """Store one phrase, retrying with exponential backoff"""
+        for attempt in range(1, self.retries + 1):
+            try:
+                async with self._semaphore:
+                    return await tts_cache.ensure_stored(text)
+            except Exception as e:
+                if attempt == self.retries:
+                    raise
+                logger.warning(f"TTS pre-synthesis attempt {attempt} failed, retrying: {e}")
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    async def _run(self, candidate_id):
+        status = self._status[candidate_id]
+        try:
+            doc = await repository.preprocessing.get(candidate_id, {"greetings_text": 1, "questions": 1})
+            if not doc:
+                status.update(state="failed", error="No preprocessing document")
+                return
+
+            greeting = doc.get("greetings_text") or ""
+            questions = [
+                (q["question_number"], q["text"]) for q in doc.get("questions", [])
+                if isinstance(q, dict) and q.get("text") and q.get("question_number") is not None
+            ]
+            status.update(state="running", total=len(questions) + (1 if greeting.strip() else 0))
+            await repository.preprocessing.set_tts_status(candidate_id, dict(status))
+
+            async def synthesize_item(question_number, text):
+                try:
+                    audio_id = await self._synthesize(text)
+                    status["done"] += 1
+                    return question_number, text, audio_id
+                except Exception as e:
+                    status["failed"] += 1
+                    logger.error(f"TTS pre-synthesis failed for {candidate_id} #{question_number}: {e}")
+                    return question_number, text, None
+
+            items = ([(0, greeting)] if greeting.strip() else []) + questions
+            results = await asyncio.gather(*(synthesize_item(n, text) for n, text in items))
+
+            greeting_audio_id = next((audio_id for n, _, audio_id in results if n == 0 and audio_id), None)
+            question_audio = {n: (text, audio_id) for n, text, audio_id in results if n != 0 and audio_id}
+            await repository.preprocessing.set_audio_ids(candidate_id, greeting_audio_id, question_audio)
+
+            status.update(
+                state="completed" if not status["failed"] else "failed",
+                finished_at=datetime.utcnow().isoformat()
+            )
+            logger.info(f"🎙️ TTS pre-synthesis for {candidate_id}: {status['done']}/{status['total']} ready")
+        except asyncio.CancelledError:
+            status.update(state="cancelled")
+            raise
+        except Exception as e:
+            status.update(state="failed", error=str(e))
+            logger.error(f"TTS pre-synthesis error for {candidate_id}: {e}")
+        finally:
+            if status["state"] != "cancelled":
+                try:
+                    await repository.preprocessing.set_tts_status(candidate_id, dict(status))
+                except Exception as e:
+                    logger.warning(f"Could not save TTS status for {candidate_id}: {e}")
+
+    async def join(self):
+        """Wait for every outstanding job (e.g. before a batch CLI exits)"""
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def shutdown(self):
+        """Cancel outstanding jobs; they are resubmitted the next time questions are stored"""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self):
+        states = [s["state"] for s in self._status.values()]
+        return {
+            "concurrency": self.concurrency,
+            "active_jobs": len(self._tasks),
+            **{state: states.count(state) for state in ("pending", "running", "completed", "failed", "cancelled")}
+        }
+
+
+tts_pipeline = TTSPipeline()
@@ -0,0 +1,222 @@
+# tests/conftest.py - Shared fixtures: an in-memory stand-in for the async Mongo database
+# Supports the query and update operators the repositories use on their hot
+# paths (equality, $ne, $in, $push, $inc, $set, $setOnInsert, upserts and unique
+# keys). Anything else raises NotImplementedError instead of silently passing.
+# aggregate() always fails the way a server without the needed index does, so
+# $merge callers take their fallback path.
+
+import copy
+from types import SimpleNamespace
+
+import pytest
+from bson import ObjectId
+from pymongo.errors import DuplicateKeyError, OperationFailure
+
+
+def _values(doc, path):
+    """Every value at a dotted path, descending into arrays the way Mongo does"""
+    values = [doc]
+    for part in path.split("."):
+        found = []
+        for value in values:
+            if isinstance(value, list):
+                found.extend(item[part] for item in value if isinstance(item, dict) and part in item)
+            elif isinstance(value, dict) and part in value:
+                found.append(value[part])
+        values = found
+    # An array also matches on each of its elements
+    return values + [item for value in values if isinstance(value, list) for item in value]
+
+
+def matches(doc, query):
+    for path, condition in query.items():
+        values = _values(doc, path)
+        if isinstance(condition, dict) and any(key.startswith("$") for key in condition):
+            for op, operand in condition.items():
+                if op == "$ne":
+                    ok = operand not in values and not (operand is None and not values)
+                elif op == "$in":
+                    ok = any(value in operand for value in values) or (None in operand and not values)
+                elif op == "$gt":
+                    ok = any(value > operand for value in values if value is not None)
+                else:
+                    raise NotImplementedError(op)
+                if not ok:
+                    return False
+        elif condition is None:
+            if values and None not in values:
+                return False
+        elif condition not in values:
+            return False
+    return True
+
+
+def _set_path(doc, path, value):
+    *parents, last = path.split(".")
+    for part in parents:
+        doc = doc.setdefault(part, {})
+    doc[last] = value
+
+
+def _get_path(doc, path, default=None):
+    for part in path.split("."):
+        if not isinstance(doc, dict) or part not in doc:
+            return default
+        doc = doc[part]
+    return doc
+
+
+def _include_path(source, target, parts):
+    """Copy one dotted inclusion from source into target, through arrays of documents"""
+    head, rest = parts[0], parts[1:]
+    if not isinstance(source, dict) or head not in source:
+        return
+    value = source[head]
+    if not rest:
+        target[head] = value
+    elif isinstance(value, list):
+        existing = target.setdefault(head, [{} for item in value if isinstance(item, dict)])
+        for item, projected in zip([item for item in value if isinstance(item, dict)], existing):
+            _include_path(item, projected, rest)
+    elif isinstance(value, dict):
+        _include_path(value, target.setdefault(head, {}), rest)
+
+
+def apply_update(doc, update, inserting=False):
+    if isinstance(update, list):
+        raise NotImplementedError("pipeline updates")
+    for op, fields in update.items():
+        if op == "$setOnInsert" and not inserting:
+            continue
+        for path, value in fields.items():
+            if op in ("$set", "$setOnInsert"):
+                _set_path(doc, path, copy.deepcopy(value))
+            elif op == "$inc":
+                _set_path(doc, path, _get_path(doc, path, 0) + value)
+            elif op == "$push":
+                current = _get_path(doc, path)
+                if current is None:
+                    _set_path(doc, path, current := [])
+                current.append(copy.deepcopy(value))
+            else:
+                raise NotImplementedError(op)
+
+
+class FakeCollection:
+    """Just enough of AsyncCollection for the repository code under test"""
+
+    def __init__(self, unique=None):
+        self.docs = []
+        self.unique = unique  # Field names that together must be unique, like a unique index
+        self.calls = []
+
+    def _check_unique(self, doc, ignore=None):
+        if self.unique and any(
+            other is not ignore and all(_get_path(other, f) == _get_path(doc, f) for f in self.unique)
+            for other in self.docs
+        ):
+            raise DuplicateKeyError(f"E11000 duplicate key: {self.unique}")
+
+    def _project(self, doc, projection):
+        doc = copy.deepcopy(doc)
+        if not projection:
+            return doc
+        include = [k for k, v in projection.items() if v and k != "_id"]
+        if include:
+            projected = {"_id": doc["_id"]} if "_id" in doc else {}
+            for path in include:
+                _include_path(doc, projected, path.split("."))
+            doc = projected
+        for key, value in projection.items():
+            if not value:
+                doc.pop(key, None)
+        return doc
+
+    async def find_one(self, query=None, projection=None, sort=None):
+        self.calls.append("find_one")
+        found = [doc for doc in self.docs if matches(doc, query or {})]
+        for key, direction in reversed(sort or []):
+            found.sort(key=lambda doc: _get_path(doc, key), reverse=direction < 0)
+        return self._project(found[0], projection) if found else None
+
+    async def insert_one(self, doc):
+        self.calls.append("insert_one")
+        doc = {"_id": ObjectId(), **copy.deepcopy(doc)}
+        self._check_unique(doc)
+        self.docs.append(doc)
+        return SimpleNamespace(inserted_id=doc["_id"])
+
+    def _update(self, query, update, upsert):
+        """(matched document or None, upserted document or None)"""
+        for doc in self.docs:
+            if matches(doc, query):
+                updated = copy.deepcopy(doc)
+                apply_update(updated, update)
+                self._check_unique(updated, ignore=doc)
+                doc.clear()
+                doc.update(updated)
+                return doc, None
+        if not upsert:
+            return None, None
+        doc = {"_id": ObjectId()}
+        for path, value in query.items():
+            if not (isinstance(value, dict) and any(key.startswith("$") for key in value)):
+                _set_path(doc, path, copy.deepcopy(value))
+        apply_update(doc, update, inserting=True)
+        self._check_unique(doc)
+        self.docs.append(doc)
+        return None, doc
+
+    async def update_one(self, query, update, upsert=False):
+        self.calls.append("update_one")
+        matched, upserted = self._update(query, update, upsert)
+        return SimpleNamespace(
+            matched_count=int(matched is not None),
+            modified_count=int(matched is not None),
+            upserted_id=upserted["_id"] if upserted else None
+        )
+
+    async def find_one_and_update(self, query, update, projection=None, upsert=False, return_document=False):
+        self.calls.append("find_one_and_update")
+        before = next((copy.deepcopy(doc) for doc in self.docs if matches(doc, query)), None)
+        matched, upserted = self._update(query, update, upsert)
+        if return_document:  # ReturnDocument.AFTER
+            after = matched or upserted
+            return self._project(after, projection) if after else None
+        return self._project(before, projection) if before else None
+
+    async def delete_one(self, query):
+        self.calls.append("delete_one")
+        for doc in self.docs:
+            if matches(doc, query):
+                self.docs.remove(doc)
+                return SimpleNamespace(deleted_count=1)
+        return SimpleNamespace(deleted_count=0)
+
+    async def delete_many(self, query):
+        self.calls.append("delete_many")
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if not matches(doc, query)]
+        return SimpleNamespace(deleted_count=before - len(self.docs))
+
+    async def aggregate(self, pipeline):
+        self.calls.append("aggregate")
+        raise OperationFailure("aggregate is not supported by FakeCollection")
+
+
+class FakeDatabase(dict):
+    def __missing__(self, name):
+        self[name] = FakeCollection()
+        return self[name]
+
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    """A FakeDatabase wired in wherever the code under test asks for the async database"""
+    import src.repository
+    import src.session_store
+    import src.evaluation_cache
+    db = FakeDatabase()
+    for module in (src.repository, src.session_store, src.evaluation_cache):
+        monkeypatch.setattr(module, "get_async_db", lambda name=None: db)
+    return db
@@ -0,0 +1,132 @@
+# tests/test_bulk_import.py - Incremental import parsers and record validation
+#
+#   python -m pytest tests
+
+import json
+import asyncio
+
+import pytest
+
+from src.bulk_import import iter_json_records, iter_ndjson_records, validate_record
+
+
+async def _chunks(data, size):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def parse(parser, data, size=None):
+    """All (number, value, error) triples for `data` fed `size` bytes at a time"""
+    data = data.encode("utf-8") if isinstance(data, str) else data
+
+    async def collect():
+        return [record async for record in parser(_chunks(data, size or max(len(data), 1)))]
+
+    return asyncio.run(collect())
+
+
+CHUNK_SIZES = [1, 2, 3, 7, None]
+
+# =========================
+# JSON ARRAYS
+# =========================
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_array_of_objects(size):
+    records = [{"id": str(i), "name": f"Ünïcode {i}", "tags": [1, 2.5, None, True]} for i in range(5)]
+    assert parse(iter_json_records, json.dumps(records, ensure_ascii=False), size) == [
+        (i + 1, record, None) for i, record in enumerate(records)
+    ]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_scalars_split_across_chunks_stay_whole(size):
+    assert parse(iter_json_records, "[1, 23, 456, -7.5e3, true, null]", size) == [
+        (1, 1, None), (2, 23, None), (3, 456, None), (4, -7500.0, None), (5, True, None), (6, None, None)
+    ]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_truncated_array_is_an_error(size):
+    # Regression: fed a byte at a time this used to yield 1, 2, 3
+    assert parse(iter_json_records, "[1, 23", size) == [
+        (1, 1, None), (2, 23, None), (3, None, "invalid JSON: unexpected end of input")
+    ]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_single_top_level_object(size):
+    assert parse(iter_json_records, ' {"id": "a"} \n', size) == [(1, {"id": "a"}, None)]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_single_top_level_number_split_across_chunks(size):
+    assert parse(iter_json_records, "12345", size) == [(1, 12345, None)]
+
+
+@pytest.mark.parametrize("text", ["", "   \n", "[]", " [ ] "])
+def test_json_empty_input(text):
+    assert parse(iter_json_records, text) == []
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+@pytest.mark.parametrize("text, valid", [
+    ('[{"id": "a"}] [{"id": "b"}]', 1),
+    ('[{"id": "a"}],', 1),
+    ('{"id": "a"} {"id": "b"}', 1),
+    ("[] x", 0),
+])
+def test_json_trailing_data_is_an_error(text, valid, size):
+    records = parse(iter_json_records, text, size)
+    assert [error for _, _, error in records[:valid]] == [None] * valid
+    assert records[valid:] == [(valid + 1, None, "invalid JSON: unexpected data after the end of the document")]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_json_missing_separator_stops_the_import(size):
+    records = parse(iter_json_records, '[{"id": "a"} {"id": "b"}]', size)
+    assert records == [(1, {"id": "a"}, None), (2, None, "invalid JSON: expected ',' or ']' at record 2")]
+
+
+@pytest.mark.parametrize("text", ["[1,]", '[{"id": }]', "[tru]"])
+def test_json_syntax_error_stops_the_import(text):
+    records = parse(iter_json_records, text, 1)
+    assert records[-1][1] is None and records[-1][2].startswith("invalid JSON")
+    assert all(error is None for _, _, error in records[:-1])
+
+# =========================
+# NDJSON
+# =========================
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_ndjson_lines_and_bad_line(size):
+    text = '{"id": "a"}\n\n{"id": \n"é"\n{"id": "c"}'
+    records = parse(iter_ndjson_records, text, size)
+    assert [(number, value) for number, value, error in records if error is None] == [
+        (1, {"id": "a"}), (3, "é"), (4, {"id": "c"})
+    ]
+    assert [number for number, _, error in records if error] == [2]
+
+# =========================
+# VALIDATION
+# =========================
+
+def test_validate_record_leaves_unset_lists_out():
+    # An overwrite must not $set work_experience/education/skills to []
+    doc = validate_record({"id": " 7 ", "personal_information": {"name": "A"}, "source": "ats"})
+    assert doc == {"id": "7", "personal_information": {"name": "A"}, "source": "ats"}
+
+
+def test_validate_record_keeps_given_lists():
+    doc = validate_record({"id": "7", "personal_information": {}, "skills": ["python"]})
+    assert doc["skills"] == ["python"] and "education" not in doc
+
+
+@pytest.mark.parametrize("record, message", [
+    ([1], "expected an object"),
+    ({"personal_information": {}}, "missing 'id'"),
+    ({"id": "7"}, "personal_information"),
+])
+def test_validate_record_errors(record, message):
+    with pytest.raises(ValueError, match=message):
+        validate_record(record)
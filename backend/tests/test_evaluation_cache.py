@@ -0,0 +1,87 @@
+# tests/test_evaluation_cache.py - Cache key normalization and the two cache tiers
+#
+#   python -m pytest tests
+
+import asyncio
+
+import pytest
+
+from src.evaluation_cache import EvaluationCache, EVAL_CACHE_COLLECTION, evaluation_cache_key, normalize_text
+
+PROMPT = "Score {question} / {answer}"
+MODEL = "llama-3.1-8b-instant"
+
+# =========================
+# CACHE KEYS
+# =========================
+
+@pytest.mark.parametrize("question, answer", [
+    ("What is a cache?", "A fast copy of data."),
+    ("  what IS a   cache? ", "a fast\ncopy of\tdata."),
+    ("WHAT IS A CACHE?", "A FAST COPY OF DATA."),
+])
+def test_key_ignores_case_and_whitespace(question, answer):
+    assert evaluation_cache_key(question, answer, PROMPT, MODEL) == evaluation_cache_key(
+        "What is a cache?", "A fast copy of data.", PROMPT, MODEL
+    )
+
+
+@pytest.mark.parametrize("changed", [
+    ("What is a queue?", "A fast copy of data.", PROMPT, MODEL),
+    ("What is a cache?", "A slow copy of data.", PROMPT, MODEL),
+    ("What is a cache?", "A fast copy of data.", PROMPT + " ", MODEL),
+    ("What is a cache?", "A fast copy of data.", PROMPT, "llama-3.3-70b-versatile"),
+])
+def test_key_changes_with_content_prompt_or_model(changed):
+    assert evaluation_cache_key(*changed) != evaluation_cache_key("What is a cache?", "A fast copy of data.", PROMPT, MODEL)
+
+
+def test_key_keeps_question_and_answer_apart():
+    # Moving a word across the boundary must not produce the same key
+    assert evaluation_cache_key("a b", "c", PROMPT, MODEL) != evaluation_cache_key("a", "b c", PROMPT, MODEL)
+
+
+@pytest.mark.parametrize("text, normalized", [(None, ""), (42, "42"), (" Ünï  CODE ", "ünï code")])
+def test_normalize_text(text, normalized):
+    assert normalize_text(text) == normalized
+
+# =========================
+# TIERS
+# =========================
+
+RESULT = {"evaluation": {"score": 4, "feedback": ["Clear"]}}
+
+
+def test_memory_hit_returns_a_copy(fake_db):
+    cache = EvaluationCache(enabled=True)
+
+    async def scenario():
+        await cache.aput("k", RESULT)
+        first = await cache.aget("k")
+        first["evaluation"]["score"] = 0
+        return await cache.aget("k")
+
+    assert asyncio.run(scenario()) == RESULT
+
+
+def test_mongo_tier_refills_memory(fake_db):
+    writer, reader = EvaluationCache(enabled=True), EvaluationCache(enabled=True)
+
+    async def scenario():
+        await writer.aput("k", RESULT)
+        return await reader.aget("k"), await reader.aget("k")
+
+    assert asyncio.run(scenario()) == (RESULT, RESULT)
+    assert reader.mongo_hits == 1  # Second read came from memory
+    assert fake_db[EVAL_CACHE_COLLECTION].docs[0]["_id"] == "k"
+
+
+def test_disabled_cache_stores_nothing(fake_db):
+    cache = EvaluationCache(enabled=False)
+
+    async def scenario():
+        await cache.aput("k", RESULT)
+        return await cache.aget("k")
+
+    assert asyncio.run(scenario()) is None
+    assert not fake_db[EVAL_CACHE_COLLECTION].docs
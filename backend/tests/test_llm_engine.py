@@ -0,0 +1,174 @@
+# tests/test_llm_engine.py - Coalescing, the concurrency bound and speculative follow-ups
+# The LangChain chains are replaced by fakes; no Groq call is made.
+#
+#   python -m pytest tests
+
+import asyncio
+
+import pytest
+
+import src.llm_engine as llm_engine_module
+from src.llm_engine import LLMEngine, FOLLOW_UP_SCORE_THRESHOLD
+from src.evaluation_cache import EvaluationCache
+from src.rate_limiter import RateLimiter, RateLimitTimeout, INTERACTIVE
+
+
+class FakeChain:
+    """Stands in for prompt | llm | parser; records calls and in-flight peaks"""
+
+    def __init__(self, result, delay=0.02):
+        self.result = result
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.peak = 0
+
+    async def ainvoke(self, inputs):
+        self.calls += 1
+        self.in_flight += 1
+        self.peak = max(self.peak, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            if isinstance(self.result, Exception):
+                raise self.result
+            return self.result(inputs) if callable(self.result) else self.result
+        finally:
+            self.in_flight -= 1
+
+
+def evaluation(score):
+    return {"evaluation": {"score": score, "feedback": ["noted"]}}
+
+
+@pytest.fixture
+def chains(monkeypatch, fake_db):
+    """Fake evaluation/follow-up chains and a fresh evaluation cache for each test"""
+    fakes = {"evaluation": FakeChain(evaluation(5)), "follow_up": FakeChain("Why?")}
+    monkeypatch.setattr(llm_engine_module, "get_evaluation_chain", lambda prompt: fakes["evaluation"])
+    monkeypatch.setattr(llm_engine_module, "get_follow_up_chain", lambda prompt: fakes["follow_up"])
+    monkeypatch.setattr(llm_engine_module, "evaluation_cache", EvaluationCache(enabled=True))
+    return fakes
+
+
+def idle_limiter():
+    return RateLimiter(rpm=6000, tpm=10_000_000, headroom=1, workers=1, enabled=True)
+
+# =========================
+# EVALUATION
+# =========================
+
+def test_identical_concurrent_evaluations_share_one_call(chains):
+    engine = LLMEngine()
+
+    async def scenario():
+        return await asyncio.gather(*(engine.evaluate_answer("Q", "A") for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert results == [evaluation(5)] * 5
+    assert chains["evaluation"].calls == 1
+    results[0]["evaluation"]["score"] = 0  # Callers get independent copies
+    assert results[1] == evaluation(5)
+
+
+def test_second_evaluation_is_served_from_the_cache(chains):
+    engine = LLMEngine()
+
+    async def scenario():
+        await engine.evaluate_answer("Q", "A")
+        return await engine.evaluate_answer("  q ", "a")
+
+    assert asyncio.run(scenario()) == evaluation(5)
+    assert chains["evaluation"].calls == 1
+
+
+def test_concurrency_is_bounded_by_the_semaphore(chains):
+    engine = LLMEngine(max_concurrency=2)
+
+    async def scenario():
+        await asyncio.gather(*(engine.evaluate_answer(f"Q{i}", "A") for i in range(6)))
+
+    asyncio.run(scenario())
+    assert chains["evaluation"].calls == 6
+    assert chains["evaluation"].peak == 2
+    assert engine.stats()["in_flight"] == 0 and engine.stats()["queued"] == 0
+
+
+@pytest.mark.parametrize("result", [ValueError("boom"), {"evaluation": {"score": "high"}}, {"score": 3}])
+def test_failed_or_malformed_evaluation_falls_back_and_is_not_cached(chains, result):
+    chains["evaluation"].result = result
+    engine = LLMEngine()
+
+    async def scenario():
+        first = await engine.evaluate_answer("Q", "A")
+        chains["evaluation"].result = evaluation(3)
+        return first, await engine.evaluate_answer("Q", "A")
+
+    first, second = asyncio.run(scenario())
+    assert first["evaluation"]["score"] == 0
+    assert second == evaluation(3)
+    assert engine.stats()["errors"] == 1
+
+
+def test_rate_limit_timeout_reaches_every_coalesced_caller(chains):
+    chains["evaluation"].result = RateLimitTimeout(INTERACTIVE, 20)
+    engine = LLMEngine()
+
+    async def scenario():
+        return await asyncio.gather(*(engine.evaluate_answer("Q", "A") for _ in range(3)), return_exceptions=True)
+
+    assert all(isinstance(result, RateLimitTimeout) for result in asyncio.run(scenario()))
+    assert chains["evaluation"].calls == 1
+    assert engine.stats()["rate_limited"] == 1 and engine.stats()["errors"] == 0
+
+# =========================
+# FOLLOW-UPS
+# =========================
+
+def test_low_score_gets_a_follow_up(chains):
+    chains["evaluation"].result = evaluation(FOLLOW_UP_SCORE_THRESHOLD - 1)
+    result = asyncio.run(LLMEngine(speculative=False).evaluate_with_follow_up("Q", "A"))
+    assert result == (evaluation(FOLLOW_UP_SCORE_THRESHOLD - 1), "Why?")
+
+
+def test_no_follow_up_when_not_allowed(chains):
+    chains["evaluation"].result = evaluation(1)
+    result = asyncio.run(LLMEngine(speculative=True).evaluate_with_follow_up("Q", "A", allow_follow_up=False))
+    assert result == (evaluation(1), None)
+    assert chains["follow_up"].calls == 0
+
+
+def test_speculative_follow_up_is_cancelled_for_a_good_answer(chains):
+    chains["follow_up"].delay = 1
+    engine = LLMEngine(speculative=True, limiter=idle_limiter())
+    assert asyncio.run(engine.evaluate_with_follow_up("Q", "A")) == (evaluation(5), None)
+    assert engine.stats()["speculative_followup"]["cancelled"] == 1
+
+
+def test_cached_evaluation_never_speculates(chains):
+    engine = LLMEngine(speculative=True, limiter=idle_limiter())
+
+    async def scenario():
+        await engine.evaluate_answer("Q", "A")
+        return await engine.evaluate_with_follow_up("Q", "A")
+
+    assert asyncio.run(scenario()) == (evaluation(5), None)
+    assert chains["follow_up"].calls == 0
+    assert engine.stats()["speculative_followup"]["started"] == 0
+
+
+def test_no_speculation_while_live_calls_are_queued(chains):
+    limiter = idle_limiter()
+    engine = LLMEngine(speculative=True, limiter=limiter)
+
+    async def scenario():
+        limiter.requests.tokens = -100  # Nothing can go for a while
+        waiter = asyncio.create_task(limiter.aacquire(1, INTERACTIVE, max_wait=0))
+        await asyncio.sleep(0)
+        try:
+            return await engine.evaluate_with_follow_up("Q", "A")
+        finally:
+            waiter.cancel()
+
+    assert asyncio.run(scenario()) == (evaluation(5), None)
+    assert chains["follow_up"].calls == 0
+    assert engine.stats()["speculative_followup"]["skipped"] == 1
@@ -0,0 +1,147 @@
+# tests/test_rate_limiter.py - Priority ordering, bounded waits and provider feedback
+#
+#   python -m pytest tests
+
+import time
+import asyncio
+
+import pytest
+
+from src.rate_limiter import (
+    RateLimiter,
+    RateLimitTimeout,
+    INTERACTIVE,
+    BACKGROUND,
+    MAX_WAIT_SECONDS,
+)
+
+
+def limiter(rpm=600, tpm=1_000_000, burst_seconds=0.1):
+    """10 requests/s with room for one at a time, so every extra caller queues"""
+    return RateLimiter(rpm=rpm, tpm=tpm, burst_seconds=burst_seconds, headroom=1, workers=1, enabled=True)
+
+# =========================
+# PRIORITY ORDERING
+# =========================
+
+def test_interactive_waiters_go_before_earlier_background_ones():
+    lim = limiter()
+    granted = []
+
+    async def caller(name, priority):
+        await lim.aacquire(1, priority, max_wait=0)
+        granted.append(name)
+
+    async def scenario():
+        await lim.aacquire(1)  # Empties the bucket
+        tasks = []
+        for name, priority in [("bg1", BACKGROUND), ("bg2", BACKGROUND), ("live1", INTERACTIVE), ("live2", INTERACTIVE)]:
+            tasks.append(asyncio.create_task(caller(name, priority)))
+            await asyncio.sleep(0)  # Queue them in this order
+        assert lim.queued(INTERACTIVE) == 2 and lim.queued(BACKGROUND) == 2
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert granted == ["live1", "live2", "bg1", "bg2"]
+    queues = lim.stats()["queues"]
+    assert queues[INTERACTIVE]["granted"] == 3 and queues[BACKGROUND]["granted"] == 2
+
+
+def test_thread_and_loop_waiters_share_one_queue():
+    lim = limiter()
+    granted = []
+
+    async def scenario():
+        await lim.aacquire(1)
+        background = asyncio.create_task(asyncio.to_thread(lambda: (lim.acquire(1, BACKGROUND), granted.append("bg"))))
+        while not lim.queued(BACKGROUND):
+            await asyncio.sleep(0.001)
+        await lim.aacquire(1, INTERACTIVE)
+        granted.append("live")
+        await background
+
+    asyncio.run(scenario())
+    assert granted == ["live", "bg"]
+
+# =========================
+# BOUNDED WAITS
+# =========================
+
+def test_queued_caller_times_out_and_leaves_the_queue():
+    lim = limiter(rpm=60, burst_seconds=1)  # One request per second
+
+    async def scenario():
+        await lim.aacquire(1)
+        started = time.monotonic()
+        with pytest.raises(RateLimitTimeout) as raised:
+            await lim.aacquire(1, INTERACTIVE, max_wait=0.05)
+        return time.monotonic() - started, raised.value
+
+    waited, error = asyncio.run(scenario())
+    assert waited < 0.5  # The known ~1 s refill already overran the deadline
+    assert error.priority == INTERACTIVE and error.retry_after == pytest.approx(1, abs=0.1)
+    assert lim.queued() == 0
+    assert lim.stats()["timed_out"] == 1
+
+
+def test_caller_behind_the_head_times_out_at_its_deadline():
+    lim = limiter(rpm=60, burst_seconds=1)
+
+    async def scenario():
+        await lim.aacquire(1)
+        head = asyncio.create_task(lim.aacquire(1, INTERACTIVE, max_wait=0))
+        await asyncio.sleep(0)
+        started = time.monotonic()
+        with pytest.raises(RateLimitTimeout):
+            await lim.aacquire(1, INTERACTIVE, max_wait=0.2)
+        waited = time.monotonic() - started
+        head.cancel()
+        return waited
+
+    assert 0.15 < asyncio.run(scenario()) < 0.6
+    assert lim.queued() == 0
+
+
+def test_blocking_acquire_times_out_too():
+    lim = limiter(rpm=60, burst_seconds=1)
+    lim.acquire(1)
+    with pytest.raises(RateLimitTimeout):
+        lim.acquire(1, INTERACTIVE, max_wait=0.05)
+
+
+def test_default_max_wait_bounds_only_interactive_calls():
+    assert MAX_WAIT_SECONDS[INTERACTIVE] and MAX_WAIT_SECONDS[BACKGROUND] is None
+
+
+def test_blocking_acquire_is_refused_on_the_event_loop():
+    async def scenario():
+        limiter().acquire(1)
+
+    with pytest.raises(RuntimeError, match="event loop"):
+        asyncio.run(scenario())
+
+# =========================
+# PROVIDER FEEDBACK
+# =========================
+
+def test_settle_refunds_overestimated_tokens():
+    lim = limiter(rpm=600, tpm=600, burst_seconds=10)  # 100 tokens of burst
+    lim.acquire(80)
+    lim.settle(estimated=80, actual=20)
+    assert lim.stats()["tokens_available"] == pytest.approx(80, abs=1)
+    assert lim.stats()["actual_tokens"] == 20
+
+
+def test_rate_limited_response_pauses_the_buckets():
+    lim = limiter(rpm=600, burst_seconds=10)
+    lim.on_rate_limited(retry_after=5)
+    with pytest.raises(RateLimitTimeout) as raised:
+        lim.acquire(1, INTERACTIVE, max_wait=1)
+    assert raised.value.retry_after == pytest.approx(5, abs=0.2)
+    assert lim.stats()["throttled"] == 1
+
+
+def test_disabled_limiter_never_waits():
+    lim = RateLimiter(rpm=1, tpm=1, enabled=False)
+    for _ in range(5):
+        lim.acquire(10_000, max_wait=0.01)
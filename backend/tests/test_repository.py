@@ -0,0 +1,159 @@
+# tests/test_repository.py - Interaction drafts, score summary fallback and question upserts
+# Runs against the in-memory FakeCollection from conftest.py.
+#
+#   python -m pytest tests
+
+import asyncio
+
+import pytest
+
+from conftest import FakeCollection
+from src.repository import interactions, score_summaries, preprocessing
+
+
+@pytest.fixture
+def db(fake_db):
+    # Mirrors the unique index src/indexes.py creates on interaction_drafts
+    fake_db["interaction_drafts"] = FakeCollection(unique=("candidate_id", "session_id"))
+    return fake_db
+
+
+def turn(score, question="Q"):
+    return {"question": question, "answer": "A", "score": score}
+
+
+def append_all(*calls):
+    async def scenario():
+        return [await interactions.append(*call) for call in calls]
+    return asyncio.run(scenario())
+
+# =========================
+# APPEND
+# =========================
+
+def test_first_turn_creates_a_draft_with_totals(db):
+    assert append_all(("c1", "s1", turn(4), "t1"), ("c1", "s1", turn(2), "t2"), ("c1", "s1", turn(None), "t3")) == ["appended"] * 3
+    [draft] = db["interaction_drafts"].docs
+    assert draft["status"] == "in_progress"
+    assert [i["turn_id"] for i in draft["interactions"]] == ["t1", "t2", "t3"]
+    assert draft["scores"] == {"total_score": 6, "scored_interactions": 2}
+    assert draft["metadata"]["total_questions"] == 3
+
+
+def test_repeated_turn_id_is_a_duplicate(db):
+    assert append_all(("c1", "s1", turn(4), "t1"), ("c1", "s1", turn(5), "t1")) == ["appended", "duplicate"]
+    [draft] = db["interaction_drafts"].docs
+    assert len(draft["interactions"]) == 1
+    assert draft["scores"]["total_score"] == 4 and draft["metadata"]["total_questions"] == 1
+
+
+def test_turns_without_turn_id_are_always_appended(db):
+    assert append_all(("c1", "s1", turn(3)), ("c1", "s1", turn(3))) == ["appended", "appended"]
+    [draft] = db["interaction_drafts"].docs
+    assert len(draft["interactions"]) == 2 and "turn_id" not in draft["interactions"][0]
+
+
+def test_append_leaves_the_saved_interview_alone(db):
+    db["interaction"].docs.append({"_id": 1, "candidate_id": "c1", "session_id": "old", "status": "completed", "interactions": [turn(5)]})
+    append_all(("c1", "new", turn(1), "t1"))
+    assert db["interaction"].docs[0]["session_id"] == "old" and len(db["interaction"].docs[0]["interactions"]) == 1
+    assert db["interaction"].calls == [] and db["score_summaries"].calls == []
+    assert db["interaction_drafts"].calls == ["update_one", "update_one"]  # Miss, then the first-turn upsert
+
+
+def test_sessions_get_separate_drafts(db):
+    append_all(("c1", "s1", turn(1), "t1"), ("c1", "s2", turn(2), "t1"))
+    assert sorted(d["session_id"] for d in db["interaction_drafts"].docs) == ["s1", "s2"]
+
+
+def test_concurrent_first_turn_still_appends(db):
+    drafts = db["interaction_drafts"]
+    update_one = drafts.update_one
+
+    async def racing_update_one(query, update, upsert=False):
+        if upsert and not drafts.docs:
+            # Another request creates the draft between our miss and our upsert
+            await drafts.insert_one({"candidate_id": "c1", "session_id": "s1", "interactions": [], "scores": {}, "metadata": {}})
+        return await update_one(query, update, upsert=upsert)
+
+    drafts.update_one = racing_update_one
+    assert append_all(("c1", "s1", turn(4), "t1")) == ["appended"]
+    [draft] = drafts.docs
+    assert [i["turn_id"] for i in draft["interactions"]] == ["t1"]
+    assert draft["scores"]["total_score"] == 4
+
+
+# =========================
+# SAVE AND DELETE
+# =========================
+
+def test_save_replaces_the_sessions_draft(db):
+    append_all(("c1", "s1", turn(4), "t1"), ("c1", "s2", turn(2), "t1"))
+    document = {"candidate_id": "c1", "session_id": "s1", "interactions": [turn(4)], "scores": {"total_score": 4}}
+
+    async def scenario():
+        return await interactions.save("c1", document), await interactions.save("c1", {**document, "status": "completed"})
+
+    (created, first_id), (updated, second_id) = asyncio.run(scenario())
+    assert (created, updated) == ("created", "updated") and first_id == second_id
+    assert [d["session_id"] for d in db["interaction_drafts"].docs] == ["s2"]
+    assert db["interaction"].docs[0]["status"] == "completed"
+
+
+def test_delete_removes_drafts_too(db):
+    append_all(("c1", "s1", turn(4), "t1"), ("c1", "s2", turn(2), "t1"), ("c2", "s1", turn(3), "t1"))
+    db["interaction"].docs.append({"_id": 1, "candidate_id": "c1"})
+    assert asyncio.run(interactions.delete("c1")) == 1
+    assert [d["candidate_id"] for d in db["interaction_drafts"].docs] == ["c2"]
+
+# =========================
+# SCORE SUMMARIES
+# =========================
+
+def test_summary_is_computed_when_merge_fails(db):
+    db["interaction"].docs.append({
+        "_id": 1, "candidate_id": "c1", "session_id": "s1",
+        "scores": {"average_score": 3.5, "total_score": 7, "scored_interactions": 2, "max_possible_score": 10},
+        "metadata": {"total_questions": 3}, "interactions": [turn(3), turn(4), turn(None)]
+    })
+    summary = asyncio.run(score_summaries.refresh("c1"))
+    assert summary == {
+        "candidate_id": "c1", "session_id": "s1", "status": "completed",
+        "average_score": 3.5, "total_score": 7, "scored_interactions": 2,
+        "max_possible_score": 10, "total_questions": 3, "source": "interaction",
+    }
+    assert db["score_summaries"].docs == []  # Computed, not stored
+    assert asyncio.run(score_summaries.refresh("missing")) is None
+
+
+def test_legacy_summary_is_computed_when_merge_fails(db):
+    db["interviews"].docs.append({"_id": 1, "candidate_id": "c1", "interactions": [turn(4), turn(2), turn("n/a"), turn(True)]})
+    summary = asyncio.run(score_summaries.refresh_from_legacy("c1"))
+    assert summary["total_score"] == 6 and summary["scored_interactions"] == 2
+    assert summary["total_questions"] == 4 and summary["average_score"] == 1.5
+    assert summary["source"] == "interviews"
+
+# =========================
+# QUESTIONS
+# =========================
+
+def test_store_questions_upserts_one_document(db):
+    async def scenario():
+        first = await preprocessing.store_questions("c1", ["What is X?", {"text": "And Y?", "kind": "coding"}])
+        second = await preprocessing.store_questions("c1", ["Only Z?"])
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    [doc] = db["test_preprocessing"].docs
+    assert first == second == doc["_id"]
+    assert doc["questions"] == [{"question_number": 1, "text": "Only Z?"}]
+    assert doc["created_at"] <= doc["updated_at"]
+    assert db["test_preprocessing"].calls == ["find_one_and_update", "find_one_and_update"]
+
+
+def test_store_questions_normalizes_shapes(db):
+    asyncio.run(preprocessing.store_questions("c1", ["What is X?", {"text": "And Y?", "kind": "coding"}]))
+    assert db["test_preprocessing"].docs[0]["questions"] == [
+        {"question_number": 1, "text": "What is X?"},
+        {"question_number": 2, "text": "And Y?", "kind": "coding"},
+    ]
@@ -0,0 +1,70 @@
+# tests/test_session_store.py - Both session store backends behave the same
+#
+#   python -m pytest tests
+
+import asyncio
+
+import pytest
+
+from src.session_store import (
+    MemorySessionStore,
+    MongoSessionStore,
+    SESSION_STORE_COLLECTION,
+    create_session_store,
+    session_key,
+)
+
+
+@pytest.fixture(params=["memory", "mongo"])
+def store(request, fake_db):
+    return create_session_store(request.param)
+
+
+def test_incr_get_delete(store):
+    key = session_key("c1", "s1", 0)
+
+    async def scenario():
+        values = [await store.get(key, "follow_ups"), await store.incr(key, "follow_ups"), await store.incr(key, "follow_ups")]
+        values.append(await store.get(key, "follow_ups"))
+        await store.delete(key)
+        values.append(await store.get(key, "follow_ups"))
+        return values
+
+    assert asyncio.run(scenario()) == [0, 1, 2, 2, 0]
+
+
+def test_keys_are_scoped_per_question_and_session(store):
+    async def scenario():
+        await store.incr(session_key("c1", "s1", 0), "follow_ups")
+        return [
+            await store.get(session_key("c1", "s1", 1), "follow_ups"),
+            await store.get(session_key("c1", "s2", 0), "follow_ups"),
+            await store.get(session_key("c2", "s1", 0), "follow_ups"),
+        ]
+
+    assert asyncio.run(scenario()) == [0, 0, 0]
+
+
+def test_missing_session_id_uses_the_default_key():
+    assert session_key("c1", None, 3) == session_key("c1", "default", 3) == "c1:default:3"
+
+
+def test_mongo_store_uses_one_round_trip_per_increment(fake_db):
+    store = MongoSessionStore()
+    asyncio.run(store.incr("k", "follow_ups"))
+    collection = fake_db[SESSION_STORE_COLLECTION]
+    assert collection.calls == ["find_one_and_update"]
+    assert collection.docs[0]["_id"] == "k" and "updated_at" in collection.docs[0]
+    assert store.stats()["operations"] == 1
+
+
+def test_memory_store_clear():
+    store = MemorySessionStore()
+    asyncio.run(store.incr("k", "follow_ups"))
+    store.clear()
+    assert asyncio.run(store.get("k", "follow_ups")) == 0
+
+
+def test_unknown_backend_is_rejected():
+    with pytest.raises(ValueError, match="SESSION_STORE_BACKEND"):
+        create_session_store("redis")
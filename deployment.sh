@@ -349,13 +349,17 @@ module.exports = {
       name: 'ai-interviewer-backend',
       cwd: '/var/www/ai-interviewer/backend',
       script: 'venv/bin/python',
-      args: '-m uvicorn main:app --host 0.0.0.0 --port 8000',
+      // serve.py forks one uvicorn worker per CPU core (override with WEB_CONCURRENCY)
+      args: 'serve.py --host 0.0.0.0 --port 8000',
       instances: 1,
       autorestart: true,
       watch: false,
-      max_memory_restart: '1G',
+      max_memory_restart: '2G',
+      // Give workers time to drain in-flight LLM calls on stop/reload
+      kill_timeout: 35000,
       env: {
-        NODE_ENV: 'production'
+        NODE_ENV: 'production',
+        GRACEFUL_TIMEOUT_SECONDS: '30'
       },
       log_file: '/var/log/ai-interviewer/backend.log',
       out_file: '/var/log/ai-interviewer/backend-out.log',
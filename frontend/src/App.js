@@ -17,6 +17,9 @@ import {
 // =========================
 const CandidateSelection = () => {
   const [candidates, setCandidates] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalCount, setTotalCount] = useState(0);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState(null);
   const [selectedCandidate, setSelectedCandidate] = useState('');
@@ -38,7 +41,9 @@ const CandidateSelection = () => {
     try {
       setLoading(true);
       const data = await apiService.fetchCandidates();
-      setCandidates(data);
+      setCandidates(data.candidates);
+      setNextCursor(data.next_cursor);
+      setTotalCount(data.total_count);
     } catch (error) {
       console.error('Error fetching candidates:', error);
       setError('Failed to load candidates. Please check your connection.');
@@ -47,6 +52,21 @@ const CandidateSelection = () => {
     }
   };
 
+  const loadMoreCandidates = async () => {
+    if (!nextCursor) return;
+    try {
+      setLoadingMore(true);
+      const data = await apiService.fetchCandidates(nextCursor);
+      setCandidates((previous) => [...previous, ...data.candidates]);
+      setNextCursor(data.next_cursor);
+    } catch (error) {
+      console.error('Error fetching more candidates:', error);
+      setError('Failed to load more candidates. Please try again.');
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const checkBrowserSupport = () => {
     const support = BROWSER_SUPPORT.checkSupport();
     if (!support.isSupported) {
@@ -161,7 +181,7 @@ const CandidateSelection = () => {
                   <option value="">Choose a candidate...</option>
                   {candidates.map((candidate) => (
                     <option key={candidate.id} value={candidate.id}>
-                      {candidate.personal_information?.name || candidate.id}
+                      {candidate.name || candidate.id}
                     </option>
                   ))}
                 </select>
@@ -178,6 +198,25 @@ const CandidateSelection = () => {
                   <p style={{ margin: 0, fontSize: '14px' }}>Please add candidates to the database.</p>
                 </div>
               )}
+
+              {nextCursor && (
+                <button
+                  onClick={loadMoreCandidates}
+                  disabled={loadingMore}
+                  style={{
+                    marginTop: '12px',
+                    padding: '10px 16px',
+                    fontSize: '14px',
+                    background: 'white',
+                    color: '#667eea',
+                    border: '2px solid #667eea',
+                    borderRadius: '10px',
+                    cursor: loadingMore ? 'wait' : 'pointer'
+                  }}
+                >
+                  {loadingMore ? 'Loading...' : `Load more candidates (${candidates.length} of ~${totalCount})`}
+                </button>
+              )}
             </div>
 
             {/* Threshold Control */}
@@ -270,7 +270,7 @@ const Interview = ({ candidateId, onComplete, onBack, videoStream: propVideoStre
       const audioData = await apiService.requestTTS(text, candidateId, isQuestion ? 'pre-generated' : 'runtime');
       
       if (audioData && audioData.audio_base64) {
-        const audio = new Audio(`data:audio/mp3;base64,${audioData.audio_base64}`);
+        const audio = new Audio(`data:audio/${audioData.format || 'mp3'};base64,${audioData.audio_base64}`);
         
         audio.onended = () => {
           setIsSpeaking(false);
@@ -48,6 +48,8 @@ const useInterview = () => {
   // Refs for cleanup
   const screenshotInterval = useRef(null);
   const sessionData = useRef({});
+  // Turns not yet confirmed by /interview/interaction: turnId -> { interaction, request }
+  const unsavedTurns = useRef(new Map());
 
   // =========================
   // INITIALIZATION
@@ -56,8 +58,10 @@ const useInterview = () => {
   useEffect(() => {
     // Initialize session data
     if (candidateId) {
-      const newSessionId = sessionId || generateSessionId();
+      // A reload continues the session whose turns are already saved on the server
+      const newSessionId = sessionId || sessionStorage.getItem(sessionStorageKey(candidateId)) || generateSessionId();
       setSessionId(newSessionId);
+      sessionStorage.setItem(sessionStorageKey(candidateId), newSessionId);
       
       sessionData.current = {
         candidateId,
@@ -78,6 +82,8 @@ const useInterview = () => {
     return `session_${Date.now()}_${Math.random().toString(36).substr(2, 9)}`;
   };
 
+  const sessionStorageKey = (candidateId) => `${STORAGE_KEYS.SESSION_ID}:${candidateId}`;
+
   // =========================
   // INTERVIEW SETUP
   // =========================
@@ -226,6 +232,42 @@ const useInterview = () => {
     }
   }, [initializeAudioVideo]);
 
+  // =========================
+  // INCREMENTAL PERSISTENCE
+  // =========================
+
+  const saveTurn = useCallback((turnId, interaction) => {
+    const request = apiService.appendInteraction(candidateId, sessionId, interaction, turnId)
+      .then(() => {
+        unsavedTurns.current.delete(turnId);
+        return true;
+      })
+      .catch(error => {
+        console.warn('Could not save interaction yet:', error);
+        return false;
+      });
+    unsavedTurns.current.set(turnId, { interaction, request });
+    return request;
+  }, [candidateId, sessionId]);
+
+  // Save one finished turn (the same shape complete-and-save stores) as soon as it exists.
+  // It stays in unsavedTurns until the server confirms it, so completion can retry it.
+  const persistInteraction = useCallback((interaction) => {
+    const turnId = `${sessionId || 'default'}:${interaction.question_index}:${interaction.answered_at}`;
+    return saveTurn(turnId, interaction);
+  }, [sessionId, saveTurn]);
+
+  // Wait for in-flight saves and resend failed ones; true once every turn is on the server
+  const flushInteractions = useCallback(async (retries = 2) => {
+    for (let attempt = 0; unsavedTurns.current.size > 0; attempt++) {
+      await Promise.all([...unsavedTurns.current.values()].map(turn => turn.request));
+      if (unsavedTurns.current.size === 0 || attempt >= retries) break;
+      // Same turnId, so a save that did reach the server is not stored twice
+      unsavedTurns.current.forEach(({ interaction }, turnId) => saveTurn(turnId, interaction));
+    }
+    return unsavedTurns.current.size === 0;
+  }, [saveTurn]);
+
   // 🎯 DECLARE nextQuestion FIRST (before it's referenced)
   const nextQuestion = useCallback(() => {
     if (currentQuestion < questions.length - 1) {
@@ -274,7 +316,8 @@ const useInterview = () => {
         candidateId,
         currentQuestion,
         interviewSetup.questions[currentQuestion],
-        finalAnswer
+        finalAnswer,
+        sessionId
       );
       
       setScore(result.score);
@@ -304,6 +347,7 @@ const useInterview = () => {
         const newInteractions = [...interactions, interactionData];
         setInteractions(newInteractions);
         sessionData.current.interactions = newInteractions;
+        persistInteraction(interactionData);
       }
 
       // Update progress
@@ -319,7 +363,7 @@ const useInterview = () => {
     } finally {
       setLoading(false);
     }
-  }, [answer, interviewSetup, candidateId, currentQuestion, interactions, followUpLevel, voiceRecordings]);
+  }, [answer, interviewSetup, candidateId, sessionId, currentQuestion, interactions, followUpLevel, voiceRecordings, persistInteraction]);
 
   // ENHANCED: submitFollowUp now accepts optional followUpAnswerText parameter
   const submitFollowUp = useCallback(async (followUpAnswerText = null) => {
@@ -378,6 +422,7 @@ const useInterview = () => {
       const newInteractions = [...interactions, interactionData];
       setInteractions(newInteractions);
       sessionData.current.interactions = newInteractions;
+      persistInteraction(interactionData);
 
       // Clear follow-up state
       setShowFollowUp(false);
@@ -403,7 +448,8 @@ const useInterview = () => {
     followUpQuestion, 
     followUpLevel, 
     interactions, 
-    voiceRecordings
+    voiceRecordings,
+    persistInteraction
   ]);
 
   const completeInterview = useCallback(async () => {
@@ -419,14 +465,30 @@ const useInterview = () => {
       // Clean up audio service
       audioService.cleanup();
       
-      // Save interview data
-      const result = await apiService.completeInterview(
-        candidateId,
-        sessionId,
-        interactions,
-        voiceRecordings,
-        screenshots
-      );
+      // Turns were saved one by one; finalize once all of them are on the server,
+      // otherwise (or if finalize fails) save the full interview as before
+      let result = null;
+      if (await flushInteractions()) {
+        try {
+          result = await apiService.finalizeInterview(candidateId, sessionId);
+        } catch (finalizeError) {
+          console.warn('Finalize failed, saving full interview instead:', finalizeError);
+        }
+      } else {
+        console.warn(`${unsavedTurns.current.size} turn(s) could not be saved, saving full interview instead`);
+      }
+      if (!result) {
+        result = await apiService.completeInterview(
+          candidateId,
+          sessionId,
+          interactions,
+          voiceRecordings,
+          screenshots
+        );
+        unsavedTurns.current.clear();
+      }
+      // Saved for good; a retake starts a new session
+      sessionStorage.removeItem(sessionStorageKey(candidateId));
       
       setInterviewState(INTERVIEW_STATES.COMPLETED);
       
@@ -439,7 +501,7 @@ const useInterview = () => {
     } finally {
       setLoading(false);
     }
-  }, [candidateId, sessionId, interactions, voiceRecordings, screenshots]);
+  }, [candidateId, sessionId, interactions, voiceRecordings, screenshots, flushInteractions]);
 
   // =========================
   // CLEANUP
@@ -465,6 +527,7 @@ const useInterview = () => {
     setInteractions([]);
     setVoiceRecordings([]);
     setScreenshots([]);
+    unsavedTurns.current.clear();
     
     console.log('🧹 Interview cleanup completed');
   }, []);
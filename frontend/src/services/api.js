@@ -50,8 +50,11 @@ class ApiService {
   // CANDIDATE MANAGEMENT
   // =========================
 
-  async fetchCandidates() {
-    return this.makeRequest('/candidates');
+  // One keyset page: { candidates: [{id, name, status}], total_count, next_cursor }
+  async fetchCandidates(cursor = null, limit = 50) {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor) params.set('cursor', cursor);
+    return this.makeRequest(`/candidates?${params.toString()}`);
   }
 
   async getCandidate(candidateId) {
@@ -69,14 +72,15 @@ class ApiService {
     });
   }
 
-  async submitAnswer(candidateId, questionIndex, question, answer) {
+  async submitAnswer(candidateId, questionIndex, question, answer, sessionId = null) {
     return this.makeRequest('/answer/submit', {
       method: 'POST',
       body: JSON.stringify({
         candidate_id: candidateId,
         question_index: questionIndex,
         question: question,
-        answer: answer
+        answer: answer,
+        session_id: sessionId
       })
     });
   }
@@ -115,6 +119,26 @@ class ApiService {
     });
   }
 
+  // Persist one scored turn immediately; retries with the same turnId are stored once
+  async appendInteraction(candidateId, sessionId, interaction, turnId) {
+    return this.makeRequest('/interview/interaction', {
+      method: 'POST',
+      body: JSON.stringify({
+        candidate_id: candidateId,
+        session_id: sessionId,
+        turn_id: turnId,
+        interaction: interaction
+      })
+    });
+  }
+
+  async finalizeInterview(candidateId, sessionId) {
+    return this.makeRequest(`/interview/${candidateId}/finalize`, {
+      method: 'POST',
+      body: JSON.stringify({ session_id: sessionId })
+    });
+  }
+
   async getCandidateScore(candidateId) {
     return this.makeRequest(`/candidate/${candidateId}/score`);
   }
@@ -174,6 +198,13 @@ class ApiService {
     }
   }
 
+  getTextToSpeechStreamUrl(text, language = 'en', slow = false) {
+    // Raw audio/mpeg stream: use as an <audio> src so playback starts
+    // before synthesis finishes (no base64 decode step)
+    const params = new URLSearchParams({ text, language, slow: String(slow) });
+    return `${API_BASE}/tts/speak-stream?${params.toString()}`;
+  }
+
   async getTTSFile(candidateId, questionNumber) {
     const url = `${API_BASE}/tts/speak/${candidateId}/${questionNumber}`;
     